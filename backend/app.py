@@ -13,7 +13,7 @@ from src.model_operations import apply_adstock, display_model_summary
 from src.diagnostics import test_variables
 from src.model_export import import_model_from_excel
 import numpy as np  # Required for np.linspace in curve visualization
-from src.curve_transformations import apply_icp_curve, apply_adbug_curve, test_curve_transform_model, generate_gamma_options
+from src.curve_transformations import apply_icp_curve, apply_adbug_curve, test_curve_transformations_batch, generate_gamma_options
 
 # Optional but useful imports
 from src.curve_helpers import get_model_object  # If you need to fetch models by name
@@ -1689,34 +1689,32 @@ def test_model_curves():
             gamma_options = generate_gamma_options(variable_values, n_options=10)
             curve_function = apply_adbug_curve
 
-        # Create all combinations and test them
+        # Create all combinations and test them in one batch
+        params_list = [(alpha, beta, gamma) for alpha in alphas for beta in betas for gamma in gamma_options]
+        results_df = test_curve_transformations_batch(
+            model, variable_name, curve_function, params_list, curve_type
+        )
+
         results = []
-        for alpha in alphas:
-            for beta in betas:
-                for gamma in gamma_options:
-                    # Test the curve
-                    result = test_curve_transform_model(
-                        model, variable_name, curve_function,
-                        alpha, beta, gamma, curve_type
-                    )
-                    if result:
-                        # Format for the frontend
-                        formatted_result = {
-                            'curveName': result['Variable'],
-                            'alpha': float(result['Alpha']),
-                            'beta': float(result['Beta']),
-                            'gamma': float(result['Gamma']),
-                            'coefficient': float(result['Coefficient']),
-                            'tStat': float(result['T-stat']),
-                            'pValue': float(result['P-value']),
-                            'rSquaredIncrease': float(result['R² Increase']),
-                        }
-
-                        # Add switch point for ICP curves
-                        if curve_type == 'ICP' and 'Switch Point' in result:
-                            formatted_result['switchPoint'] = float(result['Switch Point'])
-
-                        results.append(formatted_result)
+        if results_df is not None:
+            for result in results_df.to_dict('records'):
+                # Format for the frontend
+                formatted_result = {
+                    'curveName': result['Variable'],
+                    'alpha': float(result['Alpha']),
+                    'beta': float(result['Beta']),
+                    'gamma': float(result['Gamma']),
+                    'coefficient': float(result['Coefficient']),
+                    'tStat': float(result['T-stat']),
+                    'pValue': float(result['P-value']),
+                    'rSquaredIncrease': float(result['R² Increase']),
+                }
+
+                # Add switch point for ICP curves
+                if curve_type == 'ICP' and 'Switch Point' in result:
+                    formatted_result['switchPoint'] = float(result['Switch Point'])
+
+                results.append(formatted_result)
 
         # Sort results by t-stat magnitude (absolute value)
         results.sort(key=lambda x: abs(x['tStat']), reverse=True)
@@ -2,15 +2,109 @@
 Curve transformations for media variables including ICP (s-shape) and ADBUG (diminishing returns).
 """
 
+import weakref
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import statsmodels.api as sm
+from scipy import stats
 from IPython.display import display, HTML, clear_output
 import ipywidgets as widgets
 
+# Numba is optional - used to evaluate large curve parameter grids in parallel
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
-def apply_icp_curve(x, alpha, beta, gamma):
+# Minimum number of curve values (observations x combinations) before the Numba kernel is used
+NUMBA_MIN_CELLS = 100000
+
+# Number of curves per block when a batch is split across threads
+CURVE_BATCH_SIZE = 512
+
+# Fits of the current model on its full sample, reused across curve sweeps
+FIT_CACHE_SIZE = 16
+_FIT_CACHE = {}
+
+
+def _power(x, alpha, squares=None):
+    """
+    Raise values to a power, multiplying directly for small integer exponents.
+
+    Integer exponents from 1 to 8 (e.g. the ICP alphas 3 and 4) take at most
+    four multiplications instead of a pow() call per element. Passing the same
+    squares dict for several exponents of the same x shares x², x⁴ and x⁸.
+
+    Parameters:
+    -----------
+    x : numpy.ndarray or float
+        Values to raise to the power
+    alpha : float
+        Exponent
+    squares : dict, optional
+        Cache of x**(2**k) keyed by 2**k, filled in as needed
+
+    Returns:
+    --------
+    numpy.ndarray or float
+        x ** alpha
+    """
+    if not (float(alpha).is_integer() and 0 < alpha <= 8):
+        return np.power(x, alpha)
+
+    if squares is None:
+        squares = {}
+    squares.setdefault(1, x)
+
+    # Binary exponentiation over the cached squares
+    remaining = int(alpha)
+    step = 1
+    result = None
+    while remaining:
+        if step not in squares:
+            squares[step] = squares[step // 2] * squares[step // 2]
+        if remaining & 1:
+            result = squares[step] if result is None else result * squares[step]
+        remaining >>= 1
+        step *= 2
+
+    return result
+
+def _cast_curve_inputs(x, alpha, beta, gamma, dtype):
+    """
+    Cast curve inputs and parameters to one floating point type.
+
+    Integer alphas are kept as they are so the multiplication path of _power
+    still applies.
+
+    Parameters:
+    -----------
+    x : numpy.ndarray or float
+        The original values
+    alpha : float
+        Alpha parameter
+    beta : float
+        Beta parameter
+    gamma : float
+        Gamma parameter
+    dtype : numpy.dtype
+        Floating point type to compute in
+
+    Returns:
+    --------
+    tuple
+        (x, alpha, beta, gamma) in the requested type
+    """
+    scalar = np.dtype(dtype).type
+    if not float(alpha).is_integer():
+        alpha = scalar(alpha)
+    return np.asarray(x, dtype=dtype), alpha, scalar(beta), scalar(gamma)
+
+def apply_icp_curve(x, alpha, beta, gamma, dtype=None):
     """
     Apply the ICP (Incremental Coverage Potential) curve transformation to a variable.
     This creates an S-shaped curve with increasing returns followed by decreasing returns.
@@ -25,6 +119,9 @@ def apply_icp_curve(x, alpha, beta, gamma):
         Controls how quickly the curve approaches its asymptote
     gamma : float
         The switch point where the curve changes from increasing to decreasing returns
+    dtype : numpy.dtype, optional
+        Floating point type to compute in (e.g. np.float32 for plotting).
+        If None, the usual NumPy type promotion applies
 
     Returns:
     --------
@@ -35,15 +132,19 @@ def apply_icp_curve(x, alpha, beta, gamma):
     if isinstance(x, pd.Series):
         x = x.values
 
+    # Cast the inputs so the parameters do not promote the result back to float64
+    if dtype is not None:
+        x, alpha, beta, gamma = _cast_curve_inputs(x, alpha, beta, gamma, dtype)
+
     # Apply the ICP formula: y = (x/γ)^α / ((x/γ)^α + β)
     x_scaled = x / gamma
-    numerator = np.power(x_scaled, alpha)
+    numerator = _power(x_scaled, alpha)
     denominator = numerator + beta
     y = numerator / denominator
 
     return y
 
-def apply_adbug_curve(x, alpha, beta, gamma):
+def apply_adbug_curve(x, alpha, beta, gamma, dtype=None):
     """
     Apply the ADBUG (Adstock Budget) curve transformation to a variable.
     This creates a curve with diminishing returns.
@@ -58,6 +159,9 @@ def apply_adbug_curve(x, alpha, beta, gamma):
         Controls how quickly diminishing returns take effect
     gamma : float
         Scale parameter to adjust the input values
+    dtype : numpy.dtype, optional
+        Floating point type to compute in (e.g. np.float32 for plotting).
+        If None, the usual NumPy type promotion applies
 
     Returns:
     --------
@@ -68,9 +172,13 @@ def apply_adbug_curve(x, alpha, beta, gamma):
     if isinstance(x, pd.Series):
         x = x.values
 
+    # Cast the inputs so the parameters do not promote the result back to float64
+    if dtype is not None:
+        x, alpha, beta, gamma = _cast_curve_inputs(x, alpha, beta, gamma, dtype)
+
     # Apply the ADBUG formula: y = 1 - exp(-β * (x/γ)^α)
     x_scaled = x / gamma
-    exponent = -beta * np.power(x_scaled, alpha)
+    exponent = -beta * _power(x_scaled, alpha)
     y = 1 - np.exp(exponent)
 
     return y
@@ -214,6 +322,126 @@ def plot_curve(curve_function, variable_values, alpha, beta, gamma, switch_point
 
     return fig
 
+def _current_model_fit(model):
+    """
+    Fit of the current model on all rows, cached per model state.
+
+    Every feature change refits the model, so the key uses the identity of
+    model.results alongside the data, KPI and features. Columns can also be
+    rewritten in place without a refit, so the key includes the digest of the
+    KPI and feature values from _base_fit. Weak references confirm the cached
+    objects are still the live ones.
+
+    Parameters:
+    -----------
+    model : LinearModel
+        The model to test with
+
+    Returns:
+    --------
+    dict or None
+        Current-model fit from diagnostics._sample_fit, or None if some rows
+        have missing KPI or feature values
+    """
+    from src.diagnostics import _base_fit, _sample_fit
+
+    base = _base_fit(model)
+    key = (id(model.model_data), id(model.results), model.kpi, tuple(model.features), base["digest"])
+    entry = _FIT_CACHE.get(key)
+    if entry is not None and entry[0]() is model.model_data and entry[1]() is model.results:
+        return entry[2]
+
+    fit = _sample_fit(model, base, base["mask"]) if base["mask"].all() else None
+
+    try:
+        entry = (weakref.ref(model.model_data), weakref.ref(model.results), fit)
+    except TypeError:
+        # Objects that cannot be weakly referenced are not cached
+        return fit
+    if len(_FIT_CACHE) >= FIT_CACHE_SIZE:
+        _FIT_CACHE.pop(next(iter(_FIT_CACHE)))
+    _FIT_CACHE[key] = entry
+
+    return fit
+
+def _curve_transform_name(variable_name, alpha, beta, gamma, curve_type="ICP"):
+    """
+    Name of a curve-transformed variable, e.g. 'tv|ICP a3_b4_g120'.
+
+    Parameters:
+    -----------
+    variable_name : str
+        Name of the original variable
+    alpha : float
+        Alpha parameter
+    beta : float
+        Beta parameter
+    gamma : float
+        Gamma parameter
+    curve_type : str, optional
+        Type of curve ('ICP' or 'ADBUG')
+
+    Returns:
+    --------
+    str
+        The transformed variable name
+    """
+    if curve_type == "ICP":
+        transform_type = "ICP"
+    else:
+        transform_type = "ADBUG"
+
+    # Format alpha, beta, gamma values for the name
+    # Format depends on magnitude for better readability
+    alpha_str = _format_curve_param(alpha, 10)
+    beta_str = _format_curve_param(beta, 10)
+    gamma_str = _format_curve_param(gamma, 100)
+
+    return f"{variable_name}|{transform_type} a{alpha_str}_b{beta_str}_g{gamma_str}"
+
+@lru_cache(maxsize=4096)
+def _format_curve_param(value, limit):
+    """
+    Format a curve parameter for a variable name, e.g. 0.8 -> '0.8', 3.0 -> '3'.
+
+    Cached because a parameter grid only has a handful of distinct values.
+
+    Parameters:
+    -----------
+    value : float
+        Parameter value
+    limit : float
+        Values from this limit on are shown as whole numbers
+
+    Returns:
+    --------
+    str
+        The formatted value
+    """
+    return f"{value:.1f}".rstrip('0').rstrip('.') if value < limit else str(int(value))
+
+def _curve_switch_point(alpha, gamma, curve_type="ICP"):
+    """
+    Switch point of an ICP curve, x* = γ * ((α-1)/(α+1))^(1/α).
+
+    Parameters:
+    -----------
+    alpha : float
+        Alpha parameter
+    gamma : float
+        Gamma parameter
+    curve_type : str, optional
+        Type of curve ('ICP' or 'ADBUG')
+
+    Returns:
+    --------
+    float or None
+        The switch point, or None for ADBUG curves and alpha <= 1
+    """
+    if curve_type == "ICP" and alpha > 1:
+        return gamma * ((alpha - 1) / (alpha + 1)) ** (1 / alpha)
+    return None
+
 def test_curve_transform_model(model, variable_name, curve_function, alpha, beta, gamma, curve_type="ICP"):
     """
     Test how a curve-transformed variable would perform in the model.
@@ -225,7 +453,8 @@ def test_curve_transform_model(model, variable_name, curve_function, alpha, beta
     variable_name : str
         Name of the variable to transform
     curve_function : function
-        The function to apply (apply_icp_curve or apply_adbug_curve)
+        The function to apply (apply_icp_curve or apply_adbug_curve); it is
+        called with a NumPy array of the original values
     alpha : float
         Alpha parameter
     beta : float
@@ -240,6 +469,8 @@ def test_curve_transform_model(model, variable_name, curve_function, alpha, beta
     dict
         Results of the test including coefficient, t-stat, etc.
     """
+    from src.diagnostics import _partial_regressions
+
     if model is None or model.results is None:
         print("No valid model to test with.")
         return None
@@ -249,57 +480,60 @@ def test_curve_transform_model(model, variable_name, curve_function, alpha, beta
         return None
 
     # Create the transformed variable name
-    if curve_type == "ICP":
-        transform_type = "ICP"
-    else:
-        transform_type = "ADBUG"
-
-    # Format alpha, beta, gamma values for the name
-    # Format depends on magnitude for better readability
-    alpha_str = f"{alpha:.1f}".rstrip('0').rstrip('.') if alpha < 10 else str(int(alpha))
-    beta_str = f"{beta:.1f}".rstrip('0').rstrip('.') if beta < 10 else str(int(beta))
-    gamma_str = f"{gamma:.1f}".rstrip('0').rstrip('.') if gamma < 100 else str(int(gamma))
-
-    transform_name = f"{variable_name}|{transform_type} a{alpha_str}_b{beta_str}_g{gamma_str}"
+    transform_name = _curve_transform_name(variable_name, alpha, beta, gamma, curve_type)
 
     try:
-        # Get the original variable values
-        original_values = model.model_data[variable_name]
+        # Get the original variable values as an array, so curve_function
+        # does not go through pandas
+        original_values = model.model_data[variable_name].to_numpy(dtype=float)
 
         # Apply the transformation
         transformed_values = curve_function(original_values, alpha, beta, gamma)
 
-        # Add the transformed variable to a copy of the model data
-        model_data_copy = model.model_data.copy()
-        model_data_copy[transform_name] = transformed_values
-
-        # Get current model variables and add the new transformed variable
-        current_vars = model.features.copy()
-        vars_with_transform = current_vars + [transform_name]
-
-        # Get the KPI values
-        y = model_data_copy[model.kpi]
-
-        # Prepare X data for both models
-        X_current = sm.add_constant(model_data_copy[current_vars])
-        X_with_transform = sm.add_constant(model_data_copy[vars_with_transform])
-
-        # Fit both models
-        current_model = sm.OLS(y, X_current).fit()
-        transform_model = sm.OLS(y, X_with_transform).fit()
+        # Add the curve to the cached current-model fit: only the part of the
+        # curve not explained by the current features has to be computed
+        full_stats = None
+        fit = _current_model_fit(model)
+        candidate = np.asarray(transformed_values, dtype=float)
+        if fit is not None and np.isfinite(candidate).all():
+            full_stats = _partial_regressions(fit, candidate[:, np.newaxis])[0]
+
+        if full_stats is not None:
+            coef = full_stats["Coefficient"]
+            t_stat = full_stats["T-statistic"]
+            p_value = full_stats["P-value"]
+            rsquared_increase = full_stats["R-squared Increase"]
+        else:
+            # Missing values or a collinear curve: fit both models directly
+            # Get the KPI values
+            y = model.model_data[model.kpi].to_numpy(dtype=float)
+
+            # Prepare X data as one array: constant, current features, then the curve
+            X_with_transform = np.column_stack([
+                np.ones(len(y)),
+                model.model_data[list(model.features)].to_numpy(dtype=float),
+                candidate
+            ])
+
+            # Fit the model with the curve; the current model only needs a fit
+            # when it is not cached (missing values in its own rows)
+            transform_model = sm.OLS(y, X_with_transform).fit()
+            if fit is not None:
+                current_rsquared = fit["rsquared"]
+            else:
+                current_rsquared = sm.OLS(y, X_with_transform[:, :-1]).fit().rsquared
 
-        # Get statistics for the transformed variable
-        coef = transform_model.params[transform_name]
-        t_stat = transform_model.tvalues[transform_name]
-        p_value = transform_model.pvalues[transform_name]
+            # Get statistics for the transformed variable (the last column)
+            coef = transform_model.params[-1]
+            t_stat = transform_model.tvalues[-1]
+            # Only this p-value is needed, not the whole pvalues array
+            p_value = 2 * stats.t.sf(abs(t_stat), transform_model.df_resid)
 
-        # Calculate R-squared increase
-        rsquared_increase = transform_model.rsquared - current_model.rsquared
+            # Calculate R-squared increase
+            rsquared_increase = transform_model.rsquared - current_rsquared
 
         # Calculate switch point if it's an ICP curve
-        switch_point = None
-        if curve_type == "ICP" and alpha > 1:
-            switch_point = gamma * ((alpha - 1) / (alpha + 1)) ** (1 / alpha)
+        switch_point = _curve_switch_point(alpha, gamma, curve_type)
 
         # Store results
         results = {
@@ -321,6 +555,230 @@ def test_curve_transform_model(model, variable_name, curve_function, alpha, beta
         print(f"Error testing curve transformation: {str(e)}")
         return None
 
+def _curve_grid(curve_function, x, params, dtype=None):
+    """
+    Curves of x for a list of parameter combinations.
+
+    Large ICP and ADBUG grids are evaluated by a Numba kernel that fuses the
+    whole formula into one pass over the observations. Otherwise
+    curve_function is called once per alpha with broadcast betas and gammas,
+    so integer alphas keep the multiplication path of _power.
+
+    Parameters:
+    -----------
+    curve_function : function
+        The function to apply (apply_icp_curve or apply_adbug_curve)
+    x : numpy.ndarray
+        The original values
+    params : numpy.ndarray
+        Array of shape (combinations, 3) with alpha, beta and gamma per row
+    dtype : numpy.dtype, optional
+        Floating point type of the curves (default float64)
+
+    Returns:
+    --------
+    numpy.ndarray
+        Array of shape (n, combinations), one column per parameter row
+    """
+    dtype = np.dtype(float if dtype is None else dtype)
+    x = x.astype(dtype, copy=False)
+    params = params.astype(dtype, copy=False)
+    Z = np.empty((len(x), len(params)), dtype=dtype)
+
+    kernel_curve = {apply_icp_curve: 0, apply_adbug_curve: 1}.get(curve_function)
+    if NUMBA_AVAILABLE and kernel_curve is not None and Z.size >= NUMBA_MIN_CELLS:
+        _curve_grid_kernel(x, params, kernel_curve, Z)
+        return Z
+
+    for alpha in np.unique(params[:, 0]):
+        columns = np.flatnonzero(params[:, 0] == alpha)
+        alpha = int(alpha) if float(alpha).is_integer() else alpha
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            Z[:, columns] = curve_function(x[:, np.newaxis], alpha,
+                                           params[columns, 1], params[columns, 2])
+
+    return Z
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _integer_power(value, exponent):
+        """
+        value ** exponent for a positive integer exponent by binary
+        exponentiation, multiplying in the same order as _power.
+        """
+        result = 1.0
+        first = True
+        square = value
+        while exponent:
+            if exponent & 1:
+                result = square if first else result * square
+                first = False
+            exponent >>= 1
+            if exponent:
+                square = square * square
+        return result
+
+    @njit(parallel=True, cache=True, error_model='numpy')
+    def _curve_grid_kernel(x, params, curve, out):
+        """
+        Numba kernel writing every curve (0 = ICP, 1 = ADBUG) into out in one pass.
+        """
+        # Integer alphas from 1 to 8 are raised by multiplication instead of pow()
+        n_params = params.shape[0]
+        int_alphas = np.zeros(n_params, dtype=np.int64)
+        for k in range(n_params):
+            alpha = params[k, 0]
+            if alpha == np.floor(alpha) and 0 < alpha <= 8:
+                int_alphas[k] = int(alpha)
+
+        # Observations are independent; no temporaries per combination
+        for t in prange(x.shape[0]):
+            for k in range(n_params):
+                x_scaled = x[t] / params[k, 2]
+                if int_alphas[k] > 0:
+                    p = _integer_power(x_scaled, int_alphas[k])
+                else:
+                    p = x_scaled ** params[k, 0]
+                if curve == 0:
+                    out[t, k] = p / (p + params[k, 1])
+                else:
+                    out[t, k] = 1.0 - np.exp(-params[k, 1] * p)
+
+def test_curve_transformations_batch(model, variable_name, curve_function, params_list, curve_type="ICP",
+                                     max_workers=None, dtype=None, top_k=20, min_abs_t=None):
+    """
+    Test many curve transformations of one variable against the model at once.
+
+    The curves are evaluated into one (n, combinations) array with
+    _curve_grid, then added to the cached current-model fit together: one
+    matrix product partials every curve out against the current features.
+    Large grids are split into blocks of CURVE_BATCH_SIZE curves whose
+    statistics are computed on threads. With dtype=np.float32 the curves are
+    ranked in single precision (half the memory traffic) and the top_k
+    curves by absolute t-stat are recomputed in float64, so the best
+    candidates get exact statistics. With min_abs_t, curves below that
+    absolute t-stat are dropped before any result row is built, which skips
+    most of the per-curve Python work on large grids. Curves the batch
+    cannot handle (missing values, collinear curves) are tested one at a
+    time with test_curve_transform_model.
+
+    Parameters:
+    -----------
+    model : LinearModel
+        The model to test with
+    variable_name : str
+        Name of the variable to transform
+    curve_function : function
+        The function to apply (apply_icp_curve or apply_adbug_curve); it is
+        called with NumPy arrays and must broadcast over beta and gamma arrays
+    params_list : list of tuple
+        (alpha, beta, gamma) combinations to test
+    curve_type : str, optional
+        Type of curve ('ICP' or 'ADBUG')
+    max_workers : int, optional
+        Number of threads used for the blocks (default: ThreadPoolExecutor's default)
+    dtype : numpy.dtype, optional
+        Floating point type used to rank the curves (default float64)
+    top_k : int, optional
+        Number of top curves recomputed in float64 when dtype is lower precision
+    min_abs_t : float, optional
+        Minimum absolute t-stat of the curves to return (default: return all)
+
+    Returns:
+    --------
+    pandas.DataFrame or None
+        One row per successful test (above min_abs_t) with the columns of
+        test_curve_transform_model, in params_list order
+    """
+    from src.diagnostics import _partial_regressions
+
+    if model is None or model.results is None:
+        print("No valid model to test with.")
+        return None
+
+    if variable_name not in model.model_data.columns:
+        print(f"Error: Variable '{variable_name}' not found in the data.")
+        return None
+
+    params_list = list(params_list)
+    stats_list = [None] * len(params_list)
+
+    try:
+        x = model.model_data[variable_name].to_numpy(dtype=float)
+        params = np.array(params_list, dtype=float).reshape(-1, 3)
+        Z = _curve_grid(curve_function, x, params, dtype)
+
+        fit = _current_model_fit(model)
+        finite = np.flatnonzero(np.isfinite(Z).all(axis=0))
+        if fit is not None and len(finite):
+            # The current-model fit in the ranking precision
+            rank_fit = fit
+            if Z.dtype != fit["resid"].dtype:
+                rank_fit = dict(fit, basis=np.asarray(fit["basis"], dtype=Z.dtype),
+                                basis_pinv=np.asarray(fit["basis_pinv"], dtype=Z.dtype),
+                                resid=fit["resid"].astype(Z.dtype))
+
+            blocks = [finite[start:start + CURVE_BATCH_SIZE]
+                      for start in range(0, len(finite), CURVE_BATCH_SIZE)]
+
+            def run_block(columns):
+                return _partial_regressions(rank_fit, Z[:, columns])
+
+            # Blocks are independent (NumPy/BLAS release the GIL), so run them on threads
+            if len(blocks) > 1 and max_workers != 1:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    block_stats = list(executor.map(run_block, blocks))
+            else:
+                block_stats = [run_block(columns) for columns in blocks]
+
+            for columns, batch_stats in zip(blocks, block_stats):
+                for j, full_stats in zip(columns, batch_stats):
+                    stats_list[j] = full_stats
+
+            # Recompute the strongest curves in float64 for their reported statistics
+            if rank_fit is not fit:
+                ranked = np.array([j for j in finite if stats_list[j] is not None], dtype=int)
+                tstats = np.array([stats_list[j]["T-statistic"] for j in ranked], dtype=float)
+                top = ranked[np.argsort(-np.abs(tstats), kind="stable")[:top_k]]
+                if len(top):
+                    Z_top = _curve_grid(curve_function, x, params[top])
+                    for j, full_stats in zip(top, _partial_regressions(fit, Z_top)):
+                        stats_list[j] = full_stats
+    except Exception:
+        # Leave every combination to the one-at-a-time path
+        stats_list = [None] * len(params_list)
+
+    results = []
+    for (alpha, beta, gamma), full_stats in zip(params_list, stats_list):
+        if full_stats is None:
+            # Test this curve directly
+            result = test_curve_transform_model(
+                model, variable_name, curve_function,
+                alpha, beta, gamma, curve_type
+            )
+            if result and (min_abs_t is None or abs(result['T-stat']) >= min_abs_t):
+                results.append(result)
+        elif min_abs_t is not None and not abs(full_stats["T-statistic"]) >= min_abs_t:
+            # Weak curve: skip building its result row
+            continue
+        else:
+            results.append({
+                'Variable': _curve_transform_name(variable_name, alpha, beta, gamma, curve_type),
+                'Coefficient': full_stats["Coefficient"],
+                'T-stat': full_stats["T-statistic"],
+                'P-value': full_stats["P-value"],
+                'R² Increase': full_stats["R-squared Increase"],
+                'Alpha': alpha,
+                'Beta': beta,
+                'Gamma': gamma,
+                'Curve Type': curve_type,
+                'Switch Point': _curve_switch_point(alpha, gamma, curve_type)
+            })
+
+    if not results:
+        return None
+    return pd.DataFrame(results)
+
 def test_icp(model, variable_name=None):
     """
     Test ICP curve transformations with various parameter combinations.
@@ -341,15 +799,9 @@ def test_icp(model, variable_name=None):
         print("No valid model to test with.")
         return None
 
-    # Get available variables
-    available_vars = model.model_data.columns.tolist()
-
-    # Remove KPI and existing features from options
-    for feature in model.features:
-        if feature in available_vars:
-            available_vars.remove(feature)
-    if model.kpi in available_vars:
-        available_vars.remove(model.kpi)
+    # Get available variables, excluding the KPI and existing features
+    exclude = set(model.features) | {model.kpi}
+    available_vars = [col for col in model.model_data.columns if col not in exclude]
 
     # If variable_name is not provided, show selection widget
     if variable_name is None:
@@ -420,23 +872,12 @@ def test_icp_internal(model, variable_name):
     variable_values = model.model_data[variable_name]
     gamma_options = generate_gamma_options(variable_values, n_options=10)
 
-    # Create all combinations
-    results = []
-    for alpha in alphas:
-        for beta in betas:
-            for gamma in gamma_options:
-                # Test the curve
-                result = test_curve_transform_model(
-                    model, variable_name, apply_icp_curve,
-                    alpha, beta, gamma, "ICP"
-                )
-                if result:
-                    results.append(result)
-
-    # Create results DataFrame
-    if results:
-        results_df = pd.DataFrame(results)
+    # Test all combinations in one batch
+    params_list = [(alpha, beta, gamma) for alpha in alphas for beta in betas for gamma in gamma_options]
+    results_df = test_curve_transformations_batch(model, variable_name, apply_icp_curve, params_list, "ICP")
 
+    # Select, sort and display the results
+    if results_df is not None:
         # Reorder and select columns
         display_columns = ['Variable', 'Coefficient', 'T-stat', 'R² Increase',
                          'Alpha', 'Beta', 'Gamma', 'Switch Point']
@@ -475,15 +916,9 @@ def test_adbug(model, variable_name=None):
         print("No valid model to test with.")
         return None
 
-    # Get available variables
-    available_vars = model.model_data.columns.tolist()
-
-    # Remove KPI and existing features from options
-    for feature in model.features:
-        if feature in available_vars:
-            available_vars.remove(feature)
-    if model.kpi in available_vars:
-        available_vars.remove(model.kpi)
+    # Get available variables, excluding the KPI and existing features
+    exclude = set(model.features) | {model.kpi}
+    available_vars = [col for col in model.model_data.columns if col not in exclude]
 
     # If variable_name is not provided, show selection widget
     if variable_name is None:
@@ -554,23 +989,12 @@ def test_adbug_internal(model, variable_name):
     variable_values = model.model_data[variable_name]
     gamma_options = generate_gamma_options(variable_values, n_options=10)
 
-    # Create all combinations
-    results = []
-    for alpha in alphas:
-        for beta in betas:
-            for gamma in gamma_options:
-                # Test the curve
-                result = test_curve_transform_model(
-                    model, variable_name, apply_adbug_curve,
-                    alpha, beta, gamma, "ADBUG"
-                )
-                if result:
-                    results.append(result)
-
-    # Create results DataFrame
-    if results:
-        results_df = pd.DataFrame(results)
+    # Test all combinations in one batch
+    params_list = [(alpha, beta, gamma) for alpha in alphas for beta in betas for gamma in gamma_options]
+    results_df = test_curve_transformations_batch(model, variable_name, apply_adbug_curve, params_list, "ADBUG")
 
+    # Select, sort and display the results
+    if results_df is not None:
         # Reorder and select columns
         display_columns = ['Variable', 'Coefficient', 'T-stat', 'R² Increase',
                          'Alpha', 'Beta', 'Gamma']
@@ -608,7 +1032,6 @@ def display_results_with_chart(results_df, variable_name, model, curve_type="ICP
     import pandas as pd
     import numpy as np
     import ipywidgets as widgets
-    from IPython.display import display, HTML, clear_output
     import matplotlib.pyplot as plt
     from src.curve_transformations import apply_icp_curve, apply_adbug_curve
 
@@ -710,6 +1133,9 @@ def display_results_with_chart(results_df, variable_name, model, curve_type="ICP
 
             print(f"Adding curves for {variable_name} with rows: {selected_rows}")
 
+            # Original data, converted once for all selected curves
+            original_values = model.model_data[variable_name].to_numpy(dtype=float)
+
             # Add selected transformed variables to model data
             added_vars = []
             for row_idx in selected_rows:
@@ -721,8 +1147,6 @@ def display_results_with_chart(results_df, variable_name, model, curve_type="ICP
                     gamma = row['Gamma']
 
                     # Apply transformation to original data
-                    original_values = model.model_data[variable_name]
-
                     if curve_type == "ICP":
                         transformed_values = apply_icp_curve(original_values, alpha, beta, gamma)
                     else:  # ADBUG
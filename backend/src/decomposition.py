@@ -6,10 +6,76 @@ import pandas as pd
 import numpy as np
 import os
 import json
-from IPython.display import display
-import ipywidgets as widgets
+import re
 from pathlib import Path
 
+# Numba is optional - used to parallelize decomposition of wide models
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Polars is optional - used by calculate_decomposition(engine='polars')
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+
+# Minimum number of variables before the Numba kernel is used
+_NUMBA_MIN_FEATURES = 8
+
+# Integer codes for group adjustments (anything else means no adjustment)
+_ADJUSTMENT_CODES = {'Min': 1, 'Max': 2}
+
+# Name patterns used to assign default groups, checked in order
+_GROUP_PATTERNS = [
+    (re.compile(r'price|pricing'), 'Price'),
+    (re.compile(r'promo|promotion|offer'), 'Promotions'),
+    (re.compile(r'tv|radio|online|media'), 'Media'),
+    (re.compile(r'comp|competitor'), 'Competition'),
+    (re.compile(r'weather|temperature|rain'), 'Weather'),
+    (re.compile(r'holiday|season|event'), 'Seasonality'),
+]
+
+def _groups_settings_path(model):
+    """
+    Get the path of the saved group settings file for a model.
+    """
+    groups_dir = 'groups'
+    Path(groups_dir).mkdir(parents=True, exist_ok=True)
+    return os.path.join(groups_dir, f"{model.name}_groups.json")
+
+def _wgtd_total_weight(wgtd_info):
+    """
+    Get the total absolute weight of a weighted variable's components.
+
+    The result is cached on the weighted variable info and recomputed only
+    when its components dictionary is replaced.
+
+    Parameters:
+    -----------
+    wgtd_info : dict
+        Weighted variable info with a 'components' dictionary
+
+    Returns:
+    --------
+    float
+        Sum of the absolute component coefficients
+    """
+    components = wgtd_info.get('components', {})
+    cache_key = (id(components), len(components))
+
+    cached = wgtd_info.get('_total_weight_cache')
+    if cached is not None and cached[0] == cache_key:
+        return cached[1]
+
+    total_weight = float(np.abs(np.fromiter(components.values(), dtype=float, count=len(components))).sum())
+    wgtd_info['_total_weight_cache'] = (cache_key, total_weight)
+
+    return total_weight
+
 def decompose(model_name=None):
     """
     Decompose model contributions by variable groups.
@@ -97,9 +163,7 @@ def get_variable_groups(model):
         Dictionary with group info for each variable
     """
     # Look for saved group settings - always check the file first
-    groups_dir = 'groups'
-    Path(groups_dir).mkdir(parents=True, exist_ok=True)
-    settings_path = os.path.join(groups_dir, f"{model.name}_groups.json")
+    settings_path = _groups_settings_path(model)
 
     if os.path.exists(settings_path):
         try:
@@ -148,18 +212,10 @@ def create_default_groups(model):
         feature_lower = feature.lower()
 
         # Determine group based on variable name
-        if 'price' in feature_lower or 'pricing' in feature_lower:
-            group = 'Price'
-        elif 'promo' in feature_lower or 'promotion' in feature_lower or 'offer' in feature_lower:
-            group = 'Promotions'
-        elif 'tv' in feature_lower or 'radio' in feature_lower or 'online' in feature_lower or 'media' in feature_lower:
-            group = 'Media'
-        elif 'comp' in feature_lower or 'competitor' in feature_lower:
-            group = 'Competition'
-        elif 'weather' in feature_lower or 'temperature' in feature_lower or 'rain' in feature_lower:
-            group = 'Weather'
-        elif 'holiday' in feature_lower or 'season' in feature_lower or 'event' in feature_lower:
-            group = 'Seasonality'
+        for pattern, pattern_group in _GROUP_PATTERNS:
+            if pattern.search(feature_lower):
+                group = pattern_group
+                break
         else:
             group = 'Other'
 
@@ -170,7 +226,185 @@ def create_default_groups(model):
 
     return groups
 
-def calculate_decomposition(model, groups):
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _decomp_kernel(C, adjust_kind, group_idx, n_groups):
+        """
+        Numba kernel applying Min/Max adjustments and summing variables into groups.
+        """
+        n, k = C.shape
+
+        # Min/Max per variable, ignoring NaN values (columns are independent)
+        adj = np.zeros(k)
+        for j in prange(k):
+            if adjust_kind[j] == 0:
+                continue
+            found = False
+            value = 0.0
+            for i in range(n):
+                x = C[i, j]
+                if np.isnan(x):
+                    continue
+                if not found or (adjust_kind[j] == 1 and x < value) or (adjust_kind[j] == 2 and x > value):
+                    value = x
+                    found = True
+            adj[j] = value if found else np.nan
+
+        # Sum adjusted contributions into groups (rows are independent)
+        G = np.zeros((n, n_groups))
+        for i in prange(n):
+            for j in range(k):
+                G[i, group_idx[j]] += C[i, j] - adj[j]
+
+        return G, adj
+
+def _group_contributions(C, adjust_kind, group_idx, n_groups):
+    """
+    Apply Min/Max adjustments and sum variable contributions into groups.
+
+    Parameters:
+    -----------
+    C : numpy.ndarray
+        Contributions array with one column per variable
+    adjust_kind : numpy.ndarray
+        Adjustment per variable: 0 = none, 1 = Min, 2 = Max
+    group_idx : numpy.ndarray
+        Group position for each variable
+    n_groups : int
+        Number of groups
+
+    Returns:
+    --------
+    tuple
+        (grouped contributions array, adjustment value per variable)
+    """
+    if NUMBA_AVAILABLE and C.shape[1] >= _NUMBA_MIN_FEATURES:
+        return _decomp_kernel(np.ascontiguousarray(C), adjust_kind, group_idx, n_groups)
+
+    # Apply Min/Max adjustments to all variables at once (subtract min or max from all values)
+    adj = np.zeros(C.shape[1])
+    if adjust_kind.any():
+        col_min = np.nanmin(C, axis=0)
+        col_max = np.nanmax(C, axis=0)
+        adj = np.where(adjust_kind == 1, col_min, np.where(adjust_kind == 2, col_max, 0.0))
+        C = C - adj
+
+    G = np.zeros((C.shape[0], n_groups))
+    for g in range(n_groups):
+        G[:, g] = C[:, group_idx == g].sum(axis=1)
+
+    return G, adj
+
+def _polars_group_contributions(model, data, groups, coefficients):
+    """
+    Calculate adjusted group contributions with a single lazy Polars query.
+
+    Parameters:
+    -----------
+    model : LinearModel
+        The model to decompose
+    data : pandas.DataFrame
+        Model data
+    groups : dict
+        Dictionary with group info for each variable
+    coefficients : dict
+        Model coefficients by variable name
+
+    Returns:
+    --------
+    polars.DataFrame
+        DataFrame with one column per group
+    """
+    # Each variable's contribution as (column, factor) terms - column None is the constant
+    var_terms = {}
+    for var in groups:
+        if var not in coefficients:
+            continue
+        if var != 'const' and var not in data.columns:
+            print(f"Warning: Variable '{var}' not found in data, skipping")
+            continue
+        var_terms[var] = [(None if var == 'const' else var, float(coefficients[var]))]
+
+    # Split weighted variables into their components
+    if hasattr(model, 'wgtd_variables'):
+        for wgtd_var, wgtd_info in model.wgtd_variables.items():
+            if wgtd_var not in var_terms:
+                continue
+
+            total_weight = _wgtd_total_weight(wgtd_info)
+            if total_weight > 0:
+                wgtd_terms = var_terms.pop(wgtd_var)
+                for component, component_coef in wgtd_info.get('components', {}).items():
+                    share = component_coef / total_weight
+                    var_terms.setdefault(component, []).extend(
+                        (col, factor * share) for col, factor in wgtd_terms
+                    )
+
+                    # Make sure component is in groups
+                    if component not in groups and wgtd_var in groups:
+                        groups[component] = groups[wgtd_var]
+
+    # Build adjusted contribution expressions per group
+    group_exprs = {}
+    adjustments = []
+    for var, terms in var_terms.items():
+        if var not in groups:
+            continue
+
+        expr = pl.sum_horizontal([
+            pl.lit(factor) if col is None else pl.col(col) * factor
+            for col, factor in terms
+        ])
+
+        adjustment = groups[var].get('Adjustment', '')
+        if adjustment in ('Min', 'Max'):
+            adj = expr.min() if adjustment == 'Min' else expr.max()
+            expr = expr - adj
+            adjustments.append(adj)
+
+        group_exprs.setdefault(groups[var]['Group'], []).append(expr)
+
+    exprs = []
+    for group_name, members in group_exprs.items():
+        group_expr = pl.sum_horizontal(members)
+        # Add total adjustment to each observation in Base
+        if group_name == 'Base' and adjustments:
+            group_expr = group_expr + pl.sum_horizontal(adjustments)
+        exprs.append(group_expr.alias(group_name))
+
+    columns = list(dict.fromkeys(
+        [model.kpi] + [col for terms in var_terms.values() for col, _ in terms if col is not None]
+    ))
+    frame = pl.from_pandas(data[columns], nan_to_null=False, include_index=False)
+
+    # with_columns broadcasts constant-only groups to the full frame length
+    return frame.lazy().with_columns(exprs).select(list(group_exprs)).collect()
+
+def _decomposition_frame(index, actual, predicted, group_arrays):
+    """
+    Build the decomposition DataFrame once from its arrays.
+
+    Parameters:
+    -----------
+    index : pandas.Index
+        Index of the model data
+    actual : numpy.ndarray
+        Actual KPI values
+    predicted : numpy.ndarray
+        Predicted KPI values
+    group_arrays : dict
+        Dictionary of group name to contribution array
+
+    Returns:
+    --------
+    pandas.DataFrame
+        DataFrame with Actual, Predicted and one column per group
+    """
+    columns = {'Actual': actual, 'Predicted': predicted}
+    columns.update(group_arrays)
+    return pd.DataFrame(columns, index=index)
+
+def calculate_decomposition(model, groups, engine='pandas'):
     """
     Calculate decomposition of model effects by group.
 
@@ -180,6 +414,8 @@ def calculate_decomposition(model, groups):
         The model to decompose
     groups : dict
         Dictionary with group info for each variable
+    engine : str, optional
+        'pandas' (default) or 'polars' to run the grouping as a lazy Polars query
 
     Returns:
     --------
@@ -188,32 +424,36 @@ def calculate_decomposition(model, groups):
     """
     print(f"Starting decomposition calculation with {len(model.model_data)} observations")
 
-    # Get model coefficients
+    # Get model coefficients (plain dict for fast per-variable lookups)
     coefficients = model.results.params
+    coef_dict = coefficients.to_dict()
 
     # Get model data - IMPORTANT: use model_data, not data
-    data = model.model_data.copy()
+    data = model.model_data
+    n_obs = len(data)
 
-    # Create DataFrame to store contributions
-    contributions = pd.DataFrame(index=data.index)
-
-    # Add actual KPI values
-    contributions['Actual'] = data[model.kpi]
+    # Actual KPI values
+    actual = data[model.kpi].to_numpy()
 
-    # Add predicted values - IMPORTANT: recalculate predictions using current data
+    # Predicted values - IMPORTANT: recalculate predictions using current data
     try:
-        import statsmodels.api as sm
-        X = sm.add_constant(data[model.features])
-        predictions = model.results.predict(X)
-        contributions['Predicted'] = predictions
+        params = coefficients[model.features].to_numpy(dtype=float)
+        predicted = data[model.features].to_numpy(dtype=float) @ params + coefficients.get('const', 0.0)
     except Exception as e:
         print(f"Error calculating predictions: {str(e)}")
         # Fallback to stored predictions if available
-        contributions['Predicted'] = model.results.predict()
+        predicted = np.asarray(model.results.predict())
 
     # Check lengths match
-    print(f"Contributions dataframe has {len(contributions)} rows")
-    print(f"Model data has {len(data)} rows")
+    print(f"Decomposition has {len(predicted)} rows")
+    print(f"Model data has {n_obs} rows")
+
+    if engine == 'polars':
+        if POLARS_AVAILABLE:
+            grouped = _polars_group_contributions(model, data, groups, coef_dict)
+            group_arrays = {column.name: column.to_numpy() for column in grouped.get_columns()}
+            return _decomposition_frame(data.index, actual, predicted, group_arrays)
+        print("Polars not available. Using pandas engine instead.")
 
     # Track variable contributions before grouping (for adjustments)
     var_contributions = {}
@@ -221,29 +461,25 @@ def calculate_decomposition(model, groups):
     # First calculate individual variable contributions
     for var, group_info in groups.items():
         # Skip variables not in coefficients
-        if var not in coefficients:
+        if var not in coef_dict:
             continue
 
         # Get coefficient
-        coef = coefficients[var]
+        coef = coef_dict[var]
 
         # Get variable values (handle 'const' specially)
         if var == 'const':
-            values = pd.Series(1, index=data.index)
+            values = np.ones(n_obs)
         else:
             # Skip if variable not in data
             if var not in data.columns:
                 print(f"Warning: Variable '{var}' not found in data, skipping")
                 continue
-            values = data[var]
+            values = data[var].to_numpy(dtype=float)
 
         # Calculate contribution
         var_contributions[var] = coef * values
 
-    # Now apply adjustments and group variables
-    grouped_contributions = {}
-    adjustment_values = {}
-
     # Process weighted variables
     if hasattr(model, 'wgtd_variables'):
         for wgtd_var, wgtd_info in model.wgtd_variables.items():
@@ -255,7 +491,7 @@ def calculate_decomposition(model, groups):
                 components = wgtd_info.get('components', {})
 
                 # Calculate total weight
-                total_weight = sum(abs(coef) for coef in components.values())
+                total_weight = _wgtd_total_weight(wgtd_info)
 
                 if total_weight > 0:
                     # Remove weighted variable from var_contributions
@@ -268,7 +504,7 @@ def calculate_decomposition(model, groups):
 
                         # Add to var_contributions
                         if component in var_contributions:
-                            var_contributions[component] += component_contribution
+                            var_contributions[component] = var_contributions[component] + component_contribution
                         else:
                             var_contributions[component] = component_contribution
 
@@ -276,63 +512,38 @@ def calculate_decomposition(model, groups):
                         if component not in groups and wgtd_var in groups:
                             groups[component] = groups[wgtd_var]
 
-    # Group variables by their group
-    for var, contribution in var_contributions.items():
-        if var not in groups:
-            continue
-
+    # Collect contributions of grouped variables into one (observations x variables) array
+    feat_list = [var for var in var_contributions if var in groups]
+    if feat_list:
+        C = np.column_stack([var_contributions[var] for var in feat_list])
+    else:
+        C = np.empty((n_obs, 0))
+
+    # Adjustment kind per variable: 0 = none, 1 = Min, 2 = Max
+    adjust_kind = np.fromiter(
+        (_ADJUSTMENT_CODES.get(groups[var].get('Adjustment', ''), 0) for var in feat_list),
+        dtype=np.int8, count=len(feat_list)
+    )
+
+    # Group position per variable
+    group_names = []
+    group_idx = np.empty(len(feat_list), dtype=int)
+    for col, var in enumerate(feat_list):
         group_name = groups[var]['Group']
-        adjustment = groups[var].get('Adjustment', '')
+        if group_name not in group_names:
+            group_names.append(group_name)
+        group_idx[col] = group_names.index(group_name)
 
-        # Initialize group if new
-        if group_name not in grouped_contributions:
-            grouped_contributions[group_name] = pd.Series(0, index=data.index)
+    # Apply adjustments and group variables
+    grouped_contributions, adj = _group_contributions(C, adjust_kind, group_idx, len(group_names))
 
-        # Apply Min adjustment if specified
-        if adjustment == 'Min':
-            # Calculate minimum value
-            min_value = contribution.min()
+    # Add total adjustment to each observation in Base
+    if 'Base' in group_names and adjust_kind.any():
+        grouped_contributions[:, group_names.index('Base')] += adj.sum()
 
-            # Apply adjustment (subtract min from all values)
-            adjusted_contribution = contribution - min_value
+    group_arrays = {group_name: grouped_contributions[:, g] for g, group_name in enumerate(group_names)}
 
-            # Track adjustment for adding to Base
-            adjustment_values[var] = min_value
-
-            # Add adjusted contribution to group
-            grouped_contributions[group_name] += adjusted_contribution
-        # Add this new condition for Max adjustment
-        elif adjustment == 'Max':
-            # Calculate maximum value
-            max_value = contribution.max()
-
-            # Apply adjustment (subtract max from all values)
-            adjusted_contribution = contribution - max_value
-
-            # Track adjustment for adding to Base
-            adjustment_values[var] = max_value
-
-            # Add adjusted contribution to group
-            grouped_contributions[group_name] += adjusted_contribution
-        else:
-            # No adjustment
-            grouped_contributions[group_name] += contribution
-
-    # Add total adjustment to Base
-    if 'Base' in grouped_contributions and adjustment_values:
-        total_adjustment = sum(adjustment_values.values())
-        # Add a total_adjustment value to each observation in Base
-        base_contribution = grouped_contributions['Base']
-
-        # Instead of adding min * len(data), add min to each data point
-        for i in range(len(base_contribution)):
-            base_contribution.iloc[i] += total_adjustment
-
-    # Add grouped contributions to DataFrame
-    for group_name, contribution in grouped_contributions.items():
-        contributions[group_name] = contribution
-
-    return contributions
+    return _decomposition_frame(data.index, actual, predicted, group_arrays)
 
 ### Decomposition of specific Groups ###
 
@@ -453,8 +664,8 @@ def calculate_group_decomposition(model, groups, group_name):
     pandas.DataFrame
         DataFrame with decomposed contributions for variables in the group
     """
-    # Get model coefficients
-    coefficients = model.results.params
+    # Get model coefficients (plain dict for fast per-variable lookups)
+    coef_dict = model.results.params.to_dict()
 
     # Get model data
     data = model.model_data.copy()
@@ -466,24 +677,24 @@ def calculate_group_decomposition(model, groups, group_name):
     contributions['Actual'] = data[model.kpi]
 
     # Calculate total contribution of the group
-    group_total = pd.Series(0, index=data.index)
+    group_total = np.zeros(len(data))
 
     # Filter variables that belong to the specified group
     group_variables = {}
     for var, group_info in groups.items():
-        if group_info['Group'] == group_name and var in coefficients:
+        if group_info['Group'] == group_name and var in coef_dict:
             # Get coefficient
-            coef = coefficients[var]
+            coef = coef_dict[var]
 
             # Get variable values (handle 'const' specially)
             if var == 'const':
-                values = pd.Series(1, index=data.index)
+                values = np.ones(len(data))
             else:
                 # Skip if variable not in data
                 if var not in data.columns:
                     print(f"Warning: Variable '{var}' not found in data, skipping")
                     continue
-                values = data[var]
+                values = data[var].to_numpy(dtype=float)
 
             # Calculate contribution
             contribution = coef * values
@@ -492,7 +703,7 @@ def calculate_group_decomposition(model, groups, group_name):
             adjustment = group_info.get('Adjustment', '')
             if adjustment == 'Min':
                 # Calculate minimum value
-                min_value = contribution.min()
+                min_value = np.nanmin(contribution)
 
                 # Apply adjustment (subtract min from all values)
                 adjusted_contribution = contribution - min_value
@@ -505,7 +716,7 @@ def calculate_group_decomposition(model, groups, group_name):
             # Add this new condition for Max adjustment
             elif adjustment == 'Max':
                 # Calculate maximum value
-                max_value = contribution.max()
+                max_value = np.nanmax(contribution)
 
                 # Apply adjustment (subtract max from all values)
                 adjusted_contribution = contribution - max_value
@@ -524,7 +735,7 @@ def calculate_group_decomposition(model, groups, group_name):
     if hasattr(model, 'wgtd_variables'):
         for wgtd_var, wgtd_info in model.wgtd_variables.items():
             # Check if this weighted variable is in the model and belongs to the group
-            if wgtd_var in coefficients and wgtd_var in groups and groups[wgtd_var]['Group'] == group_name:
+            if wgtd_var in coef_dict and wgtd_var in groups and groups[wgtd_var]['Group'] == group_name:
                 # Get component variables and coefficients
                 components = wgtd_info.get('components', {})
 
@@ -536,11 +747,11 @@ def calculate_group_decomposition(model, groups, group_name):
                     print(f"Warning: Weighted variable '{wgtd_var}' not found in data, skipping")
                     continue
 
-                wgtd_coef = coefficients[wgtd_var]
+                wgtd_coef = coef_dict[wgtd_var]
                 wgtd_contribution = wgtd_coef * wgtd_values
 
                 # Get the total weight
-                total_weight = sum(abs(coef) for coef in components.values())
+                total_weight = _wgtd_total_weight(wgtd_info)
 
                 # Add each component's proportional contribution
                 for component, component_coef in components.items():
@@ -595,12 +806,12 @@ def expand_weighted_variable_contributions(model, contributions_df):
     if not hasattr(model, 'wgtd_variables') or not model.wgtd_variables:
         return contributions_df
 
-    # Create a copy to avoid modifying the original
-    df = contributions_df.copy()
+    # Work on a dict of column arrays to avoid copying the DataFrame for every change
+    cols = {col: contributions_df[col].to_numpy(copy=False) for col in contributions_df.columns}
 
     # Look for weighted variables in the DataFrame
     for var_name, var_info in model.wgtd_variables.items():
-        if var_name not in df.columns:
+        if var_name not in cols:
             continue
 
         # Get component variables and coefficients
@@ -608,11 +819,11 @@ def expand_weighted_variable_contributions(model, contributions_df):
         if not components:
             continue
 
-        # Get the total contribution of the weighted variable
-        wgtd_contribution = df[var_name]
+        # Get the total contribution of the weighted variable and remove its column
+        wgtd_contribution = cols.pop(var_name)
 
         # Calculate the total weight
-        total_weight = sum(abs(coef) for coef in components.values())
+        total_weight = _wgtd_total_weight(var_info)
 
         # Add individual component contributions
         for component, coef in components.items():
@@ -622,15 +833,12 @@ def expand_weighted_variable_contributions(model, contributions_df):
                 component_contribution = wgtd_contribution * (coef / total_weight)
 
                 # Add or combine with existing column
-                if component in df.columns:
-                    df[component] += component_contribution
+                if component in cols:
+                    cols[component] = cols[component] + component_contribution
                 else:
-                    df[component] = component_contribution
-
-        # Remove the weighted variable column
-        df = df.drop(var_name, axis=1)
+                    cols[component] = component_contribution
 
-    return df
+    return pd.DataFrame(cols, index=contributions_df.index)
 
 def patch_decomposition_calculate():
     """
@@ -646,12 +854,12 @@ def patch_decomposition_calculate():
         from src.decomposition import calculate_decomposition as original_calculate_decomposition
         import src.decomposition
 
-        def new_calculate_decomposition(model, groups):
+        def new_calculate_decomposition(model, groups, engine='pandas'):
             """
             Patched version of calculate_decomposition that handles weighted variables.
             """
             # Call the original function
-            contributions = original_calculate_decomposition(model, groups)
+            contributions = original_calculate_decomposition(model, groups, engine=engine)
 
             # Expand weighted variables
             expanded_contributions = expand_weighted_variable_contributions(model, contributions)
@@ -714,7 +922,7 @@ def patch_calculate_group_decomposition():
                 wgtd_contribution = contributions[wgtd_var]
 
                 # Calculate total weight
-                total_weight = sum(abs(coef) for coef in components.values())
+                total_weight = _wgtd_total_weight(model.wgtd_variables[wgtd_var])
 
                 # Add component contributions
                 for component, coef in components.items():
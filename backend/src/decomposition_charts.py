@@ -6,10 +6,15 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.colors as mcolors
+from matplotlib.collections import PolyCollection
+from matplotlib.patches import Patch
 import ipywidgets as widgets
 from IPython.display import display, HTML, clear_output
 import io
+import os
 import base64
+from functools import lru_cache
+from hashlib import blake2b
 
 # For interactive charts
 try:
@@ -21,6 +26,27 @@ except ImportError:
     print("Plotly not available. Interactive charts will be disabled.")
     print("To enable interactive charts: pip install plotly")
 
+# plotly-resampler is optional - used to resample long line traces on zoom
+try:
+    from plotly_resampler import FigureWidgetResampler
+    PLOTLY_RESAMPLER_AVAILABLE = True
+except ImportError:
+    PLOTLY_RESAMPLER_AVAILABLE = False
+
+# tsdownsample is optional - used for fast LTTB downsampling of static chart lines
+try:
+    from tsdownsample import LTTBDownsampler
+    TSDOWNSAMPLE_AVAILABLE = True
+except ImportError:
+    TSDOWNSAMPLE_AVAILABLE = False
+
+# Numba is optional - used to split and stack very large decomposition tables
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 # Define color mapping for common groups
 GROUP_COLORS = {
     'Base': '#CCCCCC',        # Light gray
@@ -38,6 +64,57 @@ GROUP_COLORS = {
     'Other': '#808080'        # Gray
 }
 
+# Case-insensitive lookup of the predefined group colors
+_GROUP_COLORS_LOWER = {key.lower(): color for key, color in GROUP_COLORS.items()}
+
+# Fallback colors for groups without a predefined color
+_TABLEAU = list(mcolors.TABLEAU_COLORS.values())
+
+# Standard color palette for individual variables, with enough distinct colors
+VARIABLE_COLORS = (
+    '#1f77b4',  # blue
+    '#ff7f0e',  # orange
+    '#2ca02c',  # green
+    '#d62728',  # red
+    '#9467bd',  # purple
+    '#8c564b',  # brown
+    '#e377c2',  # pink
+    '#7f7f7f',  # gray
+    '#bcbd22',  # olive
+    '#17becf',  # teal
+    '#aec7e8',  # light blue
+    '#ffbb78',  # light orange
+    '#98df8a',  # light green
+    '#ff9896',  # light red
+    '#c5b0d5',  # light purple
+    '#c49c94',  # light brown
+    '#f7b6d2',  # light pink
+    '#c7c7c7',  # light gray
+    '#dbdb8d',  # light olive
+    '#9edae5'   # light teal
+)
+
+# Line traces switch to WebGL (Scattergl) from this many observations
+WEBGL_THRESHOLD = 1000
+
+# Maximum number of buckets for M4 downsampling of line traces
+LINE_MAX_BUCKETS = 2000
+
+# Use plotly-resampler (when installed) for date-indexed charts longer than this
+USE_PLOTLY_RESAMPLER = True
+RESAMPLER_THRESHOLD = 5000
+
+# Minimum number of cells (columns x observations) before the Numba stacking kernel is used
+NUMBA_MIN_CELLS = 100000
+
+# Static chart lines longer than this are reduced to STATIC_LINE_POINTS points with LTTB
+STATIC_LINE_THRESHOLD = 5000
+STATIC_LINE_POINTS = 2000
+
+# Matplotlib settings used when drawing static charts (merge near-collinear line segments)
+_SIMPLIFY_RC = {'path.simplify': True, 'path.simplify_threshold': 1.0}
+
+@lru_cache(maxsize=256)
 def get_group_color(group_name):
     """
     Get color for a group, using predefined colors where available.
@@ -53,15 +130,669 @@ def get_group_color(group_name):
         Hex color code
     """
     # Check if we have a predefined color
-    for key, color in GROUP_COLORS.items():
-        if key.lower() == group_name.lower():
-            return color
+    color = _GROUP_COLORS_LOWER.get(group_name.lower())
+    if color is not None:
+        return color
             
     # If not, return a color based on the built-in colormap
-    colors = list(mcolors.TABLEAU_COLORS.values())
-    # Hash the group name to get a consistent color
-    hash_val = hash(group_name) % len(colors)
-    return colors[hash_val]
+    return _fallback_color(group_name)
+
+@lru_cache(maxsize=1024)
+def _fallback_color(name):
+    """
+    Pick a built-in colormap color for a name using a stable digest.
+
+    Unlike hash(), the digest is the same in every Python process, so a
+    group keeps its color across sessions.
+
+    Parameters:
+    -----------
+    name : str
+        Name of the group
+
+    Returns:
+    --------
+    str
+        Hex color code
+    """
+    digest = blake2b(name.encode(), digest_size=4).digest()
+    return _TABLEAU[int.from_bytes(digest, 'little') % len(_TABLEAU)]
+
+def _split_contributions(df, contribution_cols):
+    """
+    Split contributions into positive and negative parts.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        DataFrame with decomposed contributions
+    contribution_cols : list
+        List of contribution column names
+
+    Returns:
+    --------
+    tuple
+        (positive, negative) arrays with one contiguous row per contribution column
+    """
+    # Transpose so each contribution column is a contiguous row
+    M = np.ascontiguousarray(df[contribution_cols].to_numpy(dtype=float).T)
+    # NaN compares False on both sides, so missing values land as 0 in each part
+    return np.where(M > 0, M, 0.0), np.where(M < 0, M, 0.0)
+
+def _stack_bases(pos, neg):
+    """
+    Compute the stacking base of each bar trace.
+
+    Positive parts stack upwards in column order and negative parts stack
+    downwards in reverse column order.
+
+    Parameters:
+    -----------
+    pos : numpy.ndarray
+        Positive contributions, one row per contribution column
+    neg : numpy.ndarray
+        Negative contributions, one row per contribution column
+
+    Returns:
+    --------
+    tuple
+        (positive bases, negative bases) arrays of the same shape
+    """
+    bottoms_pos = np.zeros_like(pos)
+    np.cumsum(pos[:-1], axis=0, out=bottoms_pos[1:])
+
+    bottoms_neg = np.zeros_like(neg)
+    bottoms_neg[:-1] = np.cumsum(neg[:0:-1], axis=0)[::-1]
+
+    return bottoms_pos, bottoms_neg
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _split_and_stack_kernel(M):
+        """
+        Numba kernel splitting contributions by sign and computing stacking bases in one pass.
+        """
+        k, n = M.shape
+        pos = np.empty_like(M)
+        neg = np.empty_like(M)
+        bottoms_pos = np.empty_like(M)
+        bottoms_neg = np.empty_like(M)
+
+        # Observations are independent
+        for t in prange(n):
+            cum = 0.0
+            for j in range(k):
+                v = M[j, t]
+                p = v if v > 0 else 0.0
+                pos[j, t] = p
+                bottoms_pos[j, t] = cum
+                cum += p
+
+            cum = 0.0
+            for j in range(k - 1, -1, -1):
+                v = M[j, t]
+                q = v if v < 0 else 0.0
+                neg[j, t] = q
+                bottoms_neg[j, t] = cum
+                cum += q
+
+        return pos, neg, bottoms_pos, bottoms_neg
+
+def _split_and_stack(df, contribution_cols):
+    """
+    Split contributions by sign and compute the stacking base of each bar trace.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        DataFrame with decomposed contributions
+    contribution_cols : list
+        List of contribution column names
+
+    Returns:
+    --------
+    tuple
+        (positive, negative, positive bases, negative bases) arrays with one
+        contiguous row per contribution column
+    """
+    if NUMBA_AVAILABLE and len(contribution_cols) * len(df) >= NUMBA_MIN_CELLS:
+        M = np.ascontiguousarray(df[contribution_cols].to_numpy(dtype=np.float64).T)
+        return _split_and_stack_kernel(M)
+
+    pos, neg = _split_contributions(df, contribution_cols)
+    bottoms_pos, bottoms_neg = _stack_bases(pos, neg)
+    return pos, neg, bottoms_pos, bottoms_neg
+
+def _add_bar_collection(ax, x, values, bases, colors, rows, width=0.8):
+    """
+    Draw the stacked bars of several columns as a single PolyCollection.
+
+    Parameters:
+    -----------
+    ax : matplotlib.axes.Axes
+        Axes to draw on
+    x : numpy.ndarray
+        Bar positions
+    values : numpy.ndarray
+        Bar heights, one row per contribution column
+    bases : numpy.ndarray
+        Stacking base of each bar, same shape as values
+    colors : list
+        Color of each contribution column
+    rows : array-like
+        Rows (contribution columns) to draw
+    width : float, optional
+        Bar width
+
+    Returns:
+    --------
+    matplotlib.collections.PolyCollection or None
+        The added collection, or None if there is nothing to draw
+    """
+    rows = np.asarray(rows, dtype=int)
+    # One quad per non-zero cell
+    r, t = np.nonzero(values[rows])
+    if len(r) == 0:
+        return None
+    rows = rows[r]
+
+    x0 = x[t] - width / 2
+    x1 = x[t] + width / 2
+    y0 = bases[rows, t]
+    y1 = y0 + values[rows, t]
+    verts = np.stack([
+        np.column_stack([x0, y0]),
+        np.column_stack([x0, y1]),
+        np.column_stack([x1, y1]),
+        np.column_stack([x1, y0]),
+    ], axis=1)
+
+    facecolors = np.asarray(colors, dtype=object)[rows].tolist()
+    collection = PolyCollection(verts, facecolors=facecolors, edgecolors='none')
+    ax.add_collection(collection)
+    return collection
+
+def _bar_legend_handles(contribution_cols, colors, pos_any, neg_any):
+    """
+    Build one legend handle per contribution column that has any bars.
+
+    Columns with positive values come first in column order, followed by
+    negative-only columns in reverse order, matching the stacking order.
+
+    Parameters:
+    -----------
+    contribution_cols : list
+        List of contribution column names
+    colors : list
+        Color of each contribution column
+    pos_any, neg_any : numpy.ndarray
+        Whether each column has any positive/negative values
+
+    Returns:
+    --------
+    list
+        matplotlib.patches.Patch legend handles
+    """
+    rows = list(np.flatnonzero(pos_any))
+    rows += [j for j in np.flatnonzero(neg_any)[::-1] if not pos_any[j]]
+    return [Patch(color=colors[j], label=contribution_cols[j]) for j in rows]
+
+def _static_xticks(df):
+    """
+    Tick positions and labels for the x-axis of a static decomposition chart.
+
+    Tick positions are chosen first so only the shown labels are formatted.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        DataFrame with decomposed contributions
+
+    Returns:
+    --------
+    tuple
+        (tick positions, tick labels)
+    """
+    n = len(df)
+
+    # Show subset of labels if there are many (~12 labels)
+    step = max(n // 12, 1) if n > 30 else 1
+    x_ticks = np.arange(0, n, step)
+
+    if isinstance(df.index, pd.DatetimeIndex):
+        # Monthly format for many observations, full date for fewer
+        date_format = '%Y-%m' if n > 50 else '%Y-%m-%d'
+        x_labels = df.index[x_ticks].strftime(date_format).tolist()
+    else:
+        # Use week labels if no date index
+        x_labels = [f'w{i+1}' for i in x_ticks]
+
+    return x_ticks, x_labels
+
+def _finish_static_chart(fig, output_path=None):
+    """
+    Show a static Matplotlib chart, or save it when an output path is given.
+    
+    Parameters:
+    -----------
+    fig : matplotlib.figure.Figure
+        The finished chart
+    output_path : str, optional
+        File to save the chart to; the format is taken from the extension
+        and defaults to PDF when there is none
+        
+    Returns:
+    --------
+    None
+    """
+    with plt.rc_context(_SIMPLIFY_RC):
+        if output_path is None:
+            plt.show()
+            return
+        
+        # Vector backends serialize each PolyCollection as one path object,
+        # so saving does not rasterize the bars one rectangle at a time
+        fmt = None if os.path.splitext(str(output_path))[1] else 'pdf'
+        fig.savefig(output_path, format=fmt, bbox_inches='tight')
+    plt.close(fig)
+
+def _lttb_indices(y, n_out):
+    """
+    Select the points to draw for a long line using Largest-Triangle-Three-Buckets.
+
+    Parameters:
+    -----------
+    y : numpy.ndarray
+        Line values (x is the observation position)
+    n_out : int
+        Number of points to keep
+
+    Returns:
+    --------
+    numpy.ndarray
+        Sorted indices of the points to keep
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    if TSDOWNSAMPLE_AVAILABLE:
+        return np.sort(LTTBDownsampler().downsample(np.ascontiguousarray(y), n_out=n_out))
+
+    # First and last points are always kept; the rest come one per bucket
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    x = np.arange(n, dtype=float)
+    idx = np.empty(n_out, dtype=int)
+    idx[0] = 0
+    idx[-1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        # Average point of the next bucket (the last point for the final bucket)
+        if i + 2 < n_out - 1:
+            next_start, next_end = edges[i + 1], edges[i + 2]
+        else:
+            next_start, next_end = n - 1, n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        # Keep the point forming the largest triangle with the previous pick and the average
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + np.argmax(np.where(np.isnan(area), -1.0, area))
+        idx[i + 1] = a
+
+    return idx
+
+def _static_line(x, y):
+    """
+    X and y values for a static chart line, LTTB-downsampled for long series.
+
+    Parameters:
+    -----------
+    x : numpy.ndarray
+        Observation positions
+    y : array-like
+        Line values
+
+    Returns:
+    --------
+    tuple
+        (x values, y values) to plot
+    """
+    # Plain arrays on the integer x-axis keep pandas' date converter (and its
+    # tick finder for DatetimeIndex data) out of the plotting path
+    y = np.asarray(y, dtype=float)
+    if len(y) <= STATIC_LINE_THRESHOLD:
+        return x, y
+    keep = _lttb_indices(y, STATIC_LINE_POINTS)
+    return x[keep], y[keep]
+
+def _m4_indices(y, n_buckets=LINE_MAX_BUCKETS):
+    """
+    Select the points to draw for a long line using M4 downsampling.
+
+    The series is split into equal-width buckets and the first, last,
+    minimum and maximum point of each bucket are kept, which preserves the
+    drawn shape of the line.
+
+    Parameters:
+    -----------
+    y : numpy.ndarray
+        Line values
+    n_buckets : int, optional
+        Number of buckets
+
+    Returns:
+    --------
+    numpy.ndarray
+        Sorted indices of the points to keep
+    """
+    n = len(y)
+    if n <= 4 * n_buckets:
+        return np.arange(n)
+
+    # Pad to equal bucket sizes so the buckets can be reduced as rows
+    size = -(-n // n_buckets)
+    n_rows = -(-n // size)
+    padded = np.full(n_rows * size, np.nan)
+    padded[:n] = y
+    rows = padded.reshape(n_rows, size)
+
+    offsets = np.arange(n_rows) * size
+    min_idx = offsets + np.argmin(np.where(np.isnan(rows), np.inf, rows), axis=1)
+    max_idx = offsets + np.argmax(np.where(np.isnan(rows), -np.inf, rows), axis=1)
+    last_idx = np.minimum(offsets + size - 1, n - 1)
+
+    keep = np.unique(np.concatenate([offsets, min_idx, max_idx, last_idx]))
+    return keep[keep < n]
+
+def _line_trace(x_values, y, customdata, **kwargs):
+    """
+    Create a Plotly line trace, downsampled and WebGL-rendered for long series.
+
+    Parameters:
+    -----------
+    x_values : array-like
+        X-axis values
+    y : array-like
+        Line values
+    customdata : numpy.ndarray or None
+        Custom hover data aligned with the values
+    **kwargs
+        Other trace properties
+
+    Returns:
+    --------
+    plotly.graph_objects.Scatter or plotly.graph_objects.Scattergl
+        The line trace
+    """
+    y = np.asarray(y, dtype=float)
+    keep = _m4_indices(y)
+    if len(keep) < len(y):
+        x_values = np.asarray(x_values)[keep]
+        y = y[keep]
+        if customdata is not None:
+            customdata = customdata[keep]
+
+    scatter_cls = go.Scattergl if len(y) >= WEBGL_THRESHOLD else go.Scatter
+    return scatter_cls(x=x_values, y=y.astype(np.float32), customdata=customdata, **kwargs)
+
+def _add_line_trace(fig, x_values, y, customdata, **kwargs):
+    """
+    Add a line trace to a figure, letting plotly-resampler aggregate it when in use.
+
+    Parameters:
+    -----------
+    fig : plotly.graph_objects.Figure or FigureWidgetResampler
+        Figure to add the line to
+    x_values : array-like
+        X-axis values
+    y : array-like
+        Line values
+    customdata : numpy.ndarray or None
+        Custom hover data aligned with the values
+    **kwargs
+        Other trace properties
+    """
+    if PLOTLY_RESAMPLER_AVAILABLE and isinstance(fig, FigureWidgetResampler):
+        # The resampler keeps the full series and sends only the visible window
+        fig.add_trace(go.Scattergl(**kwargs), hf_x=x_values, hf_y=np.asarray(y, dtype=np.float32))
+    else:
+        fig.add_trace(_line_trace(x_values, y, customdata, **kwargs))
+
+def _plotly_date_axis(df):
+    """
+    X-axis values, hover template and ticks for a date-indexed Plotly chart.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        DataFrame with a DatetimeIndex
+
+    Returns:
+    --------
+    tuple
+        (x values, customdata, line hovertemplate, bar hovertemplate, xaxis settings)
+    """
+    x_values = df.index.to_numpy()
+    hovertemplate = "Date: %{x|%Y-%m-%d}<br>%{fullData.name}: %{y:,.2f}<extra></extra>"
+    # Stacked bars have a base, so their own value is passed in customdata
+    bar_hovertemplate = "Date: %{x|%Y-%m-%d}<br>%{fullData.name}: %{customdata:,.2f}<extra></extra>"
+
+    # If many dates, pick monthly ticks
+    if len(df) > 30:
+        # First date of each month, in order of appearance
+        periods = df.index.to_period('M').asi8
+        _, first_idx = np.unique(periods, return_index=True)
+        tickvals = df.index[np.sort(first_idx)]
+        ticktext = tickvals.strftime('%b %Y').tolist()
+    else:
+        # For fewer dates, show them all
+        tickvals = df.index
+        ticktext = df.index.strftime('%Y-%m-%d').tolist()
+
+    xaxis = dict(tickvals=tickvals, ticktext=ticktext, tickangle=45)
+    return x_values, None, hovertemplate, bar_hovertemplate, xaxis
+
+def _plotly_period_axis(df):
+    """
+    X-axis values, hover template and ticks for a Plotly chart without dates.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        DataFrame with a non-date index
+
+    Returns:
+    --------
+    tuple
+        (x values, customdata, line hovertemplate, bar hovertemplate, xaxis settings or None)
+    """
+    n = len(df)
+    x_values = [f"Week {i+1}" for i in range(n)]
+    customdata = np.arange(1, n + 1)
+    hovertemplate = "Period: %{customdata}<br>%{fullData.name}: %{y:,.2f}<extra></extra>"
+    # Stacked bars have a base, so their own value is passed in customdata
+    bar_hovertemplate = "Period: %{customdata[0]}<br>%{fullData.name}: %{customdata[1]:,.2f}<extra></extra>"
+
+    xaxis = None
+    if n > 30:
+        # Pick a subset of ticks
+        step = max(n // 12, 1)
+        tickvals = list(range(0, n, step))
+        xaxis = dict(tickvals=tickvals, ticktext=[x_values[i] for i in tickvals], tickangle=45)
+
+    return x_values, customdata, hovertemplate, bar_hovertemplate, xaxis
+
+def _plotly_axis_setup(df, is_dt):
+    """
+    Dispatch once to the x-axis setup for the chart's index type.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        DataFrame with decomposed contributions
+    is_dt : bool
+        Whether the index is a DatetimeIndex
+
+    Returns:
+    --------
+    tuple
+        (x values, customdata, line hovertemplate, bar hovertemplate, xaxis settings or None)
+    """
+    axis_setup = _plotly_date_axis if is_dt else _plotly_period_axis
+    return axis_setup(df)
+
+def _bar_customdata(customdata, values):
+    """
+    Customdata of a stacked bar trace, carrying the bar's own values for the hover.
+
+    Parameters:
+    -----------
+    customdata : numpy.ndarray or None
+        Customdata of the x-axis (period numbers), if any
+    values : numpy.ndarray
+        The bar's values
+
+    Returns:
+    --------
+    numpy.ndarray
+        The values, or (period, value) rows when the axis has customdata
+    """
+    if customdata is None:
+        return values
+    return np.column_stack([customdata, values])
+
+def _batched_bar_traces(x_values, pos, neg, bottoms_pos, bottoms_neg, contribution_cols,
+                        colors, pos_nonzero, neg_nonzero, is_dt):
+    """
+    Build stacked decomposition bars as a single Bar trace per sign.
+
+    Each column's bars are tiled along x with their own stacking base and
+    color, so one trace draws the whole stack. Legend entries are added as
+    empty legend-only traces in the same order as the per-group charts.
+
+    Parameters:
+    -----------
+    x_values : array-like
+        X-axis values
+    pos, neg : numpy.ndarray
+        Positive and negative contributions, one row per contribution column
+    bottoms_pos, bottoms_neg : numpy.ndarray
+        Stacking bases of the positive and negative contributions
+    contribution_cols : list
+        List of contribution column names
+    colors : list
+        Color of each contribution column
+    pos_nonzero, neg_nonzero : numpy.ndarray
+        Whether each column has any non-zero positive/negative values
+    is_dt : bool
+        Whether the x values are dates
+
+    Returns:
+    --------
+    list
+        Plotly Bar traces
+    """
+    n = pos.shape[1]
+    x_values = np.asarray(x_values)
+    names = np.asarray(contribution_cols, dtype=object)
+    colors = np.asarray(colors, dtype=object)
+
+    # Bars are stacked with a base, so their own value is passed in customdata
+    if is_dt:
+        hovertemplate = "Date: %{x|%Y-%m-%d}<br>%{customdata[0]}: %{customdata[1]:,.2f}<extra></extra>"
+    else:
+        hovertemplate = "Period: %{customdata[0]}<br>%{customdata[1]}: %{customdata[2]:,.2f}<extra></extra>"
+
+    traces = []
+    # Positive parts bottom to top, negative parts top to bottom
+    for values, bases, rows, sign in (
+        (pos, bottoms_pos, np.flatnonzero(pos_nonzero), 'positive'),
+        (neg, bottoms_neg, np.flatnonzero(neg_nonzero)[::-1], 'negative'),
+    ):
+        if len(rows) == 0:
+            continue
+        row_names = np.repeat(names[rows], n)
+        row_values = values[rows].ravel()
+        if is_dt:
+            customdata = np.column_stack([row_names, row_values])
+        else:
+            customdata = np.column_stack([np.tile(np.arange(1, n + 1), len(rows)), row_names, row_values])
+        traces.append(go.Bar(
+            x=np.tile(x_values, len(rows)),
+            y=row_values,
+            base=bases[rows].ravel(),
+            name=f'Contributions ({sign})',
+            marker_color=np.repeat(colors[rows], n).tolist(),
+            customdata=customdata,
+            hovertemplate=hovertemplate,
+            showlegend=False
+        ))
+
+    # Legend entries: groups with positive values first, then negative-only groups
+    legend_rows = list(np.flatnonzero(pos_nonzero))
+    legend_rows += [j for j in np.flatnonzero(neg_nonzero)[::-1] if not pos_nonzero[j]]
+    for j in legend_rows:
+        traces.append(go.Bar(
+            x=[None],
+            y=[None],
+            name=contribution_cols[j],
+            marker_color=colors[j],
+            legendgroup=contribution_cols[j],
+            showlegend=True
+        ))
+
+    return traces
+
+# FigureWidget of the last decomposition chart shown for each model name
+_DECOMP_FIGURE_WIDGETS = {}
+
+def _show_decomp_figure(model, fig):
+    """
+    Show a decomposition figure, reusing the model's FigureWidget when possible.
+
+    If the previous chart for this model has the same traces, its data is
+    updated in place with a single batch update instead of rebuilding the
+    whole Plotly scene.
+
+    Parameters:
+    -----------
+    model : LinearModel
+        The model used for decomposition
+    fig : plotly.graph_objects.Figure
+        The newly built decomposition figure
+    """
+    widget = _DECOMP_FIGURE_WIDGETS.get(model.name)
+    trace_keys = [(trace.type, trace.name) for trace in fig.data]
+
+    if widget is not None and [(trace.type, trace.name) for trace in widget.data] == trace_keys:
+        with widget.batch_update():
+            for trace, new_trace in zip(widget.data, fig.data):
+                trace.update(
+                    x=new_trace.x,
+                    y=new_trace.y,
+                    customdata=new_trace.customdata,
+                    showlegend=new_trace.showlegend
+                )
+                if new_trace.type == 'bar':
+                    trace.base = new_trace.base
+                    trace.marker.color = new_trace.marker.color
+            widget.layout.xaxis.update(fig.layout.xaxis.to_plotly_json())
+            widget.layout.yaxis.title = fig.layout.yaxis.title
+        display(widget)
+        return
+
+    try:
+        widget = go.FigureWidget(fig)
+    except Exception:
+        # FigureWidget needs ipywidgets/anywidget - fall back to a static figure
+        fig.show()
+        return
+
+    _DECOMP_FIGURE_WIDGETS[model.name] = widget
+    display(widget)
 
 def display_decomposition_chart(model, decomp_df):
     """
@@ -78,9 +809,6 @@ def display_decomposition_chart(model, decomp_df):
     --------
     None
     """
-    # Create copy to avoid modifying original
-    df = decomp_df.copy()
-    
     # Refresh group assignments from file before displaying
     from src.decomposition import get_variable_groups
     latest_groups = get_variable_groups(model)
@@ -88,10 +816,12 @@ def display_decomposition_chart(model, decomp_df):
     # Update any missing group columns based on latest group settings
     # This ensures any new group assignments are reflected in the chart
     expected_groups = set(group_info['Group'] for group_info in latest_groups.values())
-    for group in expected_groups:
-        if group not in df.columns and group not in ['Actual', 'Predicted']:
-            # Add missing group with zeros
-            df[group] = 0.0
+    missing_groups = [group for group in expected_groups
+                      if group not in decomp_df.columns and group not in ['Actual', 'Predicted']]
+    
+    # Add missing groups with zeros without copying the original data
+    # (the original is never modified, so no defensive copy is needed)
+    df = decomp_df.assign(**{group: 0.0 for group in missing_groups}) if missing_groups else decomp_df
     
     # Get contribution columns (excluding Actual and Predicted)
     contribution_cols = [col for col in df.columns if col not in ['Actual', 'Predicted']]
@@ -130,7 +860,7 @@ def display_decomposition_chart(model, decomp_df):
     display(copy_button)
     display(output)
 
-def display_plotly_decomp_chart(model, df, contribution_cols):
+def display_plotly_decomp_chart(model, df, contribution_cols, batch_bars=False):
     """
     Display an interactive decomposition chart using Plotly.
     
@@ -142,186 +872,149 @@ def display_plotly_decomp_chart(model, df, contribution_cols):
         DataFrame with decomposed contributions
     contribution_cols : list
         List of contribution column names
+    batch_bars : bool, optional
+        If True, draw all positive and all negative contributions as one
+        bar trace each instead of one trace per group (faster to render
+        for many groups, but legend clicks no longer hide bars)
         
     Returns:
     --------
     None
     """
     # Split positive and negative contributions for each group
-    pos_contributions = pd.DataFrame(0, index=df.index, columns=contribution_cols)
-    neg_contributions = pd.DataFrame(0, index=df.index, columns=contribution_cols)
-    
-    for col in contribution_cols:
-        pos_contributions[col] = df[col].where(df[col] > 0, 0)
-        neg_contributions[col] = df[col].where(df[col] < 0, 0)
-    
-    # Create figure
-    fig = go.Figure()
-    
-    # Format x-axis values based on index type
-    if isinstance(df.index, pd.DatetimeIndex):
-        x_values = df.index
-        x_format = '%Y-%m-%d'
-        hover_format = '%Y-%m-%d'
+    pos, neg, bottoms_pos, bottoms_neg = _split_and_stack(df, contribution_cols)
+    
+    # Color and index type are the same for every trace
+    colors = [get_group_color(col) for col in contribution_cols]
+    is_dt = isinstance(df.index, pd.DatetimeIndex)
+    
+    # Create figure (long date-indexed charts are resampled on zoom when possible)
+    use_resampler = (USE_PLOTLY_RESAMPLER and PLOTLY_RESAMPLER_AVAILABLE
+                     and is_dt and len(df) > RESAMPLER_THRESHOLD)
+    if use_resampler:
+        fig = FigureWidgetResampler(go.Figure(), default_n_shown_samples=LINE_MAX_BUCKETS)
+        # Bars are stacked on precomputed bases, so they are never aggregated
+        bar_kwargs = {'max_n_samples': len(df)}
     else:
-        x_values = [f"Week {i+1}" for i in range(len(df))]
-        x_format = None
-        hover_format = None
+        fig = go.Figure()
+        bar_kwargs = {}
+    
+    # Format x-axis values, hover template and ticks for this index type
+    x_values, customdata, hovertemplate, bar_hovertemplate, xaxis = _plotly_axis_setup(df, is_dt)
     
     # Keep track of groups that have been added to the legend
     legend_entries = {}  # Dictionary to track legend entries by group name
     
-    # Add positive contributions (bottom to top)
-    bottom_pos = np.zeros(len(df))
-    
-    for col in contribution_cols:
-        values = pos_contributions[col].values
-        color = get_group_color(col)
-        
-        # Create hover text
-        if isinstance(df.index, pd.DatetimeIndex):
-            hover_texts = [
-                f"Date: {date.strftime(hover_format)}<br>" +
-                f"{col}: {value:,.2f}"
-                for date, value in zip(df.index, values)
-            ]
-        else:
-            hover_texts = [
-                f"Period: {i+1}<br>" +
-                f"{col}: {value:,.2f}"
-                for i, value in enumerate(values)
-            ]
-        
-        # Determine if this group should show in legend
-        if col in legend_entries:
-            # Group already has a legend entry
-            show_in_legend = False
-            legendgroup = legend_entries[col]  # Use the same legend group
-        else:
-            # New group, create legend entry only if it has non-zero values
-            # Convert numpy.bool_ to Python bool to avoid Plotly error
-            show_in_legend = bool(np.sum(values) > 0)
-            if show_in_legend:
-                legend_entries[col] = col  # Use column name as legend group
-                legendgroup = col
-            else:
-                legendgroup = col
-                
-        # Add bar chart for this group's positive values
-        fig.add_trace(go.Bar(
-            x=x_values,
-            y=values,
-            base=bottom_pos,
-            name=col,
-            marker_color=color,
-            hoverinfo='text',
-            hovertext=hover_texts,
-            legendgroup=legendgroup,
-            showlegend=show_in_legend
-        ))
-        
-        # Update the bottom position for the next group
-        bottom_pos += values
+    # Columns with any non-zero values on each side (all-zero traces are skipped)
+    pos_nonzero = pos.any(axis=1)
+    neg_nonzero = neg.any(axis=1)
     
-    # Add negative contributions (top to bottom)
-    bottom_neg = np.zeros(len(df))
+    # Send bar values to the browser as float32 (bases are stacked in float64 first)
+    pos, neg = pos.astype(np.float32), neg.astype(np.float32)
+    bottoms_pos, bottoms_neg = bottoms_pos.astype(np.float32), bottoms_neg.astype(np.float32)
     
-    for col in reversed(contribution_cols):
-        values = neg_contributions[col].values
-        if np.any(values != 0):  # Only if there are non-zero negative values
-            color = get_group_color(col)
-            
-            # Create hover text
-            if isinstance(df.index, pd.DatetimeIndex):
-                hover_texts = [
-                    f"Date: {date.strftime(hover_format)}<br>" +
-                    f"{col}: {value:,.2f}"
-                    for date, value in zip(df.index, values)
-                ]
+    if batch_bars:
+        # One bar trace per sign, plus legend-only entries for each group
+        for trace in _batched_bar_traces(x_values, pos, neg, bottoms_pos, bottoms_neg,
+                                         contribution_cols, colors, pos_nonzero, neg_nonzero, is_dt):
+            if use_resampler:
+                fig.add_trace(trace, max_n_samples=len(trace.y))
             else:
-                hover_texts = [
-                    f"Period: {i+1}<br>" +
-                    f"{col}: {value:,.2f}"
-                    for i, value in enumerate(values)
-                ]
-            
+                fig.add_trace(trace)
+    else:
+        # Add positive contributions (bottom to top)
+        for j, col in enumerate(contribution_cols):
+            if not pos_nonzero[j]:
+                continue
+            values = pos[j]
+            color = colors[j]
+        
             # Determine if this group should show in legend
             if col in legend_entries:
                 # Group already has a legend entry
                 show_in_legend = False
-                legendgroup = legend_entries[col]
+                legendgroup = legend_entries[col]  # Use the same legend group
             else:
-                # New group, create legend entry if it has non-zero values
-                # Convert numpy.bool_ to Python bool
-                show_in_legend = bool(True)
-                legend_entries[col] = col
-                legendgroup = col
-            
-            # Add bar chart for this group's negative values
+                # New group, create legend entry only if it has non-zero values
+                # Convert numpy.bool_ to Python bool to avoid Plotly error
+                show_in_legend = bool(np.sum(values) > 0)
+                if show_in_legend:
+                    legend_entries[col] = col  # Use column name as legend group
+                    legendgroup = col
+                else:
+                    legendgroup = col
+                
+            # Add bar chart for this group's positive values
             fig.add_trace(go.Bar(
                 x=x_values,
                 y=values,
-                base=bottom_neg,
+                base=bottoms_pos[j],
                 name=col,
                 marker_color=color,
-                hoverinfo='text',
-                hovertext=hover_texts,
+                customdata=_bar_customdata(customdata, values),
+                hovertemplate=bar_hovertemplate,
                 legendgroup=legendgroup,
                 showlegend=show_in_legend
-            ))
+            ), **bar_kwargs)
+    
+        # Add negative contributions (top to bottom)
+        for j in reversed(range(len(contribution_cols))):
+            col = contribution_cols[j]
+            values = neg[j]
+            if neg_nonzero[j]:  # Only if there are non-zero negative values
+                color = colors[j]
             
-            # Update the bottom position for the next group
-            bottom_neg += values
+                # Determine if this group should show in legend
+                if col in legend_entries:
+                    # Group already has a legend entry
+                    show_in_legend = False
+                    legendgroup = legend_entries[col]
+                else:
+                    # New group, create legend entry if it has non-zero values
+                    # Convert numpy.bool_ to Python bool
+                    show_in_legend = bool(True)
+                    legend_entries[col] = col
+                    legendgroup = col
+            
+                # Add bar chart for this group's negative values
+                fig.add_trace(go.Bar(
+                    x=x_values,
+                    y=values,
+                    base=bottoms_neg[j],
+                    name=col,
+                    marker_color=color,
+                    customdata=_bar_customdata(customdata, values),
+                    hovertemplate=bar_hovertemplate,
+                    legendgroup=legendgroup,
+                    showlegend=show_in_legend
+                ), **bar_kwargs)
+    
     
     # Add Actual line with dots
-    if isinstance(df.index, pd.DatetimeIndex):
-        hover_texts = [
-            f"Date: {date.strftime(hover_format)}<br>" +
-            f"Actual: {value:,.2f}"
-            for date, value in zip(df.index, df['Actual'])
-        ]
-    else:
-        hover_texts = [
-            f"Period: {i+1}<br>" +
-            f"Actual: {value:,.2f}"
-            for i, value in enumerate(df['Actual'])
-        ]
-        
-    fig.add_trace(go.Scatter(
-        x=x_values,
-        y=df['Actual'],
+    _add_line_trace(
+        fig,
+        x_values,
+        df['Actual'],
+        customdata,
         mode='lines+markers',  # Add markers (dots)
         name='Actual',
         line=dict(color='black', width=2),
         marker=dict(size=6, color='black'),
-        hoverinfo='text',
-        hovertext=hover_texts
-    ))
+        hovertemplate=hovertemplate
+    )
     
     # Add Predicted line with dots
-    if isinstance(df.index, pd.DatetimeIndex):
-        hover_texts = [
-            f"Date: {date.strftime(hover_format)}<br>" +
-            f"Predicted: {value:,.2f}"
-            for date, value in zip(df.index, df['Predicted'])
-        ]
-    else:
-        hover_texts = [
-            f"Period: {i+1}<br>" +
-            f"Predicted: {value:,.2f}"
-            for i, value in enumerate(df['Predicted'])
-        ]
-        
-    fig.add_trace(go.Scatter(
-        x=x_values,
-        y=df['Predicted'],
+    _add_line_trace(
+        fig,
+        x_values,
+        df['Predicted'],
+        customdata,
         mode='lines+markers',  # Add markers (dots)
         name='Predicted',
         line=dict(color='red', width=2),
         marker=dict(size=6, color='red'),
-        hoverinfo='text',
-        hovertext=hover_texts
-    ))
+        hovertemplate=hovertemplate
+    )
     
     # Update layout
     fig.update_layout(
@@ -347,52 +1040,20 @@ def display_plotly_decomp_chart(model, df, contribution_cols):
         paper_bgcolor='white'  # White paper background
     )
     
-    # Configure xaxis dates if applicable
-    if isinstance(df.index, pd.DatetimeIndex):
-        tickvals = []
-        ticktext = []
-        
-        # If many dates, pick monthly ticks
-        if len(df) > 30:
-            # Generate unique months
-            month_ends = pd.Series(df.index).dt.to_period('M').unique()
-            for month in month_ends:
-                # Find dates in this month
-                month_dates = [d for d in df.index if (d.year == month.year and d.month == month.month)]
-                if month_dates:
-                    tickvals.append(month_dates[0])
-                    ticktext.append(month_dates[0].strftime('%b %Y'))
-        else:
-            # For fewer dates, show them all
-            tickvals = df.index
-            ticktext = [d.strftime('%Y-%m-%d') for d in df.index]
-        
-        fig.update_xaxes(
-            tickvals=tickvals,
-            ticktext=ticktext,
-            tickangle=45,
-        )
-    else:
-        # For non-date index
-        if len(df) > 30:
-            # Pick a subset of ticks
-            step = max(len(df) // 12, 1)
-            tickvals = list(range(0, len(df), step))
-            ticktext = [f"Week {i+1}" for i in tickvals]
-            
-            fig.update_xaxes(
-                tickvals=tickvals,
-                ticktext=ticktext,
-                tickangle=45,
-            )
+    # Configure xaxis ticks
+    if xaxis is not None:
+        fig.update_xaxes(**xaxis)
     
     # Add grid lines
     fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='lightgray')
     
-    # Show the plot
-    fig.show()
+    # Show the plot, updating the previous chart in place when possible
+    if use_resampler:
+        display(fig)
+    else:
+        _show_decomp_figure(model, fig)
 
-def display_static_decomp_chart(model, df, contribution_cols):
+def display_static_decomp_chart(model, df, contribution_cols, output_path=None):
     """
     Display a static decomposition chart using Matplotlib.
     
@@ -404,44 +1065,36 @@ def display_static_decomp_chart(model, df, contribution_cols):
         DataFrame with decomposed contributions
     contribution_cols : list
         List of contribution column names
+    output_path : str, optional
+        If given, save the chart to this file instead of showing it. The
+        format follows the extension ('.pdf', '.svg', '.png', ...); vector
+        formats write each bar collection as a single path object
         
     Returns:
     --------
     None
     """
     # Split positive and negative contributions for each group
-    pos_contributions = pd.DataFrame(0, index=df.index, columns=contribution_cols)
-    neg_contributions = pd.DataFrame(0, index=df.index, columns=contribution_cols)
+    pos, neg, bottoms_pos, bottoms_neg = _split_and_stack(df, contribution_cols)
     
-    for col in contribution_cols:
-        pos_contributions[col] = df[col].where(df[col] > 0, 0)
-        neg_contributions[col] = df[col].where(df[col] < 0, 0)
+    # Color for each group
+    colors = [get_group_color(col) for col in contribution_cols]
+    x = np.arange(len(df))
     
     # Create the figure
     fig, ax = plt.subplots(figsize=(14, 8))
     
-    # Plot positive contributions
-    bottom_pos = np.zeros(len(df))
-    for col in contribution_cols:
-        color = get_group_color(col)
-        ax.bar(range(len(df)), pos_contributions[col], bottom=bottom_pos, 
-              label=col if col not in neg_contributions.columns[neg_contributions.any()] else None,
-              color=color)
-        bottom_pos += pos_contributions[col].values
-    
-    # Plot negative contributions
-    bottom_neg = np.zeros(len(df))
-    for col in reversed(contribution_cols):  # Reverse to maintain consistent ordering
-        if neg_contributions[col].any():  # Only if there are negative values
-            color = get_group_color(col)
-            ax.bar(range(len(df)), neg_contributions[col], bottom=bottom_neg,
-                  label=None if col in pos_contributions.columns[pos_contributions.any()] else col,
-                  color=color)
-            bottom_neg += neg_contributions[col].values
+    # Plot all positive and all negative contributions as one collection each
+    pos_any = pos.any(axis=1)
+    neg_any = neg.any(axis=1)
+    _add_bar_collection(ax, x, pos, bottoms_pos, colors, np.flatnonzero(pos_any))
+    _add_bar_collection(ax, x, neg, bottoms_neg, colors, np.flatnonzero(neg_any))
+    ax.autoscale_view()
+    
     
     # Add lines for Actual and Predicted
-    ax.plot(range(len(df)), df['Actual'], 'k-', linewidth=2, label='Actual')
-    ax.plot(range(len(df)), df['Predicted'], 'r-', linewidth=2, label='Predicted')
+    line_handles = ax.plot(*_static_line(x, df['Actual']), 'k-', linewidth=2, label='Actual')
+    line_handles += ax.plot(*_static_line(x, df['Predicted']), 'r-', linewidth=2, label='Predicted')
     
     # Set chart title and labels
     ax.set_title('Decomposition Chart', fontsize=16)
@@ -449,32 +1102,7 @@ def display_static_decomp_chart(model, df, contribution_cols):
     ax.set_xlabel('', fontsize=12)
     
     # Set x-axis ticks using actual observation dates if available
-    if isinstance(df.index, pd.DatetimeIndex):  # Check if index is datetime
-        # Format dates based on number of observations
-        if len(df) > 50:
-            date_format = '%Y-%m'  # Monthly format for many observations
-        else:
-            date_format = '%Y-%m-%d'  # Full date for fewer observations
-        
-        # Create labels from dates
-        x_labels = [date.strftime(date_format) for date in df.index]
-        
-        # Show subset of labels if there are many
-        x_ticks = range(len(df))
-        if len(df) > 30:
-            # Show monthly or quarterly labels
-            step = max(len(df) // 12, 1)  # Show ~12 labels
-            x_ticks = range(0, len(df), step)
-            x_labels = [x_labels[i] for i in x_ticks]
-    else:
-        # Use week labels as before if no date index
-        x_labels = [f'w{i+1}' for i in range(len(df))]
-        x_ticks = range(len(df))
-        if len(df) > 30:
-            step = max(len(df) // 12, 1)
-            x_ticks = range(0, len(df), step)
-            x_labels = [x_labels[i] for i in x_ticks]
-    
+    x_ticks, x_labels = _static_xticks(df)
     ax.set_xticks(x_ticks)
     ax.set_xticklabels(x_labels, rotation=45)
     
@@ -482,15 +1110,18 @@ def display_static_decomp_chart(model, df, contribution_cols):
     ax.grid(axis='y', linestyle='-', alpha=0.2)
     
     # Add legend
-    ax.legend(loc='upper center', bbox_to_anchor=(0.5, -0.13),
+    # Handles are built explicitly and the location is pinned below the axes
+    bar_handles = _bar_legend_handles(contribution_cols, colors, pos_any, neg_any)
+    ax.legend(handles=line_handles + bar_handles, loc='upper center',
+             bbox_to_anchor=(0.5, -0.13), bbox_transform=ax.transAxes,
              fancybox=True, shadow=True, ncol=min(6, len(contribution_cols) + 2))
     
     # Adjust layout to make room for legend
     plt.tight_layout()
     plt.subplots_adjust(bottom=0.18)
     
-    # Display the chart
-    plt.show()
+    # Display or save the chart, simplifying long line paths while drawing
+    _finish_static_chart(fig, output_path)
 
 def copy_data_to_clipboard(data):
     """
@@ -531,12 +1162,23 @@ def copy_data_to_clipboard(data):
         # Reset index to include it as a column
         df_to_copy = data.reset_index()
         
-        # Convert to TSV format
-        tsv_data = df_to_copy.to_csv(sep='\t', index=False)
+        # Convert to TSV format, using pyarrow's C++ CSV writer when available
+        try:
+            import pyarrow as pa
+            import pyarrow.csv as pcsv
+            
+            buffer = io.BytesIO()
+            pcsv.write_csv(
+                pa.Table.from_pandas(df_to_copy, preserve_index=False),
+                buffer,
+                write_options=pcsv.WriteOptions(delimiter='\t')
+            )
+            tsv_bytes = buffer.getvalue()
+        except ImportError:
+            tsv_bytes = df_to_copy.to_csv(sep='\t', index=False).encode()
         
         # Create a download link instead
-        import base64
-        b64 = base64.b64encode(tsv_data.encode()).decode()
+        b64 = base64.b64encode(tsv_bytes).decode()
         
         download_link = f"""
         <div style="padding: 10px; background-color: #f8f9fa; border: 1px solid #ddd; border-radius: 4px; margin: 10px 0;">
@@ -630,50 +1272,37 @@ def display_plotly_group_decomp_chart(model, df, contribution_cols, group_name):
     None
     """
     # Split positive and negative contributions for each variable
-    pos_contributions = pd.DataFrame(0, index=df.index, columns=contribution_cols)
-    neg_contributions = pd.DataFrame(0, index=df.index, columns=contribution_cols)
+    pos, neg, bottoms_pos, bottoms_neg = _split_and_stack(df, contribution_cols)
     
-    for col in contribution_cols:
-        pos_contributions[col] = df[col].where(df[col] > 0, 0)
-        neg_contributions[col] = df[col].where(df[col] < 0, 0)
+    # Color and index type are the same for every trace
+    color_map = _variable_color_map(contribution_cols)
+    colors = [color_map[col] for col in contribution_cols]
+    is_dt = isinstance(df.index, pd.DatetimeIndex)
     
     # Create figure
     fig = go.Figure()
     
-    # Format x-axis values based on index type
-    if isinstance(df.index, pd.DatetimeIndex):
-        x_values = df.index
-        x_format = '%Y-%m-%d'
-        hover_format = '%Y-%m-%d'
-    else:
-        x_values = [f"Week {i+1}" for i in range(len(df))]
-        x_format = None
-        hover_format = None
+    # Format x-axis values, hover template and ticks for this index type
+    x_values, customdata, hovertemplate, bar_hovertemplate, xaxis = _plotly_axis_setup(df, is_dt)
     
     # Keep track of variables that have been added to the legend
     legend_entries = {}  # Dictionary to track legend entries by variable name
     
-    # Add positive contributions (bottom to top)
-    bottom_pos = np.zeros(len(df))
+    # Columns with any non-zero values on each side (all-zero traces are skipped)
+    pos_nonzero = pos.any(axis=1)
+    neg_nonzero = neg.any(axis=1)
     
-    for col in contribution_cols:
-        values = pos_contributions[col].values
+    # Send bar values to the browser as float32 (bases are stacked in float64 first)
+    pos, neg = pos.astype(np.float32), neg.astype(np.float32)
+    bottoms_pos, bottoms_neg = bottoms_pos.astype(np.float32), bottoms_neg.astype(np.float32)
+    
+    # Add positive contributions (bottom to top)
+    for j, col in enumerate(contribution_cols):
+        if not pos_nonzero[j]:
+            continue
+        values = pos[j]
         # Use a consistent color scheme but ensure each variable has a unique color
-        color = get_variable_color(col, contribution_cols)
-        
-        # Create hover text
-        if isinstance(df.index, pd.DatetimeIndex):
-            hover_texts = [
-                f"Date: {date.strftime(hover_format)}<br>" +
-                f"{col}: {value:,.2f}"
-                for date, value in zip(df.index, values)
-            ]
-        else:
-            hover_texts = [
-                f"Period: {i+1}<br>" +
-                f"{col}: {value:,.2f}"
-                for i, value in enumerate(values)
-            ]
+        color = colors[j]
         
         # Determine if this variable should show in legend
         if col in legend_entries:
@@ -694,39 +1323,21 @@ def display_plotly_group_decomp_chart(model, df, contribution_cols, group_name):
         fig.add_trace(go.Bar(
             x=x_values,
             y=values,
-            base=bottom_pos,
+            base=bottoms_pos[j],
             name=col,
             marker_color=color,
-            hoverinfo='text',
-            hovertext=hover_texts,
+            customdata=_bar_customdata(customdata, values),
+            hovertemplate=bar_hovertemplate,
             legendgroup=legendgroup,
             showlegend=show_in_legend
         ))
-        
-        # Update the bottom position for the next variable
-        bottom_pos += values
     
     # Add negative contributions (top to bottom)
-    bottom_neg = np.zeros(len(df))
-    
-    for col in reversed(contribution_cols):
-        values = neg_contributions[col].values
-        if np.any(values != 0):  # Only if there are non-zero negative values
-            color = get_variable_color(col, contribution_cols)
-            
-            # Create hover text
-            if isinstance(df.index, pd.DatetimeIndex):
-                hover_texts = [
-                    f"Date: {date.strftime(hover_format)}<br>" +
-                    f"{col}: {value:,.2f}"
-                    for date, value in zip(df.index, values)
-                ]
-            else:
-                hover_texts = [
-                    f"Period: {i+1}<br>" +
-                    f"{col}: {value:,.2f}"
-                    for i, value in enumerate(values)
-                ]
+    for j in reversed(range(len(contribution_cols))):
+        col = contribution_cols[j]
+        values = neg[j]
+        if neg_nonzero[j]:  # Only if there are non-zero negative values
+            color = colors[j]
             
             # Determine if this variable should show in legend
             if col in legend_entries:
@@ -744,41 +1355,25 @@ def display_plotly_group_decomp_chart(model, df, contribution_cols, group_name):
             fig.add_trace(go.Bar(
                 x=x_values,
                 y=values,
-                base=bottom_neg,
+                base=bottoms_neg[j],
                 name=col,
                 marker_color=color,
-                hoverinfo='text',
-                hovertext=hover_texts,
+                customdata=_bar_customdata(customdata, values),
+                hovertemplate=bar_hovertemplate,
                 legendgroup=legendgroup,
                 showlegend=show_in_legend
             ))
-            
-            # Update the bottom position for the next variable
-            bottom_neg += values
     
     # Add Total line (group total) with markers
-    if isinstance(df.index, pd.DatetimeIndex):
-        hover_texts = [
-            f"Date: {date.strftime(hover_format)}<br>" +
-            f"Total {group_name}: {value:,.2f}"
-            for date, value in zip(df.index, df['Total'])
-        ]
-    else:
-        hover_texts = [
-            f"Period: {i+1}<br>" +
-            f"Total {group_name}: {value:,.2f}"
-            for i, value in enumerate(df['Total'])
-        ]
-        
-    fig.add_trace(go.Scatter(
-        x=x_values,
-        y=df['Total'],
+    fig.add_trace(_line_trace(
+        x_values,
+        df['Total'],
+        customdata,
         mode='lines+markers',  # Add markers (dots)
         name=f'Total {group_name}',
         line=dict(color='black', width=2),
         marker=dict(size=6, color='black'),
-        hoverinfo='text',
-        hovertext=hover_texts
+        hovertemplate=hovertemplate
     ))
     
     # We no longer add the Actual line in the decomp_groups chart as requested
@@ -807,44 +1402,9 @@ def display_plotly_group_decomp_chart(model, df, contribution_cols, group_name):
         paper_bgcolor='white'  # White paper background
     )
     
-    # Configure xaxis dates if applicable
-    if isinstance(df.index, pd.DatetimeIndex):
-        tickvals = []
-        ticktext = []
-        
-        # If many dates, pick monthly ticks
-        if len(df) > 30:
-            # Generate unique months
-            month_ends = pd.Series(df.index).dt.to_period('M').unique()
-            for month in month_ends:
-                # Find dates in this month
-                month_dates = [d for d in df.index if (d.year == month.year and d.month == month.month)]
-                if month_dates:
-                    tickvals.append(month_dates[0])
-                    ticktext.append(month_dates[0].strftime('%b %Y'))
-        else:
-            # For fewer dates, show them all
-            tickvals = df.index
-            ticktext = [d.strftime('%Y-%m-%d') for d in df.index]
-        
-        fig.update_xaxes(
-            tickvals=tickvals,
-            ticktext=ticktext,
-            tickangle=45,
-        )
-    else:
-        # For non-date index
-        if len(df) > 30:
-            # Pick a subset of ticks
-            step = max(len(df) // 12, 1)
-            tickvals = list(range(0, len(df), step))
-            ticktext = [f"Week {i+1}" for i in tickvals]
-            
-            fig.update_xaxes(
-                tickvals=tickvals,
-                ticktext=ticktext,
-                tickangle=45,
-            )
+    # Configure xaxis ticks
+    if xaxis is not None:
+        fig.update_xaxes(**xaxis)
     
     # Add grid lines
     fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='lightgray')
@@ -852,7 +1412,7 @@ def display_plotly_group_decomp_chart(model, df, contribution_cols, group_name):
     # Show the plot
     fig.show()
 
-def display_static_group_decomp_chart(model, df, contribution_cols, group_name):
+def display_static_group_decomp_chart(model, df, contribution_cols, group_name, output_path=None):
     """
     Display a static decomposition chart for a specific group using Matplotlib.
     
@@ -866,44 +1426,35 @@ def display_static_group_decomp_chart(model, df, contribution_cols, group_name):
         List of contribution column names (individual variables)
     group_name : str
         Name of the group being decomposed
+    output_path : str, optional
+        If given, save the chart to this file instead of showing it. The
+        format follows the extension ('.pdf', '.svg', '.png', ...); vector
+        formats write each bar collection as a single path object
         
     Returns:
     --------
     None
     """
     # Split positive and negative contributions for each variable
-    pos_contributions = pd.DataFrame(0, index=df.index, columns=contribution_cols)
-    neg_contributions = pd.DataFrame(0, index=df.index, columns=contribution_cols)
-    
-    for col in contribution_cols:
-        pos_contributions[col] = df[col].where(df[col] > 0, 0)
-        neg_contributions[col] = df[col].where(df[col] < 0, 0)
+    pos, neg, bottoms_pos, bottoms_neg = _split_and_stack(df, contribution_cols)
+    x = np.arange(len(df))
     
     # Create the figure
     fig, ax = plt.subplots(figsize=(14, 8))
     
-    # Plot positive contributions
-    bottom_pos = np.zeros(len(df))
-    for col in contribution_cols:
-        color = get_variable_color(col, contribution_cols)
-        ax.bar(range(len(df)), pos_contributions[col], bottom=bottom_pos, 
-              label=col if col not in neg_contributions.columns[neg_contributions.any()] else None,
-              color=color)
-        bottom_pos += pos_contributions[col].values
-    
-    # Plot negative contributions
-    bottom_neg = np.zeros(len(df))
-    for col in reversed(contribution_cols):  # Reverse to maintain consistent ordering
-        if neg_contributions[col].any():  # Only if there are negative values
-            color = get_variable_color(col, contribution_cols)
-            ax.bar(range(len(df)), neg_contributions[col], bottom=bottom_neg,
-                  label=None if col in pos_contributions.columns[pos_contributions.any()] else col,
-                  color=color)
-            bottom_neg += neg_contributions[col].values
+    # Plot all positive and all negative contributions as one collection each
+    pos_any = pos.any(axis=1)
+    neg_any = neg.any(axis=1)
+    color_map = _variable_color_map(contribution_cols)
+    colors = [color_map[col] for col in contribution_cols]
+    _add_bar_collection(ax, x, pos, bottoms_pos, colors, np.flatnonzero(pos_any))
+    _add_bar_collection(ax, x, neg, bottoms_neg, colors, np.flatnonzero(neg_any))
+    ax.autoscale_view()
+    
     
     # Add lines for Total and Actual
-    ax.plot(range(len(df)), df['Total'], 'k-', linewidth=2, label=f'Total {group_name}')
-    ax.plot(range(len(df)), df['Actual'], 'r--', linewidth=2, label='Actual')
+    line_handles = ax.plot(*_static_line(x, df['Total']), 'k-', linewidth=2, label=f'Total {group_name}')
+    line_handles += ax.plot(*_static_line(x, df['Actual']), 'r--', linewidth=2, label='Actual')
     
     # Set chart title and labels
     ax.set_title(f'{group_name} Group Decomposition', fontsize=16)
@@ -911,32 +1462,7 @@ def display_static_group_decomp_chart(model, df, contribution_cols, group_name):
     ax.set_xlabel('', fontsize=12)
     
     # Set x-axis ticks using actual observation dates if available
-    if isinstance(df.index, pd.DatetimeIndex):  # Check if index is datetime
-        # Format dates based on number of observations
-        if len(df) > 50:
-            date_format = '%Y-%m'  # Monthly format for many observations
-        else:
-            date_format = '%Y-%m-%d'  # Full date for fewer observations
-        
-        # Create labels from dates
-        x_labels = [date.strftime(date_format) for date in df.index]
-        
-        # Show subset of labels if there are many
-        x_ticks = range(len(df))
-        if len(df) > 30:
-            # Show monthly or quarterly labels
-            step = max(len(df) // 12, 1)  # Show ~12 labels
-            x_ticks = range(0, len(df), step)
-            x_labels = [x_labels[i] for i in x_ticks]
-    else:
-        # Use week labels as before if no date index
-        x_labels = [f'w{i+1}' for i in range(len(df))]
-        x_ticks = range(len(df))
-        if len(df) > 30:
-            step = max(len(df) // 12, 1)
-            x_ticks = range(0, len(df), step)
-            x_labels = [x_labels[i] for i in x_ticks]
-    
+    x_ticks, x_labels = _static_xticks(df)
     ax.set_xticks(x_ticks)
     ax.set_xticklabels(x_labels, rotation=45)
     
@@ -944,15 +1470,18 @@ def display_static_group_decomp_chart(model, df, contribution_cols, group_name):
     ax.grid(axis='y', linestyle='-', alpha=0.2)
     
     # Add legend
-    ax.legend(loc='upper center', bbox_to_anchor=(0.5, -0.13),
+    # Handles are built explicitly and the location is pinned below the axes
+    bar_handles = _bar_legend_handles(contribution_cols, colors, pos_any, neg_any)
+    ax.legend(handles=line_handles + bar_handles, loc='upper center',
+             bbox_to_anchor=(0.5, -0.13), bbox_transform=ax.transAxes,
              fancybox=True, shadow=True, ncol=min(6, len(contribution_cols) + 2))
     
     # Adjust layout to make room for legend
     plt.tight_layout()
     plt.subplots_adjust(bottom=0.18)
     
-    # Display the chart
-    plt.show()
+    # Display or save the chart, simplifying long line paths while drawing
+    _finish_static_chart(fig, output_path)
 
 def get_variable_color(variable_name, all_variables):
     """
@@ -970,35 +1499,31 @@ def get_variable_color(variable_name, all_variables):
     str
         Hex color code
     """
-    # Standard color palette with enough distinct colors
-    colors = [
-        '#1f77b4',  # blue
-        '#ff7f0e',  # orange
-        '#2ca02c',  # green
-        '#d62728',  # red
-        '#9467bd',  # purple
-        '#8c564b',  # brown
-        '#e377c2',  # pink
-        '#7f7f7f',  # gray
-        '#bcbd22',  # olive
-        '#17becf',  # teal
-        '#aec7e8',  # light blue
-        '#ffbb78',  # light orange
-        '#98df8a',  # light green
-        '#ff9896',  # light red
-        '#c5b0d5',  # light purple
-        '#c49c94',  # light brown
-        '#f7b6d2',  # light pink
-        '#c7c7c7',  # light gray
-        '#dbdb8d',  # light olive
-        '#9edae5'   # light teal
-    ]
-    
     # Get stable index for the variable
     if variable_name in all_variables:
         idx = all_variables.index(variable_name)
     else:
         # Hash the variable name for a stable color if not in the list
-        idx = hash(variable_name) % len(colors)
+        idx = hash(variable_name) % len(VARIABLE_COLORS)
     
-    return colors[idx % len(colors)]
\ No newline at end of file
+    return VARIABLE_COLORS[idx % len(VARIABLE_COLORS)]
+
+def _variable_color_map(all_variables):
+    """
+    Build the get_variable_color mapping for a list of variables in one pass.
+    
+    Parameters:
+    -----------
+    all_variables : list
+        List of all variable names
+        
+    Returns:
+    --------
+    dict
+        Hex color code for each variable name
+    """
+    color_map = {}
+    for idx, variable_name in enumerate(all_variables):
+        # First occurrence wins, as with list.index
+        color_map.setdefault(variable_name, VARIABLE_COLORS[idx % len(VARIABLE_COLORS)])
+    return color_map
@@ -4,13 +4,509 @@ Functions for model diagnostics and variable testing with support for lead/lag v
 
 import pandas as pd
 import numpy as np
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import statsmodels.api as sm
-from statsmodels.stats.outliers_influence import variance_inflation_factor
+from scipy import stats, special
 
-def test_variable(model, variable_name, adstock_rate=0):
+# Recent test_variable results, keyed on the model state they were computed from
+TEST_CACHE_SIZE = 256
+_TEST_CACHE = OrderedDict()
+_TEST_CACHE_LOCK = threading.Lock()
+
+def _values_digest(values):
+    """
+    Digest of an array's values, used in cache keys.
+    
+    Parameters:
+    -----------
+    values : numpy.ndarray
+        Float values to digest
+        
+    Returns:
+    --------
+    bytes
+        16-byte blake2b digest
+    """
+    return hashlib.blake2b(np.ascontiguousarray(values), digest_size=16).digest()
+
+def _base_fit(model):
+    """
+    Prepare the parts of a variable test that only depend on the current model.
+    
+    The result is shared by all candidates in test_variables, so the
+    complete-row mask of the current features and the current model's
+    fit on each filtered sample are only computed once.
+    
+    Parameters:
+    -----------
+    model : LinearModel
+        The current model
+        
+    Returns:
+    --------
+    dict
+        Base mask and digest of the KPI and feature values, plus caches of
+        candidate series, current-model fits per sample and batched full-model
+        statistics and correlations per candidate
+    """
+    data = model.model_data
+    
+    # Rows with complete data for the KPI and all current features
+    values = data[[model.kpi] + list(model.features)].to_numpy(dtype=float)
+    base_mask = ~np.isnan(values).any(axis=1)
+    
+    return {"mask": base_mask, "digest": _values_digest(values),
+            "series": {}, "fits": {}, "full": {}, "corr": {}}
+
+def _candidate_series(model, variable_name, adstock_rate, base):
+    """
+    Name and values of a tested variable, with adstock applied if needed.
+    
+    Parameters:
+    -----------
+    model : LinearModel
+        The current model
+    variable_name : str
+        Name of the variable to test
+    adstock_rate : float
+        Adstock rate to apply (0-1)
+    base : dict
+        Shared fit from _base_fit
+        
+    Returns:
+    --------
+    tuple
+        (tested variable name, pandas.Series of its values)
+    """
+    key = (variable_name, adstock_rate)
+    if key not in base["series"]:
+        test_var_name = variable_name
+        test_series = model.model_data[variable_name]
+        if adstock_rate > 0:
+            from src.model_operations import apply_adstock
+            test_var_name = f"{variable_name}_adstock_{int(adstock_rate*100)}"
+            test_series = apply_adstock(test_series, adstock_rate)
+        base["series"][key] = (test_var_name, test_series)
+    return base["series"][key]
+
+def _sample_fit(model, base, complete_mask):
+    """
+    Fit of the current model on a filtered sample, cached per sample.
+    
+    Stores a projection onto the current features as basis @ basis_pinv
+    together with the residuals, so candidates can be added by partialling
+    out. When the sample is the one the model was fit on, the model's own
+    results are reused; otherwise an orthonormal basis comes from an SVD
+    (dropping rank-deficient directions as statsmodels' pinv does).
+    
+    Parameters:
+    -----------
+    model : LinearModel
+        The current model
+    base : dict
+        Shared fit from _base_fit
+    complete_mask : numpy.ndarray
+        Boolean mask of the rows in the filtered sample
+        
+    Returns:
+    --------
+    dict
+        Basis, residuals, sums of squares, residual degrees of freedom and R-squared
+    """
+    key = complete_mask.tobytes()
+    if key not in base["fits"]:
+        data = model.model_data
+        y = data.loc[complete_mask, model.kpi].to_numpy(dtype=float)
+        X = np.column_stack([np.ones(len(y)), data.loc[complete_mask, list(model.features)].to_numpy(dtype=float)])
+        
+        results = model.results
+        if _results_match_sample(results, model, y, X):
+            # The sample is the one the model was fit on: reuse its fit
+            # (projection onto the features is exog @ pinv(exog))
+            fit = {
+                "basis": results.model.exog,
+                "basis_pinv": results.model.pinv_wexog,
+                "resid": np.asarray(results.resid, dtype=float),
+                "sse": results.ssr,
+                "sst": results.centered_tss,
+                "df_resid": results.df_resid,
+                "rsquared": results.rsquared
+            }
+        else:
+            U, sv, _ = np.linalg.svd(X, full_matrices=False)
+            U = U[:, sv > sv[0] * max(X.shape) * np.finfo(float).eps]
+            resid = y - U @ (U.T @ y)
+            y_centered = y - y.mean()
+            
+            fit = {
+                "basis": U,
+                "basis_pinv": U.T,
+                "resid": resid,
+                "sse": resid @ resid,
+                "sst": y_centered @ y_centered,
+                "df_resid": len(y) - U.shape[1]
+            }
+            fit["rsquared"] = 1 - fit["sse"] / fit["sst"]
+        base["fits"][key] = fit
+    return base["fits"][key]
+
+def _results_match_sample(results, model, y, X):
+    """
+    Check whether the model's results were fit on exactly this sample.
+    
+    Parameters:
+    -----------
+    results : statsmodels RegressionResults
+        Results of the current model
+    model : LinearModel
+        The current model
+    y : numpy.ndarray
+        KPI values on the filtered sample
+    X : numpy.ndarray
+        Constant and current features on the filtered sample
+        
+    Returns:
+    --------
+    bool
+        True if the results' data and design match the sample
+    """
+    ols = getattr(results, "model", None)
+    if ols is None or getattr(ols, "pinv_wexog", None) is None:
+        return False
+    if list(ols.exog_names) != ["const"] + list(model.features):
+        return False
+    return (ols.exog.shape == X.shape and np.array_equal(ols.endog, y)
+            and np.array_equal(ols.exog, X))
+
+def _partial_regressions(fit, Z):
+    """
+    Statistics of each candidate column when added to the current model.
+    
+    Uses the Frisch-Waugh-Lovell theorem: each candidate is partialled out
+    against the current features with one matrix product for all columns,
+    and its coefficient comes from regressing the current residuals on it.
+    
+    Parameters:
+    -----------
+    fit : dict
+        Current-model fit from _sample_fit
+    Z : numpy.ndarray
+        Candidate values on the same sample, one column per candidate
+        
+    Returns:
+    --------
+    list
+        Per candidate, a dict with Coefficient, T-statistic, P-value,
+        R-squared and R-squared Increase of the full model, or None if the
+        candidate is (nearly) collinear with the current features
+    """
+    Z_perp = Z - fit["basis"] @ (fit["basis_pinv"] @ Z)
+    szz = np.einsum('ij,ij->j', Z_perp, Z_perp)
+    sze = Z_perp.T @ fit["resid"]
+    Z_centered = Z - Z.mean(axis=0)
+    scc = np.einsum('ij,ij->j', Z_centered, Z_centered)
+    df_resid = fit["df_resid"] - 1
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        beta = sze / szz
+        # SSE falls by sze*beta when the candidate is added
+        sse = fit["sse"] - sze * beta
+        t_stat = beta / np.sqrt(sse / df_resid / szz)
+        # Two-sided t p-values for all candidates in one call: 2*sf(|t|) = I_x(df/2, 1/2)
+        p_value = special.betainc(df_resid / 2, 0.5, df_resid / (df_resid + t_stat ** 2))
+        rsquared = 1 - sse / fit["sst"]
+        rsquared_increase = sze * beta / fit["sst"]
+    
+    # Candidates (almost) in the span of the current features cannot be separated from them
+    collinear = (scc == 0) | (szz <= 1e-10 * scc)
+    
+    return [
+        None if collinear[j] else {
+            "Coefficient": beta[j],
+            "T-statistic": t_stat[j],
+            "P-value": p_value[j],
+            "R-squared": rsquared[j],
+            "R-squared Increase": rsquared_increase[j]
+        }
+        for j in range(Z.shape[1])
+    ]
+
+def _batch_partial_regressions(model, base, variable_names, adstock_rates):
+    """
+    Fit every new candidate with complete data on the base sample in one batch.
+    
+    Correlations with the KPI and with the current residuals are computed
+    for the same candidates with one matrix product each. Results are
+    stored in the shared base and picked up by test_variable.
+    Candidates with extra missing values (e.g. leads/lags) or already in the
+    model are left to test_variable.
+    
+    Parameters:
+    -----------
+    model : LinearModel
+        The current model
+    base : dict
+        Shared fit from _base_fit
+    variable_names : list of str
+        Names of variables to test
+    adstock_rates : list of float
+        Adstock rates to apply for each variable
+    """
+    keys = []
+    columns = []
+    for var, adstock in zip(variable_names, adstock_rates):
+        if var not in model.model_data.columns or var == model.kpi:
+            continue
+        try:
+            test_var_name, test_series = _candidate_series(model, var, adstock, base)
+            values = test_series.to_numpy(dtype=float)[base["mask"]]
+        except Exception:
+            continue
+        if test_var_name in model.features or np.isnan(values).any():
+            continue
+        keys.append((var, adstock))
+        columns.append(values)
+    
+    if not columns or base["mask"].sum() < 5:
+        return
+    
+    Z = np.column_stack(columns)
+    try:
+        fit = _sample_fit(model, base, base["mask"])
+        stats_list = _partial_regressions(fit, Z)
+    except Exception:
+        # Leave these candidates to the one-at-a-time path
+        return
+    
+    for key, full_stats in zip(keys, stats_list):
+        if full_stats is not None:
+            base["full"][key] = full_stats
+    
+    # Correlations with the KPI, all candidates at once
+    data = model.model_data
+    y = data.loc[base["mask"], model.kpi].to_numpy(dtype=float)
+    kpi_corrs = _column_correlations(Z, y)
+    
+    # Correlations with the residuals on the rows they share with the sample
+    residuals = model.results.resid
+    in_resid = data.index[base["mask"]].isin(residuals.index)
+    if in_resid.any():
+        aligned_residuals = residuals.reindex(data.index[base["mask"]][in_resid]).to_numpy(dtype=float)
+        resid_corrs = _column_correlations(Z[in_resid], aligned_residuals)
+    else:
+        resid_corrs = [None] * len(keys)
+    
+    for key, kpi_corr, resid_corr in zip(keys, kpi_corrs, resid_corrs):
+        base["corr"][key] = (kpi_corr, resid_corr)
+
+def _column_correlations(Z, y):
+    """
+    Pearson correlation of each column of Z with y.
+    
+    Parameters:
+    -----------
+    Z : numpy.ndarray
+        Candidate values, one column per candidate
+    y : numpy.ndarray
+        Values to correlate against, one per row of Z
+        
+    Returns:
+    --------
+    numpy.ndarray
+        Correlation per column (NaN for constant columns)
+    """
+    Z_centered = Z - Z.mean(axis=0)
+    y_centered = y - y.mean()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (Z_centered.T @ y_centered) / np.sqrt(
+            np.einsum('ij,ij->j', Z_centered, Z_centered) * (y_centered @ y_centered)
+        )
+
+def _simple_regression(x, y):
+    """
+    Fit y = a + b*x by ordinary least squares in closed form.
+    
+    Parameters:
+    -----------
+    x : numpy.ndarray
+        Values of the tested variable
+    y : numpy.ndarray
+        KPI values
+        
+    Returns:
+    --------
+    dict
+        Coefficient, T-statistic, P-value and R-squared of the regression
+    """
+    n = len(y)
+    x_centered = x - x.mean()
+    y_centered = y - y.mean()
+    sxx = x_centered @ x_centered
+    syy = y_centered @ y_centered
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        beta = (x_centered @ y_centered) / sxx
+        resid = y_centered - beta * x_centered
+        sse = resid @ resid
+        se_beta = np.sqrt(sse / (n - 2) / sxx)
+        t_stat = beta / se_beta
+        p_value = 2 * stats.t.sf(np.abs(t_stat), n - 2)
+        rsquared = 1 - sse / syy
+    
+    return {
+        "Coefficient": beta,
+        "T-statistic": t_stat,
+        "P-value": p_value,
+        "R-squared": rsquared
+    }
+
+def _variance_inflation_factors(values):
+    """
+    Variance inflation factors of all columns from one inverse correlation matrix.
+    
+    Equivalent to regressing each column on the others with an intercept,
+    but uses a single eigendecomposition instead of one regression per column.
+    
+    Parameters:
+    -----------
+    values : numpy.ndarray
+        Feature values, one column per feature (without the constant)
+        
+    Returns:
+    --------
+    numpy.ndarray
+        VIF per column (inf for constant or perfectly collinear columns)
+    """
+    k = values.shape[1]
+    vifs = np.full(k, np.inf)
+    
+    # Constant columns are perfectly collinear with the intercept
+    varying = values.std(axis=0) > 0
+    if varying.sum() == 1:
+        vifs[varying] = 1.0
+    elif varying.any():
+        # VIF is the diagonal of the inverse correlation matrix
+        R = np.corrcoef(values[:, varying], rowvar=False)
+        w, V = np.linalg.eigh(R)
+        singular = w <= w.max() * len(w) * np.finfo(float).eps
+        varying_vifs = np.sum(V[:, ~singular] ** 2 / w[~singular], axis=1)
+        
+        # Columns involved in an exact linear dependency have infinite VIF
+        if singular.any():
+            varying_vifs[np.abs(V[:, singular]).max(axis=1) > 1e-8] = np.inf
+        vifs[varying] = varying_vifs
+    
+    return vifs
+
+def _test_cache_key(model, variable_name, adstock_rate, base):
+    """
+    Cache key for a variable test on the current state of a model.
+    
+    Every feature change refits the model, so the identity of model.results
+    changes with the features; the identity of model.model_data changes when
+    the data or date range is reset. Columns can also be rewritten in place
+    without a refit (e.g. a weighted variable recreated under the same name),
+    so the key includes digests of the KPI, feature and tested column values.
+    
+    Parameters:
+    -----------
+    model : LinearModel
+        The current model
+    variable_name : str
+        Name of the tested variable
+    adstock_rate : float
+        Adstock rate applied to the variable
+    base : dict
+        Shared fit from _base_fit
+        
+    Returns:
+    --------
+    tuple
+        Hashable key for _TEST_CACHE
+    """
+    digest = _values_digest(model.model_data[variable_name].to_numpy(dtype=float))
+    return (id(model.model_data), id(model.results), model.kpi, tuple(model.features),
+            variable_name, adstock_rate, base["digest"], digest)
+
+def _cached_test(model, key):
+    """
+    Look up a cached variable test, checking the cached objects are still alive.
+    
+    Parameters:
+    -----------
+    model : LinearModel
+        The current model
+    key : tuple
+        Key from _test_cache_key
+        
+    Returns:
+    --------
+    dict or None
+        Cached test results, or None on a miss
+    """
+    with _TEST_CACHE_LOCK:
+        entry = _TEST_CACHE.get(key)
+        if entry is None:
+            return None
+        data_ref, results_ref, results = entry
+        # Ids can be reused once an object is freed, so confirm it is the same object
+        if data_ref() is not model.model_data or results_ref() is not model.results:
+            del _TEST_CACHE[key]
+            return None
+        _TEST_CACHE.move_to_end(key)
+        return results
+
+def _store_test(model, key, results):
+    """
+    Store a variable test in the bounded cache, evicting the oldest entries.
+    
+    Parameters:
+    -----------
+    model : LinearModel
+        The current model
+    key : tuple
+        Key from _test_cache_key
+    results : dict
+        Test results to cache
+        
+    Returns:
+    --------
+    None
+    """
+    try:
+        entry = (weakref.ref(model.model_data), weakref.ref(model.results), results)
+    except TypeError:
+        # Objects that cannot be weakly referenced are not cached
+        return
+    with _TEST_CACHE_LOCK:
+        _TEST_CACHE[key] = entry
+        _TEST_CACHE.move_to_end(key)
+        while len(_TEST_CACHE) > TEST_CACHE_SIZE:
+            _TEST_CACHE.popitem(last=False)
+
+def clear_test_cache():
+    """
+    Clear the cache of recent variable tests.
+    
+    Returns:
+    --------
+    None
+    """
+    with _TEST_CACHE_LOCK:
+        _TEST_CACHE.clear()
+
+def test_variable(model, variable_name, adstock_rate=0, base=None):
     """
     Test a variable's performance before adding it to the model.
     
+    Results are cached per model state and column values, so repeating a
+    test before the model, its data or the tested column change returns
+    the stored results.
+    
     Parameters:
     -----------
     model : LinearModel
@@ -19,6 +515,8 @@ def test_variable(model, variable_name, adstock_rate=0):
         Name of the variable to test
     adstock_rate : float, optional
         Adstock rate to apply (0-1)
+    base : dict, optional
+        Shared fit of the current model from _base_fit (built if not given)
         
     Returns:
     --------
@@ -40,25 +538,31 @@ def test_variable(model, variable_name, adstock_rate=0):
     if variable_name in model.features:
         print(f"Note: Variable '{variable_name}' is already in the model.")
     
-    # Create a copy of the model data
-    data = model.model_data.copy()
+    if base is None:
+        base = _base_fit(model)
+    
+    # Reuse the result of an identical test on the same model state
+    cache_key = _test_cache_key(model, variable_name, adstock_rate, base)
+    cached = _cached_test(model, cache_key)
+    if cached is not None:
+        return cached
+    
+    # Use the model data as is (it is never modified here)
+    data = model.model_data
     
-    # Apply adstock if needed
-    test_var_name = variable_name
-    if adstock_rate > 0:
-        from src.model_operations import apply_adstock
-        test_var_name = f"{variable_name}_adstock_{int(adstock_rate*100)}"
-        data[test_var_name] = apply_adstock(data[variable_name], adstock_rate)
+    # Apply adstock if needed (to a standalone series, not a copy of the data)
+    test_var_name, test_series = _candidate_series(model, variable_name, adstock_rate, base)
     
     # Clean data from missing values (important for lead/lag variables)
     # Create a mask of rows with complete data for all relevant variables
-    complete_mask = data[model.kpi].notna()
-    complete_mask &= data[test_var_name].notna()
-    for feature in model.features:
-        complete_mask &= data[feature].notna()
+    complete_mask = base["mask"] & ~np.isnan(test_series.to_numpy(dtype=float))
     
-    # Filter to only complete rows
-    clean_data = data[complete_mask].copy()
+    # Filter to only complete rows of the KPI, current features and tested variable
+    columns = list(dict.fromkeys([model.kpi] + [f for f in model.features if f != test_var_name]))
+    clean_data = pd.concat(
+        [data.loc[complete_mask, columns], test_series[complete_mask].rename(test_var_name)],
+        axis=1
+    )
     
     # If we have too few data points after filtering, warn user
     if len(clean_data) < 10:
@@ -68,16 +572,24 @@ def test_variable(model, variable_name, adstock_rate=0):
             print("Too few observations for reliable testing. Try a different variable or lag/lead period.")
             return None
     
-    # Calculate simple correlation with KPI
-    correlation = clean_data[model.kpi].corr(clean_data[test_var_name])
-    
-    # Run a simple regression with just this variable
+    # Pull the KPI and tested variable out as arrays once
     y = clean_data[model.kpi]
-    X = sm.add_constant(clean_data[[test_var_name]])
+    y_values = y.to_numpy(dtype=float)
+    test_values = clean_data[test_var_name].to_numpy(dtype=float)
+    
+    # Correlations with the KPI and residuals (batched by test_variables when possible)
+    batched_corrs = base["corr"].get((variable_name, adstock_rate))
     
-    # Fit the simple model
+    # Calculate simple correlation with KPI
+    if batched_corrs is not None:
+        correlation = batched_corrs[0]
+    else:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            correlation = np.corrcoef(y_values, test_values)[0, 1]
+    
+    # Fit the simple model (a regression with just this variable)
     try:
-        simple_model = sm.OLS(y, X).fit()
+        simple_model = _simple_regression(test_values, y_values)
     except Exception as e:
         print(f"Error fitting simple model: {str(e)}")
         print("This may be due to missing or invalid values in the data.")
@@ -88,19 +600,40 @@ def test_variable(model, variable_name, adstock_rate=0):
     if test_var_name not in current_features:
         current_features.append(test_var_name)
     
-    # Prepare features for the full model
-    X_full = sm.add_constant(clean_data[current_features])
-    
-    # Fit the full model
+    # Fit of the current model on the same filtered data
     try:
-        full_model = sm.OLS(y, X_full).fit()
+        current_fit = _sample_fit(model, base, complete_mask)
     except Exception as e:
-        print(f"Error fitting full model: {str(e)}")
-        print("This may be due to collinearity or invalid values in the data.")
-        return None
+        print(f"Warning: Could not fit current model on filtered data: {str(e)}")
+        current_fit = None
+    
+    # Add the variable to the current fit (batched by test_variables when possible)
+    full_stats = base["full"].get((variable_name, adstock_rate))
+    if full_stats is None and current_fit is not None and test_var_name not in model.features:
+        full_stats = _partial_regressions(
+            current_fit, test_values[:, np.newaxis]
+        )[0]
+    
+    # Fit the full model directly if the variable is already in the model or collinear
+    if full_stats is None:
+        X_full = sm.add_constant(clean_data[current_features])
+        try:
+            full_model = sm.OLS(y, X_full).fit()
+        except Exception as e:
+            print(f"Error fitting full model: {str(e)}")
+            print("This may be due to collinearity or invalid values in the data.")
+            return None
+        full_stats = {
+            "Coefficient": full_model.params[test_var_name],
+            "T-statistic": full_model.tvalues[test_var_name],
+            "P-value": full_model.pvalues[test_var_name],
+            "R-squared": full_model.rsquared
+        }
     
     # Calculate correlation with residuals of the current model
-    if model.results is not None:
+    if batched_corrs is not None:
+        resid_corr = batched_corrs[1]
+    elif model.results is not None:
         # Get residuals and align with clean_data
         residuals = model.results.resid
         common_idx = residuals.index.intersection(clean_data.index)
@@ -115,37 +648,33 @@ def test_variable(model, variable_name, adstock_rate=0):
     
     # Check for collinearity (with error handling for infinite VIF values)
     vif_data = pd.DataFrame()
-    vif_data["Variable"] = X_full.columns
+    vif_data["Variable"] = current_features
     
-    # Calculate VIF values with error handling
-    vif_values = []
-    for i in range(X_full.shape[1]):
-        try:
-            vif = variance_inflation_factor(X_full.values, i)
-            # Handle infinite VIF values
-            if np.isinf(vif) or np.isnan(vif):
-                vif = 999.99  # Use a high but finite value
-                print(f"Warning: Very high collinearity detected for '{X_full.columns[i]}'.")
-            vif_values.append(vif)
-        except Exception as e:
-            print(f"Error calculating VIF for '{X_full.columns[i]}': {str(e)}")
-            vif_values.append(999.99)
+    # Calculate VIF values for all features at once
+    try:
+        vif_values = _variance_inflation_factors(clean_data[current_features].to_numpy(dtype=float))
+    except Exception as e:
+        print(f"Error calculating VIF values: {str(e)}")
+        vif_values = np.full(len(current_features), np.inf)
+    
+    # Handle infinite VIF values
+    for i, vif in enumerate(vif_values):
+        if np.isinf(vif) or np.isnan(vif):
+            vif_values[i] = 999.99  # Use a high but finite value
+            print(f"Warning: Very high collinearity detected for '{current_features[i]}'.")
     
     vif_data["VIF"] = vif_values
     
     # Calculate impact at mean
-    beta = full_model.params[test_var_name]
-    mean_value = clean_data[test_var_name].mean()
+    beta = full_stats["Coefficient"]
+    mean_value = test_values.mean()
     impact_at_mean = beta * mean_value
     
     # Get the R-squared from the current model using the same filtered data
     # This ensures a fair comparison
-    X_current = sm.add_constant(clean_data[model.features])
-    try:
-        current_model = sm.OLS(y, X_current).fit()
-        current_rsquared = current_model.rsquared
-    except Exception as e:
-        print(f"Warning: Could not calculate R-squared for current model on filtered data: {str(e)}")
+    if current_fit is not None:
+        current_rsquared = current_fit["rsquared"]
+    else:
         # Use the full model's R-squared as a fallback
         current_rsquared = model.results.rsquared
     
@@ -154,18 +683,10 @@ def test_variable(model, variable_name, adstock_rate=0):
         "Variable": test_var_name,
         "Correlation with KPI": correlation,
         "Correlation with Residuals": resid_corr,
-        "Simple Regression": {
-            "Coefficient": simple_model.params[test_var_name],
-            "T-statistic": simple_model.tvalues[test_var_name],
-            "P-value": simple_model.pvalues[test_var_name],
-            "R-squared": simple_model.rsquared
-        },
+        "Simple Regression": simple_model,
         "In Full Model": {
-            "Coefficient": full_model.params[test_var_name],
-            "T-statistic": full_model.tvalues[test_var_name],
-            "P-value": full_model.pvalues[test_var_name],
-            "R-squared": full_model.rsquared,
-            "R-squared Increase": full_model.rsquared - current_rsquared
+            **full_stats,
+            "R-squared Increase": full_stats["R-squared"] - current_rsquared
         },
         "Collinearity": {
             "VIF": vif_data.loc[vif_data["Variable"] == test_var_name, "VIF"].values[0]
@@ -173,13 +694,15 @@ def test_variable(model, variable_name, adstock_rate=0):
         "Impact": {
             "Mean Value": mean_value,
             "Impact at Mean": impact_at_mean,
-            "Percent of KPI Mean": impact_at_mean / y.mean() * 100
+            "Percent of KPI Mean": impact_at_mean / y_values.mean() * 100
         }
     }
     
+    _store_test(model, cache_key, results)
+    
     return results
 
-def test_variables(model, variable_names, adstock_rates=None):
+def test_variables(model, variable_names, adstock_rates=None, max_workers=None):
     """
     Test multiple variables before adding them to the model.
     
@@ -191,6 +714,8 @@ def test_variables(model, variable_names, adstock_rates=None):
         Names of variables to test
     adstock_rates : list of float, optional
         Adstock rates to apply for each variable
+    max_workers : int, optional
+        Number of threads used to test candidates (default: ThreadPoolExecutor's default)
         
     Returns:
     --------
@@ -208,37 +733,64 @@ def test_variables(model, variable_names, adstock_rates=None):
         # Pad with zeros if not enough rates
         adstock_rates.extend([0] * (len(variable_names) - len(adstock_rates)))
     
-    # Test each variable
-    results_list = []
+    # Test each variable, sharing the current model's fit across candidates
+    base = _base_fit(model)
+    _batch_partial_regressions(model, base, variable_names, adstock_rates)
     
-    for var, adstock in zip(variable_names, adstock_rates):
+    def run_test(var, adstock):
         try:
-            result = test_variable(model, var, adstock)
-            
-            if result:
-                # Extract key metrics for the results table with the new column order
-                results_list.append({
-                    "Variable": result["Variable"],
-                    "Coefficient": result["In Full Model"]["Coefficient"],
-                    "T-stat": result["In Full Model"]["T-statistic"],
-                    "R² Increase": result["In Full Model"]["R-squared Increase"],
-                    "VIF": result["Collinearity"]["VIF"],
-                    "Impact % of KPI": result["Impact"]["Percent of KPI Mean"],
-                    "Correlation": result["Correlation with KPI"],
-                    "Corr. with Residuals": result["Correlation with Residuals"]
-                })
+            return test_variable(model, var, adstock, base)
         except Exception as e:
             print(f"Error testing variable '{var}': {str(e)}")
-            continue
+            return None
+    
+    # Candidates are independent (NumPy/LAPACK release the GIL), so test them on threads
+    if len(variable_names) > 1 and max_workers != 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(run_test, variable_names, adstock_rates))
+    else:
+        results = [run_test(var, adstock) for var, adstock in zip(variable_names, adstock_rates)]
+    
+    results_list = [result for result in results if result]
     
     if not results_list:
         print("No valid variables to test.")
         return None
     
-    # Create DataFrame
-    results_df = pd.DataFrame(results_list)
+    # Extract key metrics for the results table, one array per column
+    n = len(results_list)
+    names = []
+    coefficients = np.empty(n)
+    tstats = np.empty(n)
+    rsquared_increases = np.empty(n)
+    vifs = np.empty(n)
+    impacts = np.empty(n)
+    correlations = np.empty(n)
+    resid_correlations = []
+    for i, result in enumerate(results_list):
+        names.append(result["Variable"])
+        coefficients[i] = result["In Full Model"]["Coefficient"]
+        tstats[i] = result["In Full Model"]["T-statistic"]
+        rsquared_increases[i] = result["In Full Model"]["R-squared Increase"]
+        vifs[i] = result["Collinearity"]["VIF"]
+        impacts[i] = result["Impact"]["Percent of KPI Mean"]
+        correlations[i] = result["Correlation with KPI"]
+        resid_correlations.append(result["Correlation with Residuals"])
+    
+    # Create DataFrame with the new column order
+    results_df = pd.DataFrame({
+        "Variable": names,
+        "Coefficient": coefficients,
+        "T-stat": tstats,
+        "R² Increase": rsquared_increases,
+        "VIF": vifs,
+        "Impact % of KPI": impacts,
+        "Correlation": correlations,
+        "Corr. with Residuals": resid_correlations
+    })
     
-    # Sort by absolute value of t-statistic
-    results_df = results_df.sort_values("T-stat", key=abs, ascending=False)
+    # Sort by absolute value of t-statistic (missing values last)
+    order = np.argsort(-np.abs(tstats), kind="stable")
+    results_df = results_df.iloc[order]
     
     return results_df
\ No newline at end of file
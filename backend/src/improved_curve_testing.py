@@ -2,6 +2,232 @@
 Improved curve testing functions with consistent styling and better model handling.
 """
 
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from IPython.display import display, HTML, clear_output
+import ipywidgets as widgets
+import matplotlib.pyplot as plt
+from src.curve_transformations import (apply_icp_curve, apply_adbug_curve,
+                                       test_curve_transformations_batch)
+
+# Latest displayed results per (variable name, curve type), used by the table buttons
+_LAST_RESULTS = {}
+
+# Number of result rows rendered in the HTML table before "Show all" is clicked
+CURVE_TABLE_MAX_ROWS = 200
+
+# Columns of the ICP results table
+ICP_RESULT_COLUMNS = ['Variable', 'Coefficient', 'T-stat', 'R² Increase',
+                      'Alpha', 'Beta', 'Gamma', 'Switch Point']
+
+# Style block of the curve results table, formatted once per table id
+_CURVE_TABLE_CSS = """
+    <style>
+    #{table_id}-container {{
+        max-width: 100%;
+        overflow-x: auto;
+        position: relative;
+    }}
+
+    #{table_id}-wrapper {{
+        max-height: 600px;
+        overflow-y: auto;
+        margin-bottom: 10px;
+    }}
+
+    #{table_id} {{
+        border-collapse: collapse;
+        width: 100%;
+        font-family: Arial, sans-serif;
+    }}
+
+    #{table_id} th, #{table_id} td {{
+        padding: 8px 12px;
+        text-align: right;
+        border-bottom: 1px solid #ddd;
+    }}
+
+    #{table_id} th {{
+        background-color: #444;
+        color: white;
+        font-weight: bold;
+        position: sticky;
+        top: 0;
+        z-index: 10;
+    }}
+
+    #{table_id} th.select-col {{
+        width: 30px;
+        text-align: center;
+    }}
+
+    #{table_id} td.select-col {{
+        text-align: center;
+    }}
+
+    #{table_id} th.variable-col {{
+        text-align: left;
+        position: sticky;
+        left: 30px;
+        background-color: #444;
+        color: white;
+        z-index: 15;
+    }}
+
+    #{table_id} td.variable-col {{
+        text-align: left;
+        position: sticky;
+        left: 30px;
+        background-color: inherit;
+        z-index: 5;
+    }}
+
+    #{table_id} tr:nth-child(even) {{
+        background-color: #f8f8f8;
+    }}
+
+    #{table_id} .positive-coef {{
+        color: #28a745;
+    }}
+
+    #{table_id} .negative-coef {{
+        color: #dc3545;
+    }}
+
+    #{table_id} .significant-positive {{
+        background-color: #d4edda;
+        color: #155724;
+    }}
+
+    #{table_id} .significant-negative {{
+        background-color: #f8d7da;
+        color: #721c24;
+    }}
+
+    .curve-button {{
+        margin: 10px 5px;
+        padding: 8px 15px;
+        border: none;
+        border-radius: 4px;
+        cursor: pointer;
+        font-size: 14px;
+    }}
+
+    .show-chart-btn {{
+        background-color: #007bff;
+        color: white;
+    }}
+
+    .show-chart-btn:hover {{
+        background-color: #0069d9;
+    }}
+
+    .add-model-btn {{
+        background-color: #28a745;
+        color: white;
+    }}
+
+    .add-model-btn:hover {{
+        background-color: #218838;
+    }}
+
+    .select-all-btn, .select-none-btn {{
+        background-color: #6c757d;
+        color: white;
+        padding: 4px 10px;
+        font-size: 12px;
+    }}
+
+    .action-container {{
+        display: flex;
+        justify-content: flex-start;
+        align-items: center;
+        margin: 10px 0;
+    }}
+    </style>
+"""
+
+_CURVE_TABLE_STYLES = {
+    curve: _CURVE_TABLE_CSS.format(table_id=f"curve-results-table-{curve}")
+    for curve in ("icp", "adbug")
+}
+
+# Script wiring up the curve results table buttons; the {table_id},
+# {variable_name} and {curve_type} placeholders are filled in with
+# str.replace, since the JavaScript itself is full of braces
+_CURVE_TABLE_SCRIPT = """
+    <script>
+    (function() {
+        // Get the table elements
+        const tableId = '{table_id}';
+        const table = document.getElementById(tableId);
+        const selectAllBtn = document.getElementById(`${tableId}-select-all`);
+        const selectNoneBtn = document.getElementById(`${tableId}-select-none`);
+        const showChartBtn = document.getElementById(`${tableId}-show-chart`);
+        const addModelBtn = document.getElementById(`${tableId}-add-model`);
+        const checkboxes = document.querySelectorAll(`.${tableId}-curve-checkbox`);
+        const masterCheckbox = document.getElementById(`${tableId}-check-all`);
+
+        // Select all/none functionality
+        selectAllBtn.addEventListener('click', function() {
+            checkboxes.forEach(box => box.checked = true);
+            masterCheckbox.checked = true;
+        });
+
+        selectNoneBtn.addEventListener('click', function() {
+            checkboxes.forEach(box => box.checked = false);
+            masterCheckbox.checked = false;
+        });
+
+        // Master checkbox functionality
+        masterCheckbox.addEventListener('change', function() {
+            checkboxes.forEach(box => box.checked = this.checked);
+        });
+
+        // Show Chart button
+        showChartBtn.addEventListener('click', function() {
+            const selectedRows = [];
+            checkboxes.forEach(box => {
+                if (box.checked) {
+                    selectedRows.push(parseInt(box.getAttribute('data-row')));
+                }
+            });
+
+            if (selectedRows.length === 0) {
+                alert('Please select at least one curve to display.');
+                return;
+            }
+
+            // Execute Python code to show chart with selectedRows
+            const selectedRowsStr = selectedRows.join(',');
+            const cmd = `show_curve_chart('{variable_name}', [${selectedRowsStr}], model=None, curve_type='{curve_type}')`;
+            IPython.notebook.kernel.execute(cmd);
+        });
+
+        // Add to Model button
+        addModelBtn.addEventListener('click', function() {
+            const selectedRows = [];
+            checkboxes.forEach(box => {
+                if (box.checked) {
+                    selectedRows.push(parseInt(box.getAttribute('data-row')));
+                }
+            });
+
+            if (selectedRows.length === 0) {
+                alert('Please select at least one curve to add to model.');
+                return;
+            }
+
+            // Execute Python code to add selected curves to model
+            const selectedRowsStr = selectedRows.join(',');
+            const cmd = `add_curves_to_model('{variable_name}', [${selectedRowsStr}], model=None, curve_type='{curve_type}')`;
+            IPython.notebook.kernel.execute(cmd);
+        });
+    })();
+    </script>
+"""
+
 def test_icp(model, variable_name=None):
     """
     Test ICP curve transformations with various parameter combinations.
@@ -22,15 +248,9 @@ def test_icp(model, variable_name=None):
         print("No valid model to test with.")
         return None
 
-    # Get available variables
-    available_vars = model.model_data.columns.tolist()
-
-    # Remove KPI and existing features from options
-    for feature in model.features:
-        if feature in available_vars:
-            available_vars.remove(feature)
-    if model.kpi in available_vars:
-        available_vars.remove(model.kpi)
+    # Get available variables, excluding the KPI and existing features
+    exclude = set(model.features) | {model.kpi}
+    available_vars = [col for col in model.model_data.columns if col not in exclude]
 
     # If variable_name is not provided, show selection widget
     if variable_name is None:
@@ -90,12 +310,6 @@ def test_icp_internal(model, variable_name):
     pandas.DataFrame
         Results of all tests
     """
-    import pandas as pd
-    import numpy as np
-    from IPython.display import display, HTML, clear_output
-    import ipywidgets as widgets
-    from src.table_styles import get_results_table_html
-
     if variable_name not in model.model_data.columns:
         print(f"Error: Variable '{variable_name}' not found in the data.")
         return None
@@ -108,30 +322,18 @@ def test_icp_internal(model, variable_name):
     variable_values = model.model_data[variable_name]
     gamma_options = generate_gamma_options(variable_values)
 
-    # Create all combinations
-    results = []
-    for alpha in alphas:
-        for beta in betas:
-            for gamma in gamma_options:
-                # Test the curve
-                result = test_curve_transform_model(
-                    model, variable_name, apply_icp_curve,
-                    alpha, beta, gamma, "ICP"
-                )
-                if result:
-                    results.append(result)
-
-    # Create results DataFrame
-    if results:
-        results_df = pd.DataFrame(results)
-
-        # Reorder and select columns
-        display_columns = ['Variable', 'Coefficient', 'T-stat', 'R² Increase',
-                         'Alpha', 'Beta', 'Gamma', 'Switch Point']
-        results_df = results_df[display_columns]
-
-        # Sort by absolute t-statistic
-        results_df = results_df.sort_values('T-stat', key=abs, ascending=False)
+    # Test all combinations in one batch
+    params_list = [(alpha, beta, gamma) for alpha in alphas for beta in betas for gamma in gamma_options]
+    results_df = test_curve_transformations_batch(model, variable_name, apply_icp_curve, params_list, "ICP")
+
+    # Select the display columns of the results
+    if results_df is not None:
+        results_df = results_df[ICP_RESULT_COLUMNS]
+
+        # Sort by absolute t-statistic (missing values last), renumbering the rows
+        # so the table's data-row attributes are display positions for iloc
+        order = np.argsort(-np.abs(results_df['T-stat'].to_numpy(dtype=float)), kind='stable')
+        results_df = results_df.iloc[order].reset_index(drop=True)
 
         # Create interactive display of results
         display_improved_curve_results(results_df, variable_name, model, "ICP")
@@ -156,175 +358,158 @@ def display_improved_curve_results(results_df, variable_name, model, curve_type)
     curve_type : str
         Type of curve ("ICP" or "ADBUG")
     """
-    import pandas as pd
-    import numpy as np
-    from IPython.display import display, HTML, clear_output
-    import ipywidgets as widgets
+    # Register the results for the chart and add-to-model buttons
+    _LAST_RESULTS[(variable_name, curve_type)] = results_df
 
     # Create output area for the entire display
     main_output = widgets.Output()
 
-    with main_output:
+    def render(max_rows):
+        # Results are sorted by |t-stat|, so the first rows are the ones worth reading;
+        # the row positions of the shown rows match the full results
+        shown_df = results_df if max_rows is None else results_df.iloc[:max_rows]
+
         # Apply styling to the DataFrame
-        html_content = get_curve_results_html(results_df, variable_name, model, curve_type)
+        html_content = get_curve_results_html(shown_df, variable_name, model, curve_type)
 
         # Display the styled HTML table
         display(HTML(html_content))
 
-    # Display the main output
-    display(main_output)
-
-def get_curve_results_html(results_df, variable_name, model, curve_type):
-    """
-    Generate HTML for curve results with interactive functionality
-
-    Parameters:
-    -----------
-    results_df : pandas.DataFrame
-        DataFrame with test results
-    variable_name : str
-        Name of the original variable
-    model : LinearModel
-        The model used for testing
-    curve_type : str
-        Type of curve ("ICP" or "ADBUG")
-
-    Returns:
-    --------
-    str
-        HTML string with table and interactive controls
-    """
-    import pandas as pd
-
-    # Create a unique ID for this table
-    table_id = f"curve-results-table-{curve_type.lower()}"
-
-    # Start HTML content
-    html = f"""
-    <style>
-    #{table_id}-container {{
-        max-width: 100%;
-        overflow-x: auto;
-        position: relative;
-    }}
+        # Offer the remaining rows on request
+        if len(shown_df) < len(results_df):
+            show_all_button = widgets.Button(
+                description=f'Show all {len(results_df)} rows',
+                tooltip=f'Showing the top {len(shown_df)} rows by |t-stat|'
+            )
 
-    #{table_id}-wrapper {{
-        max-height: 600px;
-        overflow-y: auto;
-        margin-bottom: 10px;
-    }}
+            def on_show_all_clicked(b):
+                with main_output:
+                    clear_output()
+                    render(None)
 
-    #{table_id} {{
-        border-collapse: collapse;
-        width: 100%;
-        font-family: Arial, sans-serif;
-    }}
+            show_all_button.on_click(on_show_all_clicked)
+            display(show_all_button)
 
-    #{table_id} th, #{table_id} td {{
-        padding: 8px 12px;
-        text-align: right;
-        border-bottom: 1px solid #ddd;
-    }}
-
-    #{table_id} th {{
-        background-color: #444;
-        color: white;
-        font-weight: bold;
-        position: sticky;
-        top: 0;
-        z-index: 10;
-    }}
-
-    #{table_id} th.select-col {{
-        width: 30px;
-        text-align: center;
-    }}
-
-    #{table_id} td.select-col {{
-        text-align: center;
-    }}
-
-    #{table_id} th.variable-col {{
-        text-align: left;
-        position: sticky;
-        left: 30px;
-        background-color: #444;
-        color: white;
-        z-index: 15;
-    }}
-
-    #{table_id} td.variable-col {{
-        text-align: left;
-        position: sticky;
-        left: 30px;
-        background-color: inherit;
-        z-index: 5;
-    }}
+        # Chart and add-to-model controls that call back into Python directly
+        display(_curve_results_controls(results_df, variable_name, model, curve_type))
 
-    #{table_id} tr:nth-child(even) {{
-        background-color: #f8f8f8;
-    }}
+    with main_output:
+        render(CURVE_TABLE_MAX_ROWS)
 
-    #{table_id} .positive-coef {{
-        color: #28a745;
-    }}
+    # Display the main output
+    display(main_output)
 
-    #{table_id} .negative-coef {{
-        color: #dc3545;
-    }}
+def _curve_results_controls(results_df, variable_name, model, curve_type):
+    """
+    Widgets to chart selected curves or add them to the model.
 
-    #{table_id} .significant-positive {{
-        background-color: #d4edda;
-        color: #155724;
-    }}
+    The button callbacks hold the results and model in their closure, so
+    unlike the table's JavaScript buttons they do not need the classic
+    notebook kernel API or a lookup of the results.
 
-    #{table_id} .significant-negative {{
-        background-color: #f8d7da;
-        color: #721c24;
-    }}
+    Parameters:
+    -----------
+    results_df : pandas.DataFrame
+        DataFrame with test results
+    variable_name : str
+        Name of the original variable
+    model : LinearModel
+        The model used for testing
+    curve_type : str
+        Type of curve ("ICP" or "ADBUG")
 
-    .curve-button {{
-        margin: 10px 5px;
-        padding: 8px 15px;
-        border: none;
-        border-radius: 4px;
-        cursor: pointer;
-        font-size: 14px;
-    }}
+    Returns:
+    --------
+    ipywidgets.VBox
+        Row selector, buttons and an output area for their results
+    """
+    # One option per table row, in table order
+    t_stats = results_df['T-stat'].to_numpy()
+    row_select = widgets.SelectMultiple(
+        options=[(f"{i}: {name} (t={t:.2f})", i)
+                 for i, (name, t) in enumerate(zip(results_df['Variable'].to_numpy(), t_stats))],
+        description='Curves:',
+        rows=min(10, len(results_df)),
+        layout=widgets.Layout(width='60%')
+    )
+
+    chart_button = widgets.Button(description='Show Chart', button_style='primary')
+    add_button = widgets.Button(description='Add to Model', button_style='success')
+    output = widgets.Output()
+
+    def on_chart_clicked(b):
+        with output:
+            clear_output()
+            if not row_select.value:
+                print("Please select at least one curve to display.")
+                return
+            show_curve_chart(variable_name, list(row_select.value), model=model,
+                             curve_type=curve_type, results_df=results_df)
+
+    def on_add_clicked(b):
+        with output:
+            clear_output()
+            if not row_select.value:
+                print("Please select at least one curve to add to model.")
+                return
+            add_curves_to_model(variable_name, list(row_select.value), model=model,
+                                curve_type=curve_type, results_df=results_df)
 
-    .show-chart-btn {{
-        background-color: #007bff;
-        color: white;
-    }}
+    chart_button.on_click(on_chart_clicked)
+    add_button.on_click(on_add_clicked)
 
-    .show-chart-btn:hover {{
-        background-color: #0069d9;
-    }}
+    return widgets.VBox([row_select, widgets.HBox([chart_button, add_button]), output])
 
-    .add-model-btn {{
-        background-color: #28a745;
-        color: white;
-    }}
+def _curve_table_style(table_id):
+    """
+    Style block for a curve results table.
 
-    .add-model-btn:hover {{
-        background-color: #218838;
-    }}
+    Parameters:
+    -----------
+    table_id : str
+        HTML id of the table
 
-    .select-all-btn, .select-none-btn {{
-        background-color: #6c757d;
-        color: white;
-        padding: 4px 10px;
-        font-size: 12px;
-    }}
+    Returns:
+    --------
+    str
+        The <style> block, prebuilt for the ICP and ADBUG tables
+    """
+    curve = table_id.replace("curve-results-table-", "", 1)
+    style = _CURVE_TABLE_STYLES.get(curve)
+    if style is None:
+        style = _CURVE_TABLE_CSS.format(table_id=table_id)
+    return style
 
-    .action-container {{
-        display: flex;
-        justify-content: flex-start;
-        align-items: center;
-        margin: 10px 0;
-    }}
-    </style>
+def get_curve_results_html(results_df, variable_name, model, curve_type):
+    """
+    Generate HTML for curve results with interactive functionality
+
+    Parameters:
+    -----------
+    results_df : pandas.DataFrame
+        DataFrame with test results
+    variable_name : str
+        Name of the original variable
+    model : LinearModel
+        The model used for testing
+    curve_type : str
+        Type of curve ("ICP" or "ADBUG")
+
+    Returns:
+    --------
+    str
+        HTML string with table and interactive controls
+    """
+    # Create a unique ID for this table
+    table_id = f"curve-results-table-{curve_type.lower()}"
 
+    # Collect the HTML fragments in a list and join them once at the end
+    parts = []
+    append = parts.append
+
+    # Start HTML content with the prebuilt style block for this table
+    append(_curve_table_style(table_id))
+    append(f"""
     <div id="{table_id}-container">
     <h3>{curve_type} Curve Results for {variable_name}</h3>
 
@@ -347,146 +532,88 @@ def get_curve_results_html(results_df, variable_name, model, curve_type):
             <th>Alpha</th>
             <th>Beta</th>
             <th>Gamma</th>
-    """
+    """)
 
     # Add Switch Point column for ICP curves
     if curve_type == "ICP":
-        html += "<th>Switch Point</th>"
+        append("<th>Switch Point</th>")
 
-    html += """
+    append("""
         </tr>
     </thead>
     <tbody>
-    """
+    """)
+
+    # Pull the table columns out as arrays once
+    row_labels = results_df.index.to_numpy()
+    variables = results_df["Variable"].to_numpy()
+    coefficients = results_df["Coefficient"].to_numpy()
+    t_stats = results_df["T-stat"].to_numpy()
+    rsquared_increases = results_df["R² Increase"].to_numpy()
+    alphas = results_df["Alpha"].to_numpy()
+    betas = results_df["Beta"].to_numpy()
+    gammas = results_df["Gamma"].to_numpy()
+    show_switch_point = curve_type == "ICP" and "Switch Point" in results_df.columns
+    if show_switch_point:
+        switch_points = results_df["Switch Point"].to_numpy()
+
+    # Cell classes for all rows at once
+    positive = coefficients > 0
+    coef_classes = np.where(positive, "positive-coef", "negative-coef")
+    # Significant at 95%
+    t_classes = np.where(np.abs(t_stats) > 1.96,
+                         np.where(positive, "significant-positive", "significant-negative"), "")
 
     # Add rows to the table
-    for i, row in results_df.iterrows():
+    for j in range(len(results_df)):
+        i = row_labels[j]
+
         # Row background color
         if i % 2 == 0:
             bg_color = "white"
         else:
             bg_color = "#f8f8f8"
 
-        html += f'<tr style="background-color: {bg_color};">\n'
+        append(f'<tr style="background-color: {bg_color};">\n')
 
-        # Checkbox column
-        html += f'<td class="select-col"><input type="checkbox" class="{table_id}-curve-checkbox" data-row="{i}"></td>\n'
+        # Checkbox and Variable columns
+        append(f'<td class="select-col"><input type="checkbox" class="{table_id}-curve-checkbox" data-row="{i}"></td>\n'
+               f'<td class="variable-col">{variables[j]}</td>\n')
 
-        # Variable column
-        html += f'<td class="variable-col">{row["Variable"]}</td>\n'
-
-        # Coefficient column
-        coef_class = "positive-coef" if row["Coefficient"] > 0 else "negative-coef"
-        html += f'<td class="{coef_class}">{row["Coefficient"]:.4f}</td>\n'
-
-        # T-stat column
-        t_stat = row["T-stat"]
-        if abs(t_stat) > 1.96:  # Significant at 95%
-            if row["Coefficient"] > 0:
-                t_class = "significant-positive"
-            else:
-                t_class = "significant-negative"
-        else:
-            t_class = ""
-        html += f'<td class="{t_class}">{t_stat:.4f}</td>\n'
-
-        # R² Increase column
-        html += f'<td>{row["R² Increase"]:.6f}</td>\n'
+        # Coefficient, T-stat and R² Increase columns
+        append(f'<td class="{coef_classes[j]}">{coefficients[j]:.4f}</td>\n'
+               f'<td class="{t_classes[j]}">{t_stats[j]:.4f}</td>\n'
+               f'<td>{rsquared_increases[j]:.6f}</td>\n')
 
         # Alpha, Beta, Gamma columns
-        html += f'<td>{row["Alpha"]}</td>\n'
-        html += f'<td>{row["Beta"]}</td>\n'
-        html += f'<td>{row["Gamma"]:.1f}</td>\n'
+        append(f'<td>{alphas[j]}</td>\n'
+               f'<td>{betas[j]}</td>\n'
+               f'<td>{gammas[j]:.1f}</td>\n')
 
         # Switch Point column for ICP
-        if curve_type == "ICP" and "Switch Point" in row:
-            html += f'<td>{row["Switch Point"]:.2f}</td>\n'
+        if show_switch_point:
+            append(f'<td>{switch_points[j]:.2f}</td>\n')
 
-        html += '</tr>\n'
+        append('</tr>\n')
 
     # Close the table
-    html += """
+    append(f"""
     </tbody>
     </table>
     </div>
 
     <div id="{table_id}-chart-container" style="margin-top: 20px;"></div>
+    """)
 
-    <script>
-    (function() {
-        // Get the table elements
-        const tableId = '{table_id}';
-        const table = document.getElementById(tableId);
-        const selectAllBtn = document.getElementById(`${tableId}-select-all`);
-        const selectNoneBtn = document.getElementById(`${tableId}-select-none`);
-        const showChartBtn = document.getElementById(`${tableId}-show-chart`);
-        const addModelBtn = document.getElementById(`${tableId}-add-model`);
-        const checkboxes = document.querySelectorAll(`.${tableId}-curve-checkbox`);
-        const masterCheckbox = document.getElementById(`${tableId}-check-all`);
-
-        // Select all/none functionality
-        selectAllBtn.addEventListener('click', function() {
-            checkboxes.forEach(box => box.checked = true);
-            masterCheckbox.checked = true;
-        });
-
-        selectNoneBtn.addEventListener('click', function() {
-            checkboxes.forEach(box => box.checked = false);
-            masterCheckbox.checked = false;
-        });
-
-        // Master checkbox functionality
-        masterCheckbox.addEventListener('change', function() {
-            checkboxes.forEach(box => box.checked = this.checked);
-        });
-
-        // Show Chart button
-        showChartBtn.addEventListener('click', function() {
-            const selectedRows = [];
-            checkboxes.forEach(box => {
-                if (box.checked) {
-                    selectedRows.push(parseInt(box.getAttribute('data-row')));
-                }
-            });
-
-            if (selectedRows.length === 0) {
-                alert('Please select at least one curve to display.');
-                return;
-            }
-
-            // Execute Python code to show chart with selectedRows
-            const selectedRowsStr = selectedRows.join(',');
-            const cmd = `show_curve_chart('${variable_name}', [${selectedRowsStr}], model=None, curve_type='${curve_type}')`;
-            IPython.notebook.kernel.execute(cmd);
-        });
-
-        // Add to Model button
-        addModelBtn.addEventListener('click', function() {
-            const selectedRows = [];
-            checkboxes.forEach(box => {
-                if (box.checked) {
-                    selectedRows.push(parseInt(box.getAttribute('data-row')));
-                }
-            });
-
-            if (selectedRows.length === 0) {
-                alert('Please select at least one curve to add to model.');
-                return;
-            }
-
-            // Execute Python code to add selected curves to model
-            const selectedRowsStr = selectedRows.join(',');
-            const cmd = `add_curves_to_model('${variable_name}', [${selectedRowsStr}], model=None, curve_type='${curve_type}')`;
-            IPython.notebook.kernel.execute(cmd);
-        });
-    })();
-    </script>
-    """.format(table_id=table_id, variable_name=variable_name, curve_type=curve_type)
+    # Table buttons script
+    append(_CURVE_TABLE_SCRIPT.replace('{table_id}', table_id)
+           .replace('{variable_name}', variable_name)
+           .replace('{curve_type}', curve_type))
 
-    return html
+    return ''.join(parts)
 
 # Functions to handle button actions
-def show_curve_chart(variable_name, selected_rows, model=None, curve_type="ICP"):
+def show_curve_chart(variable_name, selected_rows, model=None, curve_type="ICP", results_df=None):
     """
     Show chart for selected curves.
 
@@ -500,12 +627,10 @@ def show_curve_chart(variable_name, selected_rows, model=None, curve_type="ICP")
         Model to use for data
     curve_type : str
         Type of curve ("ICP" or "ADBUG")
+    results_df : pandas.DataFrame, optional
+        Results the selected rows refer to. If None, the latest displayed
+        results for this variable and curve type are used
     """
-    import matplotlib.pyplot as plt
-    import numpy as np
-    import pandas as pd
-    from IPython.display import display, clear_output
-
     # Attempt to get the model if not provided
     if model is None:
         try:
@@ -524,60 +649,67 @@ def show_curve_chart(variable_name, selected_rows, model=None, curve_type="ICP")
                 print("Error: Could not access model. Please provide a model explicitly.")
                 return
 
-    # Get the results DataFrame from the user namespace
-    try:
-        from IPython import get_ipython
-        ipython = get_ipython()
-        results_df = None
-        for var_name, var_value in ipython.user_ns.items():
-            if isinstance(var_value, pd.DataFrame) and 'Variable' in var_value.columns and 'Alpha' in var_value.columns:
-                if all(col in var_value.columns for col in ['Coefficient', 'T-stat', 'R² Increase', 'Alpha', 'Beta', 'Gamma']):
-                    results_df = var_value
-                    break
-
-        if results_df is None:
-            print("Error: Could not find results DataFrame.")
+    # Get the results DataFrame, registered when the results were displayed
+    if results_df is None:
+        results_df = _LAST_RESULTS.get((variable_name, curve_type))
+    if results_df is None:
+        # Fall back to searching the user namespace
+        try:
+            from IPython import get_ipython
+            ipython = get_ipython()
+            for var_name, var_value in ipython.user_ns.items():
+                if isinstance(var_value, pd.DataFrame) and 'Variable' in var_value.columns and 'Alpha' in var_value.columns:
+                    if all(col in var_value.columns for col in ['Coefficient', 'T-stat', 'R² Increase', 'Alpha', 'Beta', 'Gamma']):
+                        results_df = var_value
+                        break
+
+            if results_df is None:
+                print("Error: Could not find results DataFrame.")
+                return
+        except:
+            print("Error: Could not access results DataFrame.")
             return
-    except:
-        print("Error: Could not access results DataFrame.")
-        return
 
-    # Get original variable data
+    # Get original variable data as an array, once
     try:
-        original_values = model.model_data[variable_name]
-        max_value = original_values.max()
+        original_values = model.model_data[variable_name].to_numpy(dtype=np.float64)
+        max_value = np.nanmax(original_values)
     except:
         print(f"Error: Could not access variable '{variable_name}' in model data.")
         return
 
-    # Create range of x values
-    x = np.linspace(0, max_value * 1.2, 1000)
+    # Create range of x values (single precision is plenty for plotting)
+    x = np.linspace(0, max_value * 1.2, 1000, dtype=np.float32)
 
     # Create the plot
     plt.figure(figsize=(12, 8))
 
+    # Curve function for this curve type (anything but ICP is ADBUG)
+    curve_function = _CURVE_FUNCTIONS.get(curve_type, apply_adbug_curve)
+
+    # Pull the curve parameters out of the results once
+    alphas = results_df['Alpha'].to_numpy()
+    betas = results_df['Beta'].to_numpy()
+    gammas = results_df['Gamma'].to_numpy()
+    switch_points = results_df['Switch Point'].to_numpy() if 'Switch Point' in results_df.columns else None
+
     # Plot each selected curve
     for row_idx in selected_rows:
         try:
-            row = results_df.iloc[row_idx]
-            alpha = row['Alpha']
-            beta = row['Beta']
-            gamma = row['Gamma']
+            alpha = alphas[row_idx]
+            beta = betas[row_idx]
+            gamma = gammas[row_idx]
 
             # Apply curve transformation
+            y = curve_function(x, alpha, beta, gamma, dtype=np.float32)
             if curve_type == "ICP":
-                from src.curve_transformations import apply_icp_curve
-                y = apply_icp_curve(x, alpha, beta, gamma)
                 # Mark switch point if available
-                if 'Switch Point' in row and pd.notnull(row['Switch Point']):
-                    switch_point = row['Switch Point']
+                if switch_points is not None and pd.notnull(switch_points[row_idx]):
+                    switch_point = switch_points[row_idx]
                     if switch_point > 0:
-                        switch_y = apply_icp_curve(switch_point, alpha, beta, gamma)
+                        switch_y = curve_function(switch_point, alpha, beta, gamma)
                         plt.plot(switch_point, switch_y, 'o', markersize=6)
                         plt.axvline(x=switch_point, linestyle='--', alpha=0.3)
-            else:  # ADBUG
-                from src.curve_transformations import apply_adbug_curve
-                y = apply_adbug_curve(x, alpha, beta, gamma)
 
             # Plot the curve with label
             short_label = f"α={alpha}, β={beta}, γ={gamma}"
@@ -614,7 +746,7 @@ def show_curve_chart(variable_name, selected_rows, model=None, curve_type="ICP")
 
     plt.show()
 
-def add_curves_to_model(variable_name, selected_rows, model=None, curve_type="ICP"):
+def add_curves_to_model(variable_name, selected_rows, model=None, curve_type="ICP", results_df=None):
     """
     Add selected curves to the model.
 
@@ -628,10 +760,10 @@ def add_curves_to_model(variable_name, selected_rows, model=None, curve_type="IC
         Model to use for data
     curve_type : str
         Type of curve ("ICP" or "ADBUG")
+    results_df : pandas.DataFrame, optional
+        Results the selected rows refer to. If None, the latest displayed
+        results for this variable and curve type are used
     """
-    import pandas as pd
-    from IPython.display import display, clear_output
-
     # Attempt to get the model if not provided
     if model is None:
         try:
@@ -654,57 +786,64 @@ def add_curves_to_model(variable_name, selected_rows, model=None, curve_type="IC
         print("Error: No model found. Please provide a model.")
         return
 
-    # Get the results DataFrame from the user namespace
-    try:
-        from IPython import get_ipython
-        ipython = get_ipython()
-        results_df = None
-        for var_name, var_value in ipython.user_ns.items():
-            if isinstance(var_value, pd.DataFrame) and 'Variable' in var_value.columns and 'Alpha' in var_value.columns:
-                if all(col in var_value.columns for col in ['Coefficient', 'T-stat', 'R² Increase', 'Alpha', 'Beta', 'Gamma']):
-                    results_df = var_value
-                    break
-
-        if results_df is None:
-            print("Error: Could not find results DataFrame.")
+    # Get the results DataFrame, registered when the results were displayed
+    if results_df is None:
+        results_df = _LAST_RESULTS.get((variable_name, curve_type))
+    if results_df is None:
+        # Fall back to searching the user namespace
+        try:
+            from IPython import get_ipython
+            ipython = get_ipython()
+            for var_name, var_value in ipython.user_ns.items():
+                if isinstance(var_value, pd.DataFrame) and 'Variable' in var_value.columns and 'Alpha' in var_value.columns:
+                    if all(col in var_value.columns for col in ['Coefficient', 'T-stat', 'R² Increase', 'Alpha', 'Beta', 'Gamma']):
+                        results_df = var_value
+                        break
+
+            if results_df is None:
+                print("Error: Could not find results DataFrame.")
+                return
+        except:
+            print("Error: Could not access results DataFrame.")
             return
-    except:
-        print("Error: Could not access results DataFrame.")
-        return
 
-    # Get original variable data
+    # Get original variable data as an array, once
     try:
-        original_values = model.model_data[variable_name]
+        original_values = model.model_data[variable_name].to_numpy(dtype=np.float64)
     except:
         print(f"Error: Could not access variable '{variable_name}' in model data.")
         return
 
-    # Add selected transformed variables to model data
-    added_vars = []
+    # Curve function for this curve type (anything but ICP is ADBUG)
+    curve_function = _CURVE_FUNCTIONS.get(curve_type, apply_adbug_curve)
+
+    # Pull the curve names and parameters out of the results once
+    var_names = results_df['Variable'].to_numpy()
+    alphas = results_df['Alpha'].to_numpy()
+    betas = results_df['Beta'].to_numpy()
+    gammas = results_df['Gamma'].to_numpy()
+
+    # Transform the original data for each selected curve
+    new_columns = {}
     for row_idx in selected_rows:
         try:
-            row = results_df.iloc[row_idx]
-            var_name = row['Variable']
-            alpha = row['Alpha']
-            beta = row['Beta']
-            gamma = row['Gamma']
+            var_name = var_names[row_idx]
+            alpha = alphas[row_idx]
+            beta = betas[row_idx]
+            gamma = gammas[row_idx]
 
             # Apply transformation to original data
-            if curve_type == "ICP":
-                from src.curve_transformations import apply_icp_curve
-                transformed_values = apply_icp_curve(original_values, alpha, beta, gamma)
-            else:  # ADBUG
-                from src.curve_transformations import apply_adbug_curve
-                transformed_values = apply_adbug_curve(original_values, alpha, beta, gamma)
-
-            # Add to model data
-            model.model_data[var_name] = transformed_values
-            added_vars.append(var_name)
-
-            print(f"Added {var_name} to model data.")
+            new_columns[var_name] = curve_function(original_values, alpha, beta, gamma)
         except Exception as e:
             print(f"Error adding curve at index {row_idx}: {str(e)}")
 
+    # Add all selected transformed variables to model data in one insertion
+    added_vars = list(new_columns)
+    if added_vars:
+        model.model_data[added_vars] = pd.DataFrame(new_columns, index=model.model_data.index)
+        for var_name in added_vars:
+            print(f"Added {var_name} to model data.")
+
     if added_vars:
         print("\nUse add_var() to add these transformations to your model.")
     else:
@@ -849,204 +988,34 @@ def generate_gamma_options(variable_values, n_options=10):
     list
         List of gamma values
     """
-    import numpy as np
-
-    # Get variable statistics
-    max_value = variable_values.max()
-    mean_value = variable_values.mean()
-
-    # Generate a range from 40% to 130% of max value
-    min_gamma = 0.4 * max_value
-    max_gamma = 1.3 * max_value
-
-    # Add options around the mean too
-    gamma_values = np.linspace(min_gamma, max_gamma, n_options)
-
-    # Round values for better readability
-    gamma_values = [round(g, -1) if g > 100 else round(g, 1) for g in gamma_values]
-
-    return gamma_values
-
-# Curve application functions
-def apply_icp_curve(x, alpha, beta, gamma):
-    """
-    Apply the ICP (Incremental Coverage Potential) curve transformation to a variable.
-    This creates an S-shaped curve with increasing returns followed by decreasing returns.
-
-    Parameters:
-    -----------
-    x : numpy.ndarray or pandas.Series
-        The original values to transform
-    alpha : float
-        Controls the steepness of the curve around the switch point
-    beta : float
-        Controls how quickly the curve approaches its asymptote
-    gamma : float
-        The switch point where the curve changes from increasing to decreasing returns
-
-    Returns:
-    --------
-    numpy.ndarray
-        The transformed values
-    """
-    import numpy as np
-    import pandas as pd
-
-    # Convert to numpy array if it's a pandas Series
-    if isinstance(x, pd.Series):
-        x = x.values
-
-    # Apply the ICP formula: y = (x/γ)^α / ((x/γ)^α + β)
-    x_scaled = x / gamma
-    numerator = np.power(x_scaled, alpha)
-    denominator = numerator + beta
-    y = numerator / denominator
-
-    return y
-
-def apply_adbug_curve(x, alpha, beta, gamma):
-    """
-    Apply the ADBUG (Adstock Budget) curve transformation to a variable.
-    This creates a curve with diminishing returns.
-
-    Parameters:
-    -----------
-    x : numpy.ndarray or pandas.Series
-        The original values to transform
-    alpha : float
-        Controls the concavity of the curve (0 < alpha < 1)
-    beta : float
-        Controls how quickly diminishing returns take effect
-    gamma : float
-        Scale parameter to adjust the input values
-
-    Returns:
-    --------
-    numpy.ndarray
-        The transformed values
-    """
-    import numpy as np
-    import pandas as pd
+    # Only the maximum sets the range, so repeated sweeps hit the cache
+    return list(_gamma_options(variable_values.max(), n_options))
 
-    # Convert to numpy array if it's a pandas Series
-    if isinstance(x, pd.Series):
-        x = x.values
-
-    # Apply the ADBUG formula: y = 1 - exp(-β * (x/γ)^α)
-    x_scaled = x / gamma
-    exponent = -beta * np.power(x_scaled, alpha)
-    y = 1 - np.exp(exponent)
-
-    return y
-
-# We also need the test_curve_transform_model function from your existing code
-def test_curve_transform_model(model, variable_name, curve_function, alpha, beta, gamma, curve_type="ICP"):
+@lru_cache(maxsize=256)
+def _gamma_options(max_value, n_options):
     """
-    Test how a curve-transformed variable would perform in the model.
+    Gamma values for a variable maximum, cached across calls.
 
     Parameters:
     -----------
-    model : LinearModel
-        The model to test with
-    variable_name : str
-        Name of the variable to transform
-    curve_function : function
-        The function to apply (apply_icp_curve or apply_adbug_curve)
-    alpha : float
-        Alpha parameter
-    beta : float
-        Beta parameter
-    gamma : float
-        Gamma parameter
-    curve_type : str, optional
-        Type of curve ('ICP' or 'ADBUG')
+    max_value : float
+        Maximum of the variable
+    n_options : int
+        Number of gamma options to generate
 
     Returns:
     --------
-    dict
-        Results of the test including coefficient, t-stat, etc.
+    tuple
+        Gamma values
     """
-    import statsmodels.api as sm
-    import pandas as pd
-    import numpy as np
-
-    if model is None or model.results is None:
-        print("No valid model to test with.")
-        return None
-
-    if variable_name not in model.model_data.columns:
-        print(f"Error: Variable '{variable_name}' not found in the data.")
-        return None
-
-    # Create the transformed variable name
-    if curve_type == "ICP":
-        transform_type = "ICP"
-    else:
-        transform_type = "ADBUG"
+    # Generate a range from 40% to 130% of max value
+    min_gamma = 0.4 * max_value
+    max_gamma = 1.3 * max_value
 
-    # Format alpha, beta, gamma values for the name
-    # Format depends on magnitude for better readability
-    alpha_str = f"{alpha:.1f}".rstrip('0').rstrip('.') if alpha < 10 else str(int(alpha))
-    beta_str = f"{beta:.1f}".rstrip('0').rstrip('.') if beta < 10 else str(int(beta))
-    gamma_str = f"{gamma:.1f}".rstrip('0').rstrip('.') if gamma < 100 else str(int(gamma))
+    gamma_values = np.linspace(min_gamma, max_gamma, n_options)
 
-    transform_name = f"{variable_name}|{transform_type} a{alpha_str}_b{beta_str}_g{gamma_str}"
+    # Round values for better readability (to tens above 100, else to one decimal)
+    return tuple(np.where(gamma_values > 100, np.round(gamma_values, -1), np.round(gamma_values, 1)))
 
-    try:
-        # Get the original variable values
-        original_values = model.model_data[variable_name]
-
-        # Apply the transformation
-        transformed_values = curve_function(original_values, alpha, beta, gamma)
-
-        # Add the transformed variable to a copy of the model data
-        model_data_copy = model.model_data.copy()
-        model_data_copy[transform_name] = transformed_values
-
-        # Get current model variables and add the new transformed variable
-        current_vars = model.features.copy()
-        vars_with_transform = current_vars + [transform_name]
-
-        # Get the KPI values
-        y = model_data_copy[model.kpi]
-
-        # Prepare X data for both models
-        X_current = sm.add_constant(model_data_copy[current_vars])
-        X_with_transform = sm.add_constant(model_data_copy[vars_with_transform])
-
-        # Fit both models
-        current_model = sm.OLS(y, X_current).fit()
-        transform_model = sm.OLS(y, X_with_transform).fit()
-
-        # Get statistics for the transformed variable
-        coef = transform_model.params[transform_name]
-        t_stat = transform_model.tvalues[transform_name]
-        p_value = transform_model.pvalues[transform_name]
-
-        # Calculate R-squared increase
-        rsquared_increase = transform_model.rsquared - current_model.rsquared
-
-        # Calculate switch point if it's an ICP curve
-        switch_point = None
-        if curve_type == "ICP" and alpha > 1:
-            switch_point = gamma * ((alpha - 1) / (alpha + 1)) ** (1 / alpha)
-
-        # Store results
-        results = {
-            'Variable': transform_name,
-            'Coefficient': coef,
-            'T-stat': t_stat,
-            'P-value': p_value,
-            'R² Increase': rsquared_increase,
-            'Alpha': alpha,
-            'Beta': beta,
-            'Gamma': gamma,
-            'Curve Type': curve_type,
-            'Switch Point': switch_point
-        }
-
-        return results
-
-    except Exception as e:
-        print(f"Error testing curve transformation: {str(e)}")
-        return None
\ No newline at end of file
+# Curve functions by curve type
+_CURVE_FUNCTIONS = {"ICP": apply_icp_curve, "ADBUG": apply_adbug_curve}
@@ -5,16 +5,28 @@ These are simple wrappers around the core functionality.
 
 import sys
 import os
-import pandas as pd
 import traceback
-import ipywidgets as widgets
-from IPython.display import display, clear_output
 
 # Global variables to hold state
 _model = None
 _loader = None
 _filtered_data = None
 
+# Table styles and number formats of the model comparison previews
+_TABLE_STYLES = (
+    {'selector': 'thead th', 'props': (('background-color', '#444'),
+                                    ('color', 'white'),
+                                    ('font-weight', 'bold'))},
+    {'selector': 'table', 'props': (('width', '100%'),)},
+    {'selector': 'th, td', 'props': (('text-align', 'right'),
+                                   ('padding', '8px 12px'),
+                                   ('border-bottom', '1px solid #ddd'))}
+)
+_PCT_FORMAT = {
+    'Coef Change %': '{:.2f}%',
+    'T-stat Change %': '{:.2f}%'
+}
+
 def set_globals(model=None, loader=None, filtered_data=None):
     """Set global variables for the interface."""
     global _model, _loader, _filtered_data
@@ -46,6 +58,7 @@ def load_data(file_path=None):
     global _loader, _filtered_data
     
     from src.data_loader import DataLoader
+    from IPython.display import display
     
     if _loader is None:
         _loader = DataLoader()
@@ -83,7 +96,8 @@ def load_data(file_path=None):
         
         # Display the first few rows
         print("\nFirst 5 rows of data:")
-        display(_loader.get_data().head())
+        data = _loader.get_data()
+        display(data.head())
     else:
         print("Failed to load data. Please check the file path and format.")
     
@@ -107,6 +121,8 @@ def filter_date(start_date=None, end_date=None):
     """
     global _loader, _filtered_data
     
+    from IPython.display import display
+    
     if _loader is None or _loader.get_data() is None:
         print("No data loaded. Please load data first.")
         return None
@@ -155,7 +171,6 @@ def create_model(model_name=None, kpi=None):
     global _model, _loader, _filtered_data
     
     from src.linear_models import LinearModel
-    import pandas as pd
     
     # Use filtered data if available, otherwise use the full dataset
     data_to_use = _filtered_data if _filtered_data is not None else _loader.get_data()
@@ -168,16 +183,19 @@ def create_model(model_name=None, kpi=None):
     if model_name is None:
         model_name = input("Enter model name: ")
     
+    # Variable names are listed once and looked up as a set
+    variable_names = _loader.get_variable_names()
+    
     if kpi is None:
         # Display available variables
         print("\nAvailable variables:")
-        for var in _loader.get_variable_names():
+        for var in variable_names:
             print(f"  {var}")
         
         # Get KPI selection by name
         kpi = input("\nEnter the name of the KPI variable: ").strip()
     
-    if kpi not in _loader.get_variable_names():
+    if kpi not in variable_names:
         print(f"Error: Variable '{kpi}' not found in the data.")
         return None
     
@@ -214,6 +232,51 @@ def create_model(model_name=None, kpi=None):
     
     return _model
 
+def _add_change_percentages(comparison_df):
+    """
+    Replace the Coef Change and T-stat Change columns of a comparison table
+    with percentage changes, computed on whole columns at once.
+    
+    Parameters:
+    -----------
+    comparison_df : pandas.DataFrame
+        Comparison table from add_variables_to_model or remove_variables_from_model
+    
+    Returns:
+    --------
+    pandas.DataFrame
+        The table with Coef Change % and T-stat Change % columns (NaN where
+        either value is missing or the old value is zero)
+    """
+    import numpy as np
+    
+    for change_col, old_col, new_col in (('Coef Change', 'Coefficient', 'New Coefficient'),
+                                         ('T-stat Change', 'T-statistic', 'New T-statistic')):
+        pct_col = f"{change_col} %"
+        if change_col in comparison_df.columns and pct_col not in comparison_df.columns:
+            old_values = comparison_df[old_col].to_numpy(dtype=float)
+            new_values = comparison_df[new_col].to_numpy(dtype=float)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                pct_change = np.where(
+                    ~np.isnan(old_values) & ~np.isnan(new_values) & (old_values != 0),
+                    (new_values / old_values - 1) * 100,
+                    np.nan
+                )
+            comparison_df = comparison_df.assign(**{pct_col: pct_change}).drop(columns=change_col)
+    
+    return comparison_df
+
+def _parse_adstock_rates(rates_text, n_vars):
+    """
+    Parse comma-separated adstock percentages into a float64 array of rates,
+    zero-padded to n_vars. Raises ValueError on an invalid entry.
+    """
+    import numpy as np
+    rates = np.array(rates_text.split(','), dtype=np.float64) / 100.0
+    if rates.size < n_vars:
+        rates = np.concatenate([rates, np.zeros(n_vars - rates.size)])
+    return rates
+
 def add_var(variables=None, adstock_rates=None):
     """
     Add variables to the model.
@@ -237,9 +300,6 @@ def add_var(variables=None, adstock_rates=None):
         return False
     
     from src.model_operations import add_variables_to_model
-    import ipywidgets as widgets
-    from IPython.display import display, HTML, clear_output
-    import pandas as pd
     
     # Process variable names
     if variables is None:
@@ -265,11 +325,8 @@ def add_var(variables=None, adstock_rates=None):
         
         if adstock_input.strip():
             try:
-                adstock_rates = [float(rate.strip())/100 for rate in adstock_input.split(',')]
-                
-                # If fewer adstock rates than variables, pad with zeros
-                if len(adstock_rates) < len(variable_names):
-                    adstock_rates.extend([0] * (len(variable_names) - len(adstock_rates)))
+                # Pads with zeros if fewer adstock rates than variables
+                adstock_rates = _parse_adstock_rates(adstock_input, len(variable_names))
             except:
                 print("Invalid adstock rates. Using zeros instead.")
                 adstock_rates = [0] * len(variable_names)
@@ -278,7 +335,7 @@ def add_var(variables=None, adstock_rates=None):
     elif isinstance(adstock_rates, str):
         # Convert string to list, assuming comma-separated values
         try:
-            adstock_rates = [float(rate.strip())/100 for rate in adstock_rates.split(',')]
+            adstock_rates = _parse_adstock_rates(adstock_rates, len(variable_names))
         except:
             print("Invalid adstock rates. Using zeros instead.")
             adstock_rates = [0] * len(variable_names)
@@ -288,117 +345,17 @@ def add_var(variables=None, adstock_rates=None):
     
     # Ensure length matches
     if len(adstock_rates) < len(variable_names):
-        adstock_rates.extend([0] * (len(variable_names) - len(adstock_rates)))
+        adstock_rates = list(adstock_rates) + [0] * (len(variable_names) - len(adstock_rates))
     
     # Preview the changes
     _, comparison_df, preview_model = add_variables_to_model(_model, variable_names, adstock_rates)
     
     if comparison_df is not None:
         # Calculate percentage changes
-        if 'Coef Change' in comparison_df.columns and 'Coef Change %' not in comparison_df.columns:
-            comparison_df['Coef Change %'] = comparison_df.apply(
-                lambda row: (row['New Coefficient'] / row['Coefficient'] - 1) * 100 
-                if pd.notnull(row['Coefficient']) and pd.notnull(row['New Coefficient']) and row['Coefficient'] != 0
-                else None, 
-                axis=1
-            )
-            comparison_df = comparison_df.drop('Coef Change', axis=1)
-            
-        if 'T-stat Change' in comparison_df.columns and 'T-stat Change %' not in comparison_df.columns:
-            comparison_df['T-stat Change %'] = comparison_df.apply(
-                lambda row: (row['New T-statistic'] / row['T-statistic'] - 1) * 100 
-                if pd.notnull(row['T-statistic']) and pd.notnull(row['New T-statistic']) and row['T-statistic'] != 0
-                else None, 
-                axis=1
-            )
-            comparison_df = comparison_df.drop('T-stat Change', axis=1)
+        comparison_df = _add_change_percentages(comparison_df)
 
-        # Create a wrapper div for the output
-        output_div = widgets.Output()
-        
-        # Create confirmation buttons using ipywidgets
-        confirm_button = widgets.Button(
-            description='Confirm',
-            button_style='success',
-            layout=widgets.Layout(width='100px')
-        )
-        
-        cancel_button = widgets.Button(
-            description='Cancel',
-            button_style='danger',
-            layout=widgets.Layout(width='100px')
-        )
-        
-        # Output area for messages after button click
-        result_output = widgets.Output()
-        
-        with output_div:
-            print("\nModel Comparison:")
-            
-            # Display DataFrame with styling
-            styled_df = comparison_df.style.apply(style_comparison_table, axis=1).set_table_styles([
-                {'selector': 'thead th', 'props': [('background-color', '#444'), 
-                                                ('color', 'white'),
-                                                ('font-weight', 'bold')]},
-                {'selector': 'table', 'props': [('width', '100%')]},
-                {'selector': 'th, td', 'props': [('text-align', 'right'),
-                                               ('padding', '8px 12px'),
-                                               ('border-bottom', '1px solid #ddd')]}
-            ]).format({
-                'Coef Change %': '{:.2f}%',
-                'T-stat Change %': '{:.2f}%'
-            })
-            
-            display(styled_df)
-            
-            # Display buttons
-            button_box = widgets.HBox([cancel_button, confirm_button])
-            display(button_box)
-            
-            # Print instruction
-            print("Click 'Confirm' to accept changes or 'Cancel' to discard them.")
-        
-        # Display the output div
-        display(output_div)
-        display(result_output)
-        
-        # Define button click handlers
-        def on_confirm_clicked(b):
-            global _model
-            # Clear the output div
-            output_div.clear_output()
-            
-            # Update the model
-            _model = preview_model
-            
-            # Show success message in the result output
-            with result_output:
-                clear_output(wait=True)
-                print("Variables added successfully.")
-            
-            # Disable buttons
-            confirm_button.disabled = True
-            cancel_button.disabled = True
-        
-        def on_cancel_clicked(b):
-            # Clear the output div
-            output_div.clear_output()
-            
-            # Show cancel message in the result output
-            with result_output:
-                clear_output(wait=True)
-                print("Changes discarded.")
-            
-            # Disable buttons
-            confirm_button.disabled = True
-            cancel_button.disabled = True
-        
-        # Connect the callbacks
-        confirm_button.on_click(on_confirm_clicked)
-        cancel_button.on_click(on_cancel_clicked)
-        
-        # Let the user interact with the widgets, the function returns immediately
-        return True  # The function returns but the UI remains interactive
+        # Show the comparison with Confirm/Cancel buttons; the UI remains interactive
+        return _preview_and_confirm(comparison_df, preview_model, "Variables added successfully.")
     else:
         print("No preview available.")
         return False
@@ -425,9 +382,6 @@ def remove_var(variables=None):
         return False
     
     from src.model_operations import remove_variables_from_model
-    import ipywidgets as widgets
-    from IPython.display import display, HTML, clear_output
-    import pandas as pd
     
     # Show current variables in the model
     print("Current variables in the model:")
@@ -455,110 +409,10 @@ def remove_var(variables=None):
     
     if comparison_df is not None:
         # Calculate percentage changes
-        if 'Coef Change' in comparison_df.columns and 'Coef Change %' not in comparison_df.columns:
-            comparison_df['Coef Change %'] = comparison_df.apply(
-                lambda row: (row['New Coefficient'] / row['Coefficient'] - 1) * 100 
-                if pd.notnull(row['Coefficient']) and pd.notnull(row['New Coefficient']) and row['Coefficient'] != 0
-                else None, 
-                axis=1
-            )
-            comparison_df = comparison_df.drop('Coef Change', axis=1)
-            
-        if 'T-stat Change' in comparison_df.columns and 'T-stat Change %' not in comparison_df.columns:
-            comparison_df['T-stat Change %'] = comparison_df.apply(
-                lambda row: (row['New T-statistic'] / row['T-statistic'] - 1) * 100 
-                if pd.notnull(row['T-statistic']) and pd.notnull(row['New T-statistic']) and row['T-statistic'] != 0
-                else None, 
-                axis=1
-            )
-            comparison_df = comparison_df.drop('T-stat Change', axis=1)
-            
-        # Create a wrapper div for the output
-        output_div = widgets.Output()
-        
-        # Create confirmation buttons using ipywidgets
-        confirm_button = widgets.Button(
-            description='Confirm',
-            button_style='success',
-            layout=widgets.Layout(width='100px')
-        )
-        
-        cancel_button = widgets.Button(
-            description='Cancel',
-            button_style='danger',
-            layout=widgets.Layout(width='100px')
-        )
-        
-        # Output area for messages after button click
-        result_output = widgets.Output()
-        
-        with output_div:
-            print("\nModel Comparison:")
-            
-            # Display DataFrame with styling
-            styled_df = comparison_df.style.apply(style_comparison_table, axis=1).set_table_styles([
-                {'selector': 'thead th', 'props': [('background-color', '#444'), 
-                                                ('color', 'white'),
-                                                ('font-weight', 'bold')]},
-                {'selector': 'table', 'props': [('width', '100%')]},
-                {'selector': 'th, td', 'props': [('text-align', 'right'),
-                                               ('padding', '8px 12px'),
-                                               ('border-bottom', '1px solid #ddd')]}
-            ]).format({
-                'Coef Change %': '{:.2f}%',
-                'T-stat Change %': '{:.2f}%'
-            })
-            
-            display(styled_df)
-            
-            # Display buttons
-            button_box = widgets.HBox([cancel_button, confirm_button])
-            display(button_box)
-            
-            # Print instruction
-            print("Click 'Confirm' to accept changes or 'Cancel' to discard them.")
-        
-        # Display the output div
-        display(output_div)
-        display(result_output)
-        
-        # Define button click handlers
-        def on_confirm_clicked(b):
-            global _model
-            # Clear the output div
-            output_div.clear_output()
-            
-            # Update the model
-            _model = preview_model
-            
-            # Show success message in the result output
-            with result_output:
-                clear_output(wait=True)
-                print("Variables removed successfully.")
+        comparison_df = _add_change_percentages(comparison_df)
             
-            # Disable buttons
-            confirm_button.disabled = True
-            cancel_button.disabled = True
-        
-        def on_cancel_clicked(b):
-            # Clear the output div
-            output_div.clear_output()
-            
-            # Show cancel message in the result output
-            with result_output:
-                clear_output(wait=True)
-                print("Changes discarded.")
-            
-            # Disable buttons
-            confirm_button.disabled = True
-            cancel_button.disabled = True
-        
-        # Connect the callbacks
-        confirm_button.on_click(on_confirm_clicked)
-        cancel_button.on_click(on_cancel_clicked)
-        
-        # Let the user interact with the widgets, the function returns immediately
-        return True  # The function returns but the UI remains interactive
+        # Show the comparison with Confirm/Cancel buttons; the UI remains interactive
+        return _preview_and_confirm(comparison_df, preview_model, "Variables removed successfully.")
     else:
         print("No preview available.")
         return False
@@ -588,9 +442,8 @@ def swap_vars(vars_to_remove=None, vars_to_add=None, adstock_rates=None):
         return False
     
     from src.model_operations import remove_variables_from_model, add_variables_to_model
-    import ipywidgets as widgets
-    from IPython.display import display, HTML, clear_output
     import pandas as pd
+    import numpy as np
     
     # Process variables to remove
     if vars_to_remove is None:
@@ -635,11 +488,8 @@ def swap_vars(vars_to_remove=None, vars_to_add=None, adstock_rates=None):
         
         if adstock_input.strip():
             try:
-                adstock_rates = [float(rate.strip())/100 for rate in adstock_input.split(',')]
-                
-                # If fewer adstock rates than variables, pad with zeros
-                if len(adstock_rates) < len(vars_to_add):
-                    adstock_rates.extend([0] * (len(vars_to_add) - len(adstock_rates)))
+                # Pads with zeros if fewer adstock rates than variables
+                adstock_rates = _parse_adstock_rates(adstock_input, len(vars_to_add))
             except:
                 print("Invalid adstock rates. Using zeros instead.")
                 adstock_rates = [0] * len(vars_to_add)
@@ -648,7 +498,7 @@ def swap_vars(vars_to_remove=None, vars_to_add=None, adstock_rates=None):
     elif isinstance(adstock_rates, str):
         # Convert string to list, assuming comma-separated values
         try:
-            adstock_rates = [float(rate.strip())/100 for rate in adstock_rates.split(',')]
+            adstock_rates = _parse_adstock_rates(adstock_rates, len(vars_to_add))
         except:
             print("Invalid adstock rates. Using zeros instead.")
             adstock_rates = [0] * len(vars_to_add)
@@ -658,11 +508,11 @@ def swap_vars(vars_to_remove=None, vars_to_add=None, adstock_rates=None):
     
     # Ensure adstock_rates length matches vars_to_add length
     if adstock_rates is not None and len(adstock_rates) < len(vars_to_add):
-        adstock_rates.extend([0] * (len(vars_to_add) - len(adstock_rates)))
+        adstock_rates = list(adstock_rates) + [0] * (len(vars_to_add) - len(adstock_rates))
     
-    # Create a copy of the current model for preview
-    import copy
-    preview_model = copy.deepcopy(_model)
+    # The preview starts from the current model; remove_variables_from_model and
+    # add_variables_to_model each return a changed copy and leave it untouched
+    preview_model = _model
     
     # Get original model info before any changes
     original_params = _model.results.params.copy() if _model.results is not None else {}
@@ -676,10 +526,10 @@ def swap_vars(vars_to_remove=None, vars_to_add=None, adstock_rates=None):
                 'Variable': var,
                 'Coefficient': original_params[var],
                 'T-statistic': original_tvalues[var],
-                'New Coefficient': None,
-                'New T-statistic': None,
-                'Coef Change %': None,
-                'T-stat Change %': None
+                'New Coefficient': np.nan,
+                'New T-statistic': np.nan,
+                'Coef Change %': np.nan,
+                'T-stat Change %': np.nan
             })
     
     # First, remove variables
@@ -704,25 +554,7 @@ def swap_vars(vars_to_remove=None, vars_to_add=None, adstock_rates=None):
         comparison_df = comparison_after_remove
     
     # Calculate percentage changes if needed
-    if 'Coef Change' in comparison_df.columns and 'Coef Change %' not in comparison_df.columns:
-        comparison_df['Coef Change %'] = comparison_df.apply(
-            lambda row: (row['New Coefficient'] / row['Coefficient'] - 1) * 100 
-            if pd.notnull(row['Coefficient']) and pd.notnull(row['New Coefficient']) and row['Coefficient'] != 0
-            else None, 
-            axis=1
-        )
-        if 'Coef Change' in comparison_df.columns:
-            comparison_df = comparison_df.drop('Coef Change', axis=1)
-        
-    if 'T-stat Change' in comparison_df.columns and 'T-stat Change %' not in comparison_df.columns:
-        comparison_df['T-stat Change %'] = comparison_df.apply(
-            lambda row: (row['New T-statistic'] / row['T-statistic'] - 1) * 100 
-            if pd.notnull(row['T-statistic']) and pd.notnull(row['New T-statistic']) and row['T-statistic'] != 0
-            else None, 
-            axis=1
-        )
-        if 'T-stat Change' in comparison_df.columns:
-            comparison_df = comparison_df.drop('T-stat Change', axis=1)
+    comparison_df = _add_change_percentages(comparison_df)
     
     # Append data for removed variables to the comparison DataFrame
     if removed_vars_data and len(removed_vars_data) > 0:
@@ -749,15 +581,52 @@ def swap_vars(vars_to_remove=None, vars_to_add=None, adstock_rates=None):
             removed_df = removed_df[existing_columns]
             comparison_df = comparison_df[existing_columns]
             
-            # Use list append instead of concat to avoid the warning
-            all_rows = []
-            for _, row in comparison_df.iterrows():
-                all_rows.append(row.to_dict())
-            for _, row in removed_df.iterrows():
-                all_rows.append(row.to_dict())
-            
-            # Create new DataFrame from the combined rows
-            comparison_df = pd.DataFrame(all_rows)
+            # Stack the two tables column-wise; both are non-empty and their
+            # missing values are NaN, so concat keeps the numeric columns
+            comparison_df = pd.concat([comparison_df, removed_df], ignore_index=True)
+    
+    # Describe the operation and its success message
+    removed_str = ", ".join(vars_to_remove)
+    added_str = ", ".join(vars_to_add)
+    if vars_to_remove and vars_to_add:
+        description = (f"\nSwapping variables: Removing {len(vars_to_remove)} variable(s) and Adding {len(vars_to_add)} variable(s)\n"
+                       f"  Variables to remove: {removed_str}\n"
+                       f"  Variables to add: {added_str}")
+        success_msg = f"Successfully swapped variables: Removed [{removed_str}] and Added [{added_str}]"
+    elif vars_to_remove:
+        description = f"\nRemoving {len(vars_to_remove)} variable(s): {removed_str}"
+        success_msg = f"Successfully removed variables: [{removed_str}]"
+    else:
+        description = f"\nAdding {len(vars_to_add)} variable(s): {added_str}"
+        success_msg = f"Successfully added variables: [{added_str}]"
+    
+    # Show the comparison with Confirm/Cancel buttons; the UI remains interactive
+    return _preview_and_confirm(comparison_df, preview_model, success_msg, description)
+
+def _preview_and_confirm(comparison_df, preview_model, success_msg, description=None):
+    """
+    Show a model comparison table with Confirm and Cancel buttons.
+    
+    Confirm makes preview_model the current model, Cancel discards it.
+    
+    Parameters:
+    -----------
+    comparison_df : pandas.DataFrame
+        Comparison table with percentage changes
+    preview_model : LinearModel
+        The model with the changes applied
+    success_msg : str
+        Message shown when the changes are confirmed
+    description : str, optional
+        Text printed above the comparison table
+    
+    Returns:
+    --------
+    bool
+        True; the function returns immediately while the buttons stay interactive
+    """
+    import ipywidgets as widgets
+    from IPython.display import display, clear_output
     
     # Create a wrapper div for the output
     output_div = widgets.Output()
@@ -779,31 +648,15 @@ def swap_vars(vars_to_remove=None, vars_to_add=None, adstock_rates=None):
     result_output = widgets.Output()
     
     with output_div:
-        # Create operation description
-        if vars_to_remove and vars_to_add:
-            print(f"\nSwapping variables: Removing {len(vars_to_remove)} variable(s) and Adding {len(vars_to_add)} variable(s)")
-            print(f"  Variables to remove: {', '.join(vars_to_remove)}")
-            print(f"  Variables to add: {', '.join(vars_to_add)}")
-        elif vars_to_remove:
-            print(f"\nRemoving {len(vars_to_remove)} variable(s): {', '.join(vars_to_remove)}")
-        elif vars_to_add:
-            print(f"\nAdding {len(vars_to_add)} variable(s): {', '.join(vars_to_add)}")
-            
+        if description:
+            print(description)
+        
         print("\nModel Comparison:")
         
         # Display DataFrame with styling
-        styled_df = comparison_df.style.apply(style_comparison_table, axis=1).set_table_styles([
-            {'selector': 'thead th', 'props': [('background-color', '#444'), 
-                                            ('color', 'white'),
-                                            ('font-weight', 'bold')]},
-            {'selector': 'table', 'props': [('width', '100%')]},
-            {'selector': 'th, td', 'props': [('text-align', 'right'),
-                                           ('padding', '8px 12px'),
-                                           ('border-bottom', '1px solid #ddd')]}
-        ]).format({
-            'Coef Change %': '{:.2f}%',
-            'T-stat Change %': '{:.2f}%'
-        })
+        styled_df = comparison_df.style.apply(style_comparison_table, axis=1).set_table_styles(
+            _TABLE_STYLES
+        ).format(_PCT_FORMAT)
         
         display(styled_df)
         
@@ -830,17 +683,7 @@ def swap_vars(vars_to_remove=None, vars_to_add=None, adstock_rates=None):
         # Show success message in the result output
         with result_output:
             clear_output(wait=True)
-            
-            if vars_to_remove and vars_to_add:
-                removed_str = ", ".join(vars_to_remove)
-                added_str = ", ".join(vars_to_add)
-                print(f"Successfully swapped variables: Removed [{removed_str}] and Added [{added_str}]")
-            elif vars_to_remove:
-                removed_str = ", ".join(vars_to_remove)
-                print(f"Successfully removed variables: [{removed_str}]")
-            elif vars_to_add:
-                added_str = ", ".join(vars_to_add)
-                print(f"Successfully added variables: [{added_str}]")
+            print(success_msg)
         
         # Disable buttons
         confirm_button.disabled = True
@@ -863,8 +706,7 @@ def swap_vars(vars_to_remove=None, vars_to_add=None, adstock_rates=None):
     confirm_button.on_click(on_confirm_clicked)
     cancel_button.on_click(on_cancel_clicked)
     
-    # Let the user interact with the widgets, the function returns immediately
-    return True    
+    return True
 
 def style_comparison_table(row):
     """
@@ -881,7 +723,6 @@ def style_comparison_table(row):
         List of CSS style strings for each cell
     """
     import pandas as pd
-    import numpy as np
     
     styles = [''] * len(row)
     
@@ -1033,6 +874,7 @@ def load_data(file_path=None):
     global _loader, _filtered_data
     
     from src.data_loader import DataLoader
+    from IPython.display import display
     
     if _loader is None:
         _loader = DataLoader()
@@ -1073,7 +915,8 @@ def load_data(file_path=None):
         
         # Display the first few rows
         print("\nFirst 5 rows of data:")
-        display(_loader.get_data().head())
+        data = _loader.get_data()
+        display(data.head())
     else:
         print("Failed to load data. Please check the file path and format.")
     
@@ -1577,7 +1420,6 @@ def test_var(variables=None, adstock_rates=None):
         from src.diagnostics import test_variables
         import ipywidgets as widgets
         from IPython.display import display, clear_output, HTML
-        import pandas as pd
     except Exception as e:
         print(f"Error importing required modules: {str(e)}")
         print("Function not implemented yet. Coming soon!")
@@ -1868,7 +1710,7 @@ def test_var(variables=None, adstock_rates=None):
     elif isinstance(adstock_rates, str):
         # Convert string to list, assuming comma-separated values
         try:
-            adstock_rates = [float(rate.strip())/100 for rate in adstock_rates.split(',')]
+            adstock_rates = _parse_adstock_rates(adstock_rates, len(variable_names))
         except:
             print("Invalid adstock rates. Using zeros instead.")
             adstock_rates = [0] * len(variable_names)
@@ -1878,14 +1720,13 @@ def test_var(variables=None, adstock_rates=None):
     
     # Ensure length matches
     if len(adstock_rates) < len(variable_names):
-        adstock_rates.extend([0] * (len(variable_names) - len(adstock_rates)))
+        adstock_rates = list(adstock_rates) + [0] * (len(variable_names) - len(adstock_rates))
     
     # Run the test
     results_df = test_variables(_model, variable_names, adstock_rates)
     
     if results_df is not None:
         print("\nVariable Test Results:")
-        from IPython.display import HTML, display
         
         # Convert to HTML using the improved function
         html_table = results_to_html_table(results_df)
@@ -1984,6 +1825,7 @@ def split_var(variable_name=None, start_date=None, end_date=None, identifier=Non
         return None
     
     from src.model_operations import apply_split_by_date
+    from IPython.display import display
     
     # Get variable name if not provided
     if variable_name is None:
@@ -2051,6 +1893,7 @@ def multiply_vars(var1=None, var2=None, identifier=None):
         return None
     
     from src.model_operations import apply_multiply_vars
+    from IPython.display import display
     
     # Get variables if not provided
     if var1 is None or var2 is None:
@@ -1520,6 +1520,8 @@ def add_variable_decomp_sheet(wb, var_decomp_df, model, groups, sheet_name):
         # Remove existing sheet
         del wb[sheet_name]
 
+    from src.decomposition import _wgtd_total_weight
+
     # Create new sheet
     ws = wb.create_sheet(title=sheet_name)
 
@@ -1646,7 +1648,7 @@ def add_variable_decomp_sheet(wb, var_decomp_df, model, groups, sheet_name):
                             components = wgtd_info.get('components', {})
 
                             # Calculate total weight
-                            total_weight = sum(abs(coef) for coef in components.values())
+                            total_weight = _wgtd_total_weight(wgtd_info)
 
                             if total_weight > 0:
                                 # Calculate component's proportional contribution
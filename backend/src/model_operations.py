@@ -46,7 +46,7 @@ def add_variables_to_model(model, variable_names, adstock_rates=None):
         The model to add variables to
     variable_names : list of str
         List of variable names to add
-    adstock_rates : list of float, optional
+    adstock_rates : list or array of float, optional
         List of adstock rates corresponding to each variable
         
     Returns:
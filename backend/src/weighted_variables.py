@@ -534,9 +534,13 @@ def save_weighted_vars_to_file(model):
         # Create filename based on model name
         filename = os.path.join('weighted_vars', f"{model.name}_wgtd_vars.json")
         
-        # Save to file
+        # Save to file, leaving out cached values (keys starting with '_')
+        definitions = {
+            var_name: {key: value for key, value in var_info.items() if not key.startswith('_')}
+            for var_name, var_info in model.wgtd_variables.items()
+        }
         with open(filename, 'w') as f:
-            json.dump(model.wgtd_variables, f, indent=2)
+            json.dump(definitions, f, indent=2)
         
         return True
     except Exception as e:
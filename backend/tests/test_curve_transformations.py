@@ -0,0 +1,58 @@
+"""
+Tests for the cached current-model fit in src.curve_transformations.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+import statsmodels.api as sm
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.linear_models import LinearModel
+from src import curve_transformations
+from src.weighted_variables import create_weighted_variable_with_coefficients
+
+def _make_model(n=150):
+    """
+    Synthetic weekly data with media, price and holiday columns (not yet fitted).
+    """
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({
+        'radio_spend': rng.random(n) * 5,
+        'online_spend': rng.random(n) * 3,
+        'price': rng.random(n) + 1,
+        'holiday': (rng.random(n) > 0.8).astype(float)
+    }, index=pd.date_range('2020-01-01', periods=n, freq='W'))
+    data['sales'] = (100 + 2 * data['radio_spend'] + 5 * data['online_spend']
+                     - 20 * data['price'] + 15 * data['holiday'] + rng.normal(0, 3, n))
+
+    model = LinearModel('test_model')
+    model.set_data(data)
+    model.kpi = 'sales'
+    return model
+
+def test_fit_cache_after_recreating_weighted_feature(tmp_path, monkeypatch):
+    # Weighted variable definitions are saved under the working directory
+    monkeypatch.chdir(tmp_path)
+    curve_transformations._FIT_CACHE.clear()
+    model = _make_model()
+
+    create_weighted_variable_with_coefficients(model, 'media', {'radio_spend': 1.0})
+    model.features = ['price', 'media|WGTD']
+    model.results = sm.OLS(model.model_data['sales'], sm.add_constant(model.model_data[model.features])).fit()
+    first = curve_transformations._current_model_fit(model)
+    assert curve_transformations._current_model_fit(model) is first
+
+    # Rewrite a feature column in place without refitting the model
+    create_weighted_variable_with_coefficients(model, 'media', {'online_spend': 1.0})
+    second = curve_transformations._current_model_fit(model)
+
+    curve_transformations._FIT_CACHE.clear()
+    expected = curve_transformations._current_model_fit(model)
+
+    assert second['sse'] == pytest.approx(expected['sse'])
+    assert second['sse'] != pytest.approx(first['sse'])
@@ -0,0 +1,79 @@
+"""
+Tests for the cached variable tests in src.diagnostics.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+import statsmodels.api as sm
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.linear_models import LinearModel
+from src import diagnostics
+from src.weighted_variables import create_weighted_variable_with_coefficients
+
+def _make_model(n=150):
+    """
+    Fitted model on synthetic weekly data with price and holiday features.
+    """
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({
+        'radio_spend': rng.random(n) * 5,
+        'online_spend': rng.random(n) * 3,
+        'price': rng.random(n) + 1,
+        'holiday': (rng.random(n) > 0.8).astype(float)
+    }, index=pd.date_range('2020-01-01', periods=n, freq='W'))
+    data['sales'] = (100 + 2 * data['radio_spend'] + 5 * data['online_spend']
+                     - 20 * data['price'] + 15 * data['holiday'] + rng.normal(0, 3, n))
+
+    model = LinearModel('test_model')
+    model.set_data(data)
+    model.kpi = 'sales'
+    model.features = ['price', 'holiday']
+    model.model = sm.OLS(model.model_data['sales'], sm.add_constant(model.model_data[model.features]))
+    model.results = model.model.fit()
+    return model
+
+def test_retest_after_recreating_weighted_variable(tmp_path, monkeypatch):
+    # Weighted variable definitions are saved under the working directory
+    monkeypatch.chdir(tmp_path)
+    diagnostics.clear_test_cache()
+    model = _make_model()
+
+    create_weighted_variable_with_coefficients(model, 'media', {'radio_spend': 1.0})
+    first = diagnostics.test_variable(model, 'media|WGTD')
+    assert diagnostics.test_variable(model, 'media|WGTD') is first
+
+    # Recreating the variable rewrites its column in place without a refit
+    create_weighted_variable_with_coefficients(model, 'media', {'online_spend': 1.0})
+    second = diagnostics.test_variable(model, 'media|WGTD')
+
+    diagnostics.clear_test_cache()
+    expected = diagnostics.test_variable(model, 'media|WGTD')
+
+    assert second['In Full Model']['T-statistic'] == pytest.approx(expected['In Full Model']['T-statistic'])
+    assert second['In Full Model']['T-statistic'] != pytest.approx(first['In Full Model']['T-statistic'])
+
+def test_retest_after_recreating_weighted_feature(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    diagnostics.clear_test_cache()
+    model = _make_model()
+
+    create_weighted_variable_with_coefficients(model, 'media', {'radio_spend': 1.0})
+    model.features = ['price', 'media|WGTD']
+    model.results = sm.OLS(model.model_data['sales'], sm.add_constant(model.model_data[model.features])).fit()
+    first = diagnostics.test_variable(model, 'holiday')
+
+    # Rewrite a feature column in place without refitting the model
+    create_weighted_variable_with_coefficients(model, 'media', {'online_spend': 1.0})
+    second = diagnostics.test_variable(model, 'holiday')
+
+    diagnostics.clear_test_cache()
+    expected = diagnostics.test_variable(model, 'holiday')
+
+    assert second['In Full Model']['T-statistic'] == pytest.approx(expected['In Full Model']['T-statistic'])
+    assert second['In Full Model']['T-statistic'] != pytest.approx(first['In Full Model']['T-statistic'])